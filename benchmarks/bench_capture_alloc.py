@@ -0,0 +1,140 @@
+"""
+Allocation benchmark: PIL-based capture -> preprocess path vs the numpy-native one.
+
+Frames are a synthetic "YOU DIED" banner served through mss's own ScreenShot class (so
+grab.raw / grab.rgb behave exactly as on a real capture). The capture -> HSV stage keeps
+every intermediate alive, so the tracemalloc peak is the total allocated per tick there;
+the full tick (capture, frame-change sample, preprocess_for_ocr) reports time and peak
+live memory. numpy and OpenCV buffers are tracked, PIL's internal image buffers are not,
+so the legacy numbers are a lower bound.
+
+Usage: python benchmarks/bench_capture_alloc.py [width] [height] [ticks]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from typing import Dict, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+from mss.screenshot import ScreenShot
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import multi_game_death_counter as daemon  # noqa: E402
+
+
+class FakeScreenshot:
+    """Stands in for mss: every grab returns a fresh ScreenShot of the same BGRA frame."""
+
+    def __init__(self, width: int, height: int):
+        bgr = np.full((height, width, 3), 20, dtype=np.uint8)
+        cv2.putText(bgr, "YOU DIED", (width // 6, int(height * 0.7)), cv2.FONT_HERSHEY_DUPLEX,
+                    height / 60, (30, 30, 200), max(1, height // 40))
+        self.frame_bytes = cv2.cvtColor(bgr, cv2.COLOR_BGR2BGRA).tobytes()
+        self.monitors = [{"left": 0, "top": 0, "width": width, "height": height}] * 2
+
+    def grab(self, box: Dict) -> ScreenShot:
+        return ScreenShot(bytearray(self.frame_bytes), box)
+
+
+def legacy_grab(sct: FakeScreenshot, box: Dict) -> Image.Image:
+    """grab_region() before the numpy path: BGRA -> RGB bytes -> PIL (+ LANCZOS for small regions)."""
+    grab = sct.grab(box)
+    img = Image.frombytes("RGB", grab.size, grab.rgb)
+    if img.size[0] < 200 or img.size[1] < 100:
+        img = img.resize((img.size[0] * 2, img.size[1] * 2), Image.Resampling.LANCZOS)
+    return img
+
+
+def legacy_sample(img: Image.Image, step: int = 8) -> np.ndarray:
+    """FrameChangeDetector._sample() before: PIL NEAREST resize + grayscale."""
+    small = img.resize((max(1, img.size[0] // step), max(1, img.size[1] // step)),
+                       Image.Resampling.NEAREST).convert("L")
+    return np.asarray(small, dtype=np.int16)
+
+
+def legacy_preprocess(img_rgb: Image.Image) -> Tuple[Image.Image, Dict]:
+    """Front of preprocess_for_ocr() before: PIL -> ndarray -> BGR, then the shared mask stage."""
+    rgb = np.array(img_rgb)
+    if rgb.shape[0] < 150 or rgb.shape[1] < 300:
+        scale_factor = max(300 / rgb.shape[1], 150 / rgb.shape[0])
+        img_rgb = img_rgb.resize((int(rgb.shape[1] * scale_factor), int(rgb.shape[0] * scale_factor)),
+                                 Image.Resampling.LANCZOS)
+        rgb = np.array(img_rgb)
+    bgr = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+    # Everything after the BGR frame is the same code in both paths
+    out, info = daemon.preprocess_for_ocr(bgr)
+    # Copy: the returned image is the Preprocessor's reusable output buffer
+    return Image.fromarray(out.copy()), info
+
+
+def legacy_front(sct: FakeScreenshot, box: Dict):
+    """Capture up to the HSV frame, as before (intermediates returned so none are freed early)."""
+    grab = sct.grab(box)
+    img = Image.frombytes("RGB", grab.size, grab.rgb)
+    rgb = np.array(img)
+    bgr = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+    return grab, img, rgb, bgr, cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+
+
+def numpy_front(sct: FakeScreenshot, box: Dict):
+    """Capture up to the HSV frame, numpy path (intermediates returned so none are freed early)."""
+    grab = sct.grab(box)
+    frame = np.frombuffer(grab.raw, dtype=np.uint8).reshape(box["height"], box["width"], 4)
+    bgr = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+    return grab, frame, bgr, cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+
+
+def legacy_tick(sct: FakeScreenshot, box: Dict):
+    img = legacy_grab(sct, box)
+    legacy_sample(img)
+    return legacy_preprocess(img)
+
+
+def numpy_tick(sct: FakeScreenshot, box: Dict):
+    frame = np.frombuffer(sct.grab(box).raw, dtype=np.uint8).reshape(box["height"], box["width"], 4)
+    daemon.FrameChangeDetector()._sample(frame)
+    return daemon.preprocess_for_ocr(frame)
+
+
+def measure(name: str, tick, sct: FakeScreenshot, box: Dict, ticks: int):
+    tick(sct, box)  # Warm-up (imports, OpenCV kernels)
+    started = time.perf_counter()
+    for _ in range(ticks):
+        tick(sct, box)
+    seconds = (time.perf_counter() - started) / ticks
+
+    tracemalloc.start()
+    peak = 0
+    for _ in range(ticks):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        result = tick(sct, box)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+        del result
+    tracemalloc.stop()
+    print(f"  {name:<7} {seconds * 1e3:7.2f} ms/tick  peak {peak / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 960
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else 220
+    ticks = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    sct = FakeScreenshot(width, height)
+    box = {"left": 0, "top": 0, "width": width, "height": height}
+    print(f"{width}x{height} capture, {ticks} ticks (frame = {width * height * 4 / 1024:.0f} KiB BGRA)")
+    print("capture -> HSV frame:")
+    measure("legacy", legacy_front, sct, box, ticks)
+    measure("numpy", numpy_front, sct, box, ticks)
+    print("full tick (capture, frame-change sample, preprocess_for_ocr):")
+    measure("legacy", legacy_tick, sct, box, ticks)
+    measure("numpy", numpy_tick, sct, box, ticks)
+    legacy_out, _ = legacy_tick(sct, box)
+    numpy_out, _ = numpy_tick(sct, box)
+    diff = np.abs(np.asarray(legacy_out, dtype=np.int16) - numpy_out.astype(np.int16))
+    print(f"output {numpy_out.shape[1]}x{numpy_out.shape[0]}, pixels differing from legacy: "
+          f"{float(np.mean(diff > 0)):.2%}")
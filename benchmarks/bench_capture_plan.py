@@ -0,0 +1,81 @@
+"""
+Microbenchmark: per-tick capture geometry, recomputed every call vs the CapturePlan cache.
+
+Uses a fake mss context (two 1920x1080 monitors) so it runs anywhere and measures only
+the Python work around sct.grab(): monitor validation, percentage detection, fullscreen
+vs windowed, base-resolution scaling and clamping. Checks both paths produce the same
+box, then times a full grab_region() call with a tiny fake frame.
+
+Usage: python benchmarks/bench_capture_plan.py [iterations]
+"""
+
+import os
+import sys
+import time
+from typing import Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import multi_game_death_counter as daemon  # noqa: E402
+
+MONITORS = [
+    {"left": 0, "top": 0, "width": 3840, "height": 1080},
+    {"left": 0, "top": 0, "width": 1920, "height": 1080},
+    {"left": 1920, "top": 0, "width": 1920, "height": 1080},
+]
+
+CASES = [
+    ("percent, monitor", 1, {"use_percentages": True, "left": 0.25, "top": 0.4, "width": 0.5, "height": 0.2}, None),
+    ("percent, fullscreen window", 2, {"use_percentages": True, "left": 0.25, "top": 0.4, "width": 0.5, "height": 0.2},
+     {"left": 1920, "top": 0, "right": 3840, "bottom": 1080, "width": 1920, "height": 1080}),
+    ("percent, windowed", 1, {"use_percentages": True, "left": 0.25, "top": 0.4, "width": 0.5, "height": 0.2},
+     {"left": 200, "top": 100, "right": 1480, "bottom": 820, "width": 1280, "height": 720}),
+    ("pixels, windowed (scaled)", 1, {"left": 480, "top": 430, "width": 960, "height": 220},
+     {"left": 200, "top": 100, "right": 1480, "bottom": 820, "width": 1280, "height": 720}),
+]
+
+
+class FakeGrab:
+    def __init__(self, width: int, height: int):
+        self.size = (width, height)
+        self.raw = bytearray(width * height * 4)
+
+
+class FakeScreenshot:
+    """Stands in for mss; every grab returns the same tiny frame so only overhead is timed."""
+
+    def __init__(self):
+        self.monitors = MONITORS
+        self.frame = FakeGrab(200, 100)
+
+    def grab(self, box: Dict) -> FakeGrab:
+        return self.frame
+
+
+def per_call(func, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def bench(iterations: int):
+    print(f"{'case':<28} {'recompute':>10} {'plan':>10}  same box")
+    for name, monitor_index, region, window_rect in CASES:
+        plan = daemon.CapturePlan()
+        before = per_call(lambda: daemon.compute_capture_box(MONITORS, monitor_index, region, window_rect), iterations)
+        after = per_call(lambda: plan.get(MONITORS, monitor_index, region, window_rect), iterations)
+        same = daemon.compute_capture_box(MONITORS, monitor_index, region, window_rect) == \
+            plan.get(MONITORS, monitor_index, region, window_rect)
+        print(f"{name:<28} {before:>8.2f}us {after:>8.2f}us  {same}")
+
+    sct = FakeScreenshot()
+    name, monitor_index, region, window_rect = CASES[2]
+    daemon.CAPTURE_PLAN.invalidate()
+    total = per_call(lambda: daemon.grab_region(sct, monitor_index, region, window_rect=window_rect), iterations)
+    print(f"\ngrab_region with a 200x100 fake frame ({name}): {total:.2f}us/call "
+          f"({daemon.CAPTURE_PLAN.stats_summary()})")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,69 @@
+"""
+Microbenchmark: red/white text mask via HSV conversion + inRange vs the color_mask lookup table.
+
+Frames are a synthetic "YOU DIED" banner (a few colors, like a real death screen) and
+uniform noise (every pixel a different color - the table's worst case for cache misses).
+Checks that both paths give the same mask, then reports per-frame time and the one-off
+table build time.
+
+Usage: python benchmarks/bench_color_mask.py [width] [height] [iterations]
+"""
+
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import color_mask  # noqa: E402
+
+
+def banner_frame(width: int, height: int) -> np.ndarray:
+    bgr = np.full((height, width, 3), 20, dtype=np.uint8)
+    cv2.putText(bgr, "YOU DIED", (width // 6, int(height * 0.7)), cv2.FONT_HERSHEY_DUPLEX,
+                height / 60, (30, 30, 200), max(1, height // 40))
+    return cv2.cvtColor(bgr, cv2.COLOR_BGR2BGRA)
+
+
+def noise_frame(width: int, height: int) -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 256, (height, width, 4), dtype=np.uint8)
+
+
+def hsv_mask(frame: np.ndarray) -> np.ndarray:
+    """The mask stage of preprocess_for_ocr() before the lookup table."""
+    bgr = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+    hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+    mask = np.zeros(frame.shape[:2], dtype=np.uint8)
+    for lower, upper in color_mask.DEFAULT_MASK_HSV_RANGES:
+        cv2.bitwise_or(mask, cv2.inRange(hsv, np.array(lower, np.uint8), np.array(upper, np.uint8)), dst=mask)
+    return mask
+
+
+def per_frame(func, iterations: int) -> float:
+    func()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1e3
+
+
+def bench(width: int, height: int, iterations: int):
+    lut = color_mask.get_mask_lut()
+    print(f"table build: {color_mask.build_seconds[-1]:.3f}s ({lut.nbytes / 2 ** 20:.0f} MiB)")
+    out = np.empty((height, width), dtype=np.uint8)
+    index = np.empty((height, width), dtype=np.uint32)
+    print(f"{width}x{height}       {'hsv':>9} {'table':>9}  same mask")
+    for name, frame in (("banner", banner_frame(width, height)), ("noise", noise_frame(width, height))):
+        before = per_frame(lambda: hsv_mask(frame), iterations)
+        after = per_frame(lambda: color_mask.apply_mask_lut(frame, lut, out, index), iterations)
+        same = np.array_equal(hsv_mask(frame), color_mask.apply_mask_lut(frame, lut))
+        print(f"  {name:<10} {before:>7.3f}ms {after:>7.3f}ms  {same}")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 960,
+          int(sys.argv[2]) if len(sys.argv) > 2 else 220,
+          int(sys.argv[3]) if len(sys.argv) > 3 else 200)
@@ -0,0 +1,187 @@
+"""
+Microbenchmark: legacy contains_keyword() vs the precompiled KeywordMatcher.
+
+Runs both matchers over a corpus of OCR-like strings with the hand-written keyword list
+games used to ship (every OCR misreading spelled out), reports per-call time and lists any
+strings where the verdicts differ. A last section compares that list against a real
+game's canonical keywords with max_edit_distance, on banners with dropped or garbled
+letters.
+
+Usage: python benchmarks/bench_keyword_matcher.py [game name] [iterations]
+"""
+
+import os
+import sys
+import json
+import random
+import timeit
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keyword_matcher import KeywordMatcher  # noqa: E402
+
+
+def legacy_contains_keyword(clean_text: str, keywords: List[str], fuzzy_matching: bool = True) -> bool:
+    """Per-call implementation that predates KeywordMatcher (variations rebuilt every call)."""
+    # Exclude false positives: enemy felled, target destroyed, etc.
+    exclude_keywords = ["ENEMYFELLED", "ENEMYFELLE", "TARGETDESTROYED", "TARGETDESTROYE"]
+    for exclude in exclude_keywords:
+        if exclude in clean_text:
+            return False
+    
+    # DIRECT MATCHING MODE (faster, no fuzzy substitutions)
+    if not fuzzy_matching:
+        for keyword in keywords:
+            keyword_clean = keyword.upper().replace(' ', '')
+            if keyword_clean in clean_text:
+                return True
+        return False
+    
+    # FUZZY MATCHING MODE (slower, handles OCR misreadings)
+    # OCR character substitution map (bidirectional)
+    ocr_subs = {
+        'O': ['0'], '0': ['O'],
+        'I': ['1'], '1': ['I'],
+        'E': ['3'], '3': ['E'],
+        'A': ['4'], '4': ['A'],
+        'S': ['5'], '5': ['S'],
+        'G': ['6'], '6': ['G'],
+        'T': ['7'], '7': ['T'],
+        'B': ['8'], '8': ['B'],
+        'Z': ['2'], '2': ['Z'],
+    }
+    
+    def normalize_for_matching(text: str, keyword: str) -> bool:
+        """Check if keyword matches text considering OCR substitutions."""
+        # Direct match first (fast path)
+        keyword_clean = keyword.upper().replace(' ', '')
+        if keyword_clean in clean_text:
+            return True
+        
+        # Generate OCR variation patterns
+        def generate_variations(pattern: str, max_variations: int = 50) -> List[str]:
+            """Generate common OCR variations of a pattern."""
+            variations = set([pattern])  # Start with original
+            chars = list(pattern)
+            
+            # Single character substitutions
+            for i, char in enumerate(chars):
+                if char in ocr_subs:
+                    for sub in ocr_subs[char]:
+                        new_chars = chars.copy()
+                        new_chars[i] = sub
+                        variations.add(''.join(new_chars))
+            
+            # Two character substitutions (common combinations)
+            for i in range(len(chars) - 1):
+                char1, char2 = chars[i], chars[i+1]
+                if char1 in ocr_subs or char2 in ocr_subs:
+                    for sub1 in (ocr_subs.get(char1, [char1]) + [char1]):
+                        for sub2 in (ocr_subs.get(char2, [char2]) + [char2]):
+                            new_chars = chars.copy()
+                            new_chars[i] = sub1
+                            new_chars[i+1] = sub2
+                            variations.add(''.join(new_chars))
+                            if len(variations) >= max_variations:
+                                return list(variations)
+            
+            return list(variations)
+        
+        # Check variations
+        variations = generate_variations(keyword_clean)
+        for variation in variations:
+            if variation in clean_text:
+                return True
+        
+        return False
+    
+    # Try each keyword with fuzzy matching
+    for keyword in keywords:
+        if normalize_for_matching(clean_text, keyword):
+            return True
+    
+    return False
+
+
+# Dark Souls 3's keywords before max_edit_distance replaced the hand-written misreadings
+HAND_WRITTEN_KEYWORDS = ["YOUDIED", "YOUDIE", "YOUD1ED", "YOUDlED", "YOUDI", "OUDIED", "YOUDIE0", "Y0UDIED",
+                         "Y0UDIE", "Y0UD1ED", "Y0UD13D", "Y0UDI3D", "YOUD13D", "YOUDI3D", "Y0U DIED", "YOU D13D",
+                         "Y0U D13D", "1OUDIED", "10UDIED", "YOUD1E0", "Y0UD1E0"]
+
+
+def build_corpus(size: int = 500, seed: int = 1) -> List[str]:
+    """OCR-like strings: gameplay noise, true banners with misreadings, and exclusions."""
+    rng = random.Random(seed)
+    whitelist = "YOUDIEADFT013"
+    banners = ["YOUDIED", "Y0UDIED", "YOUD1ED", "Y0UD13D", "OUDIED", "YOUDIE", "1OUDIED"]
+    exclusions = ["ENEMYFELLED", "TARGETDESTROYED"]
+    corpus = []
+    for i in range(size):
+        kind = i % 10
+        if kind < 7:
+            # Gameplay: empty or short junk from the whitelist
+            corpus.append("".join(rng.choice(whitelist) for _ in range(rng.randint(0, 12))))
+        elif kind < 9:
+            noise = "".join(rng.choice(whitelist) for _ in range(rng.randint(0, 3)))
+            corpus.append(noise + rng.choice(banners) + noise)
+        else:
+            corpus.append(rng.choice(exclusions))
+    return corpus
+
+
+def build_degraded_banners() -> List[str]:
+    """Death banners with misreadings no keyword list spells out (dropped, doubled or wrong letters)."""
+    return ["YOUDIFD", "YUDIED", "YOUDIIED", "Y0UDLED", "YOUDTED", "T0UDIED", "YOUDIEDA", "AYOUOIED"]
+
+
+def main():
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    game_name = sys.argv[1] if len(sys.argv) > 1 else "Dark Souls 3"
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    with open(os.path.join(base_dir, "games_config.json"), "r", encoding="utf-8") as f:
+        game_config = json.load(f)["games"][game_name]
+    keywords = game_config["keywords"]
+    max_edit_distance = game_config.get("max_edit_distance", 1.0) or 1.0
+    corpus = build_corpus()
+
+    listed_keywords = HAND_WRITTEN_KEYWORDS
+    for fuzzy in (True, False):
+        build_time = timeit.timeit(lambda: KeywordMatcher(listed_keywords, fuzzy), number=20) / 20
+        matcher = KeywordMatcher(listed_keywords, fuzzy)
+
+        legacy_time = timeit.timeit(lambda: [legacy_contains_keyword(t, listed_keywords, fuzzy) for t in corpus],
+                                    number=iterations)
+        new_time = timeit.timeit(lambda: [matcher.matches(t) for t in corpus], number=iterations)
+        calls = iterations * len(corpus)
+
+        differing = [t for t in corpus
+                     if legacy_contains_keyword(t, listed_keywords, fuzzy) != matcher.matches(t)]
+        mode = "fuzzy " if fuzzy else "direct"
+        print(f"[{mode}] hand-written: {len(listed_keywords)} keywords, {len(corpus)} strings x {iterations}")
+        print(f"  legacy contains_keyword: {legacy_time / calls * 1e6:9.2f} us/call")
+        print(f"  KeywordMatcher.matches:  {new_time / calls * 1e6:9.2f} us/call "
+              f"({legacy_time / max(new_time, 1e-9):.0f}x faster, built once in {build_time * 1e3:.2f} ms)")
+        print(f"  verdicts differ on {len(differing)} string(s)"
+              + (f", e.g. {sorted(set(differing))[:5]}" if differing else ""))
+
+    # Canonical keywords with bounded edit distance vs the old hand-written list
+    degraded = build_degraded_banners()
+    listed = KeywordMatcher(listed_keywords, True)
+    canonical = KeywordMatcher(keywords, True, max_edit_distance=max_edit_distance)
+    listed_time = timeit.timeit(lambda: [listed.matches(t) for t in corpus], number=iterations)
+    canonical_time = timeit.timeit(lambda: [canonical.matches(t) for t in corpus], number=iterations)
+    calls = iterations * len(corpus)
+    gained = [t for t in corpus if canonical.matches(t) and not listed.matches(t)]
+    print(f"[edit distance] {game_name}: {keywords} with max_edit_distance={max_edit_distance} "
+          f"vs {len(listed_keywords)} hand-written keywords")
+    print(f"  hand-written keywords: {listed_time / calls * 1e6:9.2f} us/call")
+    print(f"  canonical + distance:  {canonical_time / calls * 1e6:9.2f} us/call")
+    print(f"  degraded banners found: listed {sum(map(listed.matches, degraded))}/{len(degraded)}, "
+          f"canonical {sum(map(canonical.matches, degraded))}/{len(degraded)}")
+    print(f"  extra corpus matches from distance: {len(gained)}"
+          + (f", e.g. {sorted(set(gained))[:5]}" if gained else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Microbenchmark: per-read buffer allocation vs MemoryScanner's pooled, in-place reads.
+
+ReadProcessMemory is Windows-only, so both paths copy from a local "game memory" buffer
+with ctypes.memmove, which is what ReadProcessMemory does into the target buffer. The
+legacy path is the old _read_memory_region(): a fresh create_string_buffer per region,
+then buffer.raw[:n] (a second copy), then `needle in data`. The pooled path is
+MemoryScanner._read_chunks() plus bytearray.find() on the reused buffer.
+
+Usage: python benchmarks/bench_memory_reads.py [regions] [region KiB]
+"""
+
+import ctypes
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import memory_scanner  # noqa: E402
+
+NEEDLE = b"YOU DIED"
+
+
+def make_memory(regions: int, region_size: int):
+    memory = ctypes.create_string_buffer(regions * region_size)
+    # Needle only in the last region, so every region is searched
+    ctypes.memmove(ctypes.addressof(memory) + regions * region_size - 64, NEEDLE, len(NEEDLE))
+    return memory
+
+
+def legacy_scan(memory, regions: int, region_size: int) -> bool:
+    found = False
+    for i in range(regions):
+        buffer = ctypes.create_string_buffer(region_size)
+        ctypes.memmove(buffer, ctypes.addressof(memory) + i * region_size, region_size)
+        data = buffer.raw[:region_size]
+        found = NEEDLE in data or found
+    return found
+
+
+def pooled_scanner(memory):
+    scanner = memory_scanner.MemoryScanner.__new__(memory_scanner.MemoryScanner)
+    scanner.process_handle = 1
+    scanner.stop_scanning = False
+    scanner.buffer_pool = memory_scanner.BufferPool()
+    scanner.bytes_read = 0
+
+    def read_into(address: int, size: int, target) -> int:
+        ctypes.memmove(target, ctypes.addressof(memory) + address, size)
+        return size
+
+    scanner._read_into = read_into
+    return scanner
+
+
+def pooled_scan(scanner, regions: int, region_size: int) -> bool:
+    found = False
+    for i in range(regions):
+        for _, buffer, length in scanner._read_chunks(i * region_size, region_size, region_size, len(NEEDLE) - 1):
+            found = buffer.find(NEEDLE, 0, length) != -1 or found
+    return found
+
+
+def measure(name: str, scan):
+    assert scan()
+    started = time.perf_counter()
+    for _ in range(5):
+        scan()
+    seconds = (time.perf_counter() - started) / 5
+    tracemalloc.start()
+    scan()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {name:<7} {seconds * 1e3:8.2f} ms/scan  peak traced {peak / 1024:9.1f} KiB")
+
+
+if __name__ == "__main__":
+    regions = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    region_size = (int(sys.argv[2]) if len(sys.argv) > 2 else 1024) * 1024
+    memory = make_memory(regions, region_size)
+    scanner = pooled_scanner(memory)
+    print(f"{regions} regions x {region_size // 1024} KiB")
+    measure("legacy", lambda: legacy_scan(memory, regions, region_size))
+    measure("pooled", lambda: pooled_scan(scanner, regions, region_size))
+    print(f"  pooled buffer allocations: {scanner.buffer_pool.allocations}")
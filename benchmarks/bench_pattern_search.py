@@ -0,0 +1,78 @@
+"""
+Microbenchmark: one search per pattern vs MemoryScanner's single-pass PatternMatcher.
+
+The buffer is a 1 MiB chunk of random bytes with no match, so every pattern is searched
+over the whole chunk (the common case - most chunks hold no pattern). The per-pattern
+path is the scan loop before PatternMatcher: one bytearray.find() per encoded pattern
+and endianness. The sequential column is PatternMatcher without numpy, which falls
+back to that same loop (plus a regex for wildcard signatures).
+
+Usage: python benchmarks/bench_pattern_search.py [chunk KiB] [iterations]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import memory_scanner  # noqa: E402
+
+PATTERNS = [
+    {"type": "string", "value": "YOU DIED"},
+    {"type": "string", "value": "YOU DIED", "encoding": "utf-16-le"},
+    {"type": "string", "value": "DEATH"},
+    {"type": "integer", "value": 1234567},
+    {"type": "integer", "value": "0x7FFFAB12", "size": 8},
+    {"type": "string", "value": "Respawn"},
+    {"type": "string", "value": "GameOver"},
+    {"type": "integer", "value": 987654321},
+]
+SIGNATURE = {"type": "aob", "value": "48 8B ?? ?? 05"}
+
+
+def compile_patterns(patterns):
+    return [(i, memory_scanner.pattern_sequences(p)) for i, p in enumerate(patterns)]
+
+
+def per_pattern(buffer: bytearray, needles) -> bool:
+    found = False
+    for needle in needles:
+        found = buffer.find(needle) != -1 or found
+    return found
+
+
+def per_iteration(func, iterations: int) -> float:
+    func()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1e3
+
+
+def bench(chunk_size: int, iterations: int):
+    buffer = bytearray(random.Random(0).randbytes(chunk_size))
+    print(f"{chunk_size // 1024} KiB chunk, no match (numpy: {memory_scanner.NUMPY_AVAILABLE})")
+    print(f"  {'patterns':<20} {'find loop':>10} {'sequential':>11} {'matcher':>9}")
+    for count in (2, 4, 8):
+        compiled = compile_patterns(PATTERNS[:count])
+        needles = [bytes(seq) for _, seqs in compiled for seq in seqs]
+        matcher = memory_scanner.PatternMatcher(compiled)
+        sequential = memory_scanner.PatternMatcher(compiled)
+        sequential.table = None
+        assert matcher.search(buffer, chunk_size) is None
+        before = per_iteration(lambda: per_pattern(buffer, needles), iterations)
+        fallback = per_iteration(lambda: sequential.search(buffer, chunk_size), iterations)
+        after = per_iteration(lambda: matcher.search(buffer, chunk_size), iterations)
+        print(f"  {count:<20} {before:>8.2f}ms {fallback:>9.2f}ms {after:>7.2f}ms")
+
+    compiled = compile_patterns(PATTERNS + [SIGNATURE])
+    matcher = memory_scanner.PatternMatcher(compiled)
+    after = per_iteration(lambda: matcher.search(buffer, chunk_size), iterations)
+    print(f"  {len(compiled)} incl. wildcard aob {'-':>10} {'-':>11} {after:>7.2f}ms")
+
+
+if __name__ == "__main__":
+    bench((int(sys.argv[1]) if len(sys.argv) > 1 else 1024) * 1024,
+          int(sys.argv[2]) if len(sys.argv) > 2 else 50)
@@ -0,0 +1,96 @@
+"""
+Simulation: fixed sleep-after-work ticks vs the deadline-based TickScheduler.
+
+Runs on a simulated clock (no real sleeping), with per-tick work times drawn around a
+typical capture + OCR cost and an occasional slow tick. Reports the effective tick
+period, how far the schedule drifts from the configured one and how many overruns
+were counted, then replays a session (menu without the game, gameplay, a death
+banner) to show how many captures each state costs and how fast a 2-hit streak
+confirms.
+
+Usage: python benchmarks/bench_tick_scheduler.py [ticks]
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tick_scheduler import TickScheduler, IDLE, NORMAL, BURST  # noqa: E402
+
+PERIOD = 0.30
+
+
+class SimClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+def work_times(ticks: int):
+    rng = random.Random(0)
+    # ~60 ms capture + OCR, one slow (GC, disk, Tesseract hiccup) tick in 50
+    return [0.45 if rng.random() < 0.02 else rng.uniform(0.03, 0.09) for _ in range(ticks)]
+
+
+def legacy(works) -> float:
+    clock = SimClock()
+    for work in works:
+        clock.now += work
+        clock.sleep(PERIOD)
+    return clock.now
+
+
+def scheduled(works):
+    clock = SimClock()
+    scheduler = TickScheduler({NORMAL: PERIOD}, clock=clock, sleep=clock.sleep)
+    for work in works:
+        clock.now += work
+        scheduler.wait()
+    return clock.now, scheduler
+
+
+def session():
+    """Menu with the game closed (60 s), gameplay (60 s), then a death banner on screen for 3 s."""
+    clock = SimClock()
+    scheduler = TickScheduler(clock=clock, sleep=clock.sleep)
+    phases = [(IDLE, 60.0, False), (NORMAL, 60.0, False), (NORMAL, 3.0, True)]
+    streak = 0
+    confirmed_after = None
+    banner_start = None
+    for base_state, seconds, banner in phases:
+        end = clock.now + seconds
+        if banner:
+            banner_start = clock.now
+        while clock.now < end:
+            clock.now += 0.06
+            if banner:
+                streak += 1
+                if streak >= 2 and confirmed_after is None:
+                    confirmed_after = clock.now - banner_start
+            scheduler.set_state(BURST if streak > 0 else base_state)
+            scheduler.wait()
+    return scheduler, confirmed_after
+
+
+if __name__ == "__main__":
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    works = work_times(ticks)
+    legacy_seconds = legacy(works)
+    scheduled_seconds, scheduler = scheduled(works)
+    print(f"{ticks} ticks, configured period {PERIOD:.2f}s, mean work {sum(works) / ticks * 1000:.0f} ms")
+    print(f"  sleep-after : {legacy_seconds / ticks:.3f}s/tick ({legacy_seconds - PERIOD * ticks:+.1f}s drift)")
+    print(f"  deadlines   : {scheduled_seconds / ticks:.3f}s/tick ({scheduled_seconds - PERIOD * ticks:+.1f}s drift), "
+          f"{scheduler.overruns} overruns (max {scheduler.max_overrun * 1000:.0f} ms)")
+
+    scheduler, confirmed_after = session()
+    print("\nSession: 60 s menu (game closed), 60 s gameplay, 3 s death banner")
+    print(f"  ticks by state: {scheduler.ticks} (fixed 0.30s would be ~{int(123 / 0.36)})")
+    print(f"  2-hit streak confirmed {confirmed_after:.2f}s after the banner appeared "
+          f"(~{2 * (PERIOD + 0.06):.2f}s at the fixed rate)")
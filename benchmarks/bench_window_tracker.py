@@ -0,0 +1,132 @@
+"""
+Microbenchmark: per-call window enumeration vs the cached-handle WindowTracker.
+
+Runs on any OS with FakeWindowProvider: a desktop of unrelated windows plus the game's
+window, which is moved, resized and finally closed and reopened while the daemon-style
+loop asks for its rectangle. Reports per-call time and how many windows were walked,
+then feeds the tracked rectangles through grab_region() (with a fake mss context) to
+show the capture region following the window.
+
+Usage: python benchmarks/bench_window_tracker.py [other windows] [calls]
+"""
+
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from window_tracker import FakeWindowProvider, WindowTracker  # noqa: E402
+
+GAME_PID = 4242
+
+
+def legacy_get_rect(provider: FakeWindowProvider, pid: int) -> Optional[Dict]:
+    """What get_window_rect() did before WindowTracker: enumerate on every call."""
+    windows = provider.find_windows(pid)
+    if not windows:
+        return None
+    return provider.get_rect(windows[0])
+
+
+def build_desktop(other_windows: int):
+    provider = FakeWindowProvider()
+    for i in range(other_windows):
+        provider.open(1000 + i, (i * 37) % 1600, (i * 23) % 900, 400, 300)
+    game_hwnd = provider.open(GAME_PID, 100, 100, 1280, 720)
+    return provider, game_hwnd
+
+
+def run(get_rect, provider: FakeWindowProvider, game_hwnd: int, calls: int) -> List[Optional[Dict]]:
+    """Ask for the game window every call; the window moves every 50 calls and restarts once."""
+    rects = []
+    for i in range(calls):
+        if i and i % 50 == 0:
+            provider.move(game_hwnd, 100 + i % 400, 100 + i % 200)
+        if i == calls // 2:
+            provider.close(game_hwnd)
+            game_hwnd = provider.open(GAME_PID, 300, 200, 1280, 720)
+        rects.append(get_rect(provider, GAME_PID))
+    return rects
+
+
+def bench(other_windows: int, calls: int):
+    provider, game_hwnd = build_desktop(other_windows)
+    started = time.perf_counter()
+    legacy_rects = run(legacy_get_rect, provider, game_hwnd, calls)
+    legacy_seconds = time.perf_counter() - started
+    legacy_walked = provider.windows_walked
+
+    provider, game_hwnd = build_desktop(other_windows)
+    tracker = WindowTracker(provider)
+    started = time.perf_counter()
+    tracked_rects = run(lambda p, pid: tracker.get_rect(pid), provider, game_hwnd, calls)
+    tracked_seconds = time.perf_counter() - started
+
+    print(f"{other_windows} other windows, {calls} calls")
+    print(f"  legacy : {legacy_seconds / calls * 1e6:8.2f} us/call, {legacy_walked} windows walked")
+    print(f"  tracker: {tracked_seconds / calls * 1e6:8.2f} us/call, {provider.windows_walked} windows walked "
+          f"({tracker.stats_summary()})")
+    print(f"  same rectangles: {legacy_rects == tracked_rects}")
+
+
+class FakeGrab:
+    def __init__(self, width: int, height: int):
+        self.size = (width, height)
+        self.raw = bytearray(width * height * 4)
+
+
+class FakeScreenshot:
+    """Stands in for mss: two 1920x1080 monitors side by side, records every grab box."""
+
+    def __init__(self):
+        self.monitors = [
+            {"left": 0, "top": 0, "width": 3840, "height": 1080},
+            {"left": 0, "top": 0, "width": 1920, "height": 1080},
+            {"left": 1920, "top": 0, "width": 1920, "height": 1080},
+        ]
+        self.boxes = []
+
+    def grab(self, box: Dict) -> FakeGrab:
+        self.boxes.append(dict(box))
+        return FakeGrab(box["width"], box["height"])
+
+
+def region_follow():
+    """Move a windowed game across the desktop and print the region grab_region() captures."""
+    import multi_game_death_counter as daemon
+
+    provider, game_hwnd = build_desktop(10)
+    tracker = WindowTracker(provider)
+    sct = FakeScreenshot()
+    region = {"left": 0.3, "top": 0.4, "width": 0.4, "height": 0.2, "use_percentages": True}
+
+    print("\nRegion follows the window (percent region 0.3/0.4/0.4/0.2):")
+    steps = [("start", None), ("move", (600, 300)), ("resize", (1600, 900)), ("move", (2100, 150))]
+    for action, args in steps:
+        if action == "move":
+            provider.move(game_hwnd, *args)
+        elif action == "resize":
+            provider.resize(game_hwnd, *args)
+        rect = tracker.get_rect(GAME_PID)
+        monitor = daemon.find_monitor_for_window(rect, sct.monitors[1:])
+        monitor_index = 1 if monitor is None else monitor + 1
+        daemon.grab_region(sct, monitor_index, region, window_rect=rect)
+        print(f"  {action:<7} window=({rect['left']}, {rect['top']}) {rect['width']}x{rect['height']} "
+              f"monitor={monitor_index} -> capture {sct.boxes[-1]}")
+    print(f"  lookups: {tracker.stats_summary()}")
+
+    iterations = 2000
+    rect = tracker.get_rect(GAME_PID)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        daemon.grab_region(sct, 2, region, window_rect=rect)
+    print(f"  grab_region (fake capture): {(time.perf_counter() - started) / iterations * 1e6:.1f} us/call")
+
+
+if __name__ == "__main__":
+    other = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    bench(other, count)
+    region_follow()
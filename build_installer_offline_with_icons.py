@@ -38,6 +38,17 @@ def build_installer_offline():
         "death_counter_settings.py",
         "log_monitor.py",
         "memory_scanner.py",
+        "ocr_engine.py",
+        "ocr_pipeline.py",
+        "template_matcher.py",
+        "keyword_matcher.py",
+        "ocr_processing.py",
+        "death_journal.py",
+        "log_writer.py",
+        "process_index.py",
+        "window_tracker.py",
+        "color_mask.py",
+        "tick_scheduler.py",
         "games_config.json",
         "reset_death_counter.py",
         "switch_game_manual.py",
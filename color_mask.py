@@ -0,0 +1,113 @@
+"""
+Color Mask Module
+Classifies capture pixels as banner text (red / white) with a precomputed lookup table
+instead of an HSV conversion plus one inRange per color range every frame.
+
+The table covers every 24-bit color: it is built once per set of HSV ranges by running
+OpenCV's own BGR -> HSV conversion and inRange over all 16.7M colors, so it gives
+exactly the mask the per-frame HSV path would. Applying it is one bitwise AND on the
+BGRA capture viewed as uint32 (B | G << 8 | R << 16) and one gather.
+
+Ranges are per game ("mask_hsv_ranges" in games_config.json); tables are cached by
+their ranges, so editing them simply builds a new table.
+"""
+
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+# OpenCV HSV (H 0-180, S/V 0-255) ranges: [[lower], [upper]]
+DEFAULT_MASK_HSV_RANGES = [
+    [[0, 30, 30], [15, 255, 255]],  # Red, low hue ("YOU DIED")
+    [[165, 30, 30], [180, 255, 255]],  # Red, high hue
+    [[0, 0, 200], [180, 30, 255]],  # White/bright, low saturation (Sekiro)
+]
+
+COLOR_COUNT = 1 << 24
+# Tables kept at once (16 MiB each)
+LUT_CACHE_SIZE = 4
+
+RangesKey = Tuple[Tuple[Tuple[int, int, int], Tuple[int, int, int]], ...]
+
+
+def ranges_key(ranges: Optional[Sequence]) -> RangesKey:
+    """Hashable, validated form of a mask_hsv_ranges config value (None = defaults)."""
+    if not ranges:
+        ranges = DEFAULT_MASK_HSV_RANGES
+    key = []
+    for lower, upper in ranges:
+        if len(lower) != 3 or len(upper) != 3:
+            raise ValueError(f"HSV range needs 3 values per bound: {lower} - {upper}")
+        key.append((tuple(int(v) for v in lower), tuple(int(v) for v in upper)))
+    return tuple(key)
+
+
+def build_mask_lut(ranges: RangesKey) -> np.ndarray:
+    """
+    Mask value (0/255) for every 24-bit color, indexed by B | G << 8 | R << 16.
+
+    Args:
+        ranges: Output of ranges_key()
+
+    Returns:
+        uint8 array of 2**24 entries
+    """
+    # Every color once, as a 4096x4096 BGR image (little-endian uint32 bytes are B, G, R, 0)
+    colors = np.arange(COLOR_COUNT, dtype=np.uint32).view(np.uint8).reshape(4096, 4096, 4)
+    bgr = np.ascontiguousarray(colors[:, :, :3])
+    del colors
+    hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+    del bgr
+    lut = np.zeros((4096, 4096), dtype=np.uint8)
+    part = np.empty_like(lut)
+    for lower, upper in ranges:
+        cv2.inRange(hsv, np.array(lower, dtype=np.uint8), np.array(upper, dtype=np.uint8), dst=part)
+        cv2.bitwise_or(lut, part, dst=lut)
+    return lut.reshape(-1)
+
+
+# Tables built so far, keyed by ranges
+_lut_cache: Dict[RangesKey, np.ndarray] = {}
+# Seconds spent building tables (for the log)
+build_seconds: List[float] = []
+
+
+def get_mask_lut(ranges: Optional[Sequence] = None) -> np.ndarray:
+    """Return the lookup table for these HSV ranges, building it on first use."""
+    key = ranges_key(ranges)
+    lut = _lut_cache.get(key)
+    if lut is None:
+        if len(_lut_cache) >= LUT_CACHE_SIZE:
+            _lut_cache.clear()
+        started = time.perf_counter()
+        lut = build_mask_lut(key)
+        build_seconds.append(time.perf_counter() - started)
+        _lut_cache[key] = lut
+    return lut
+
+
+def apply_mask_lut(frame: np.ndarray, lut: np.ndarray, out: Optional[np.ndarray] = None,
+                   index: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Text mask (0/255) of a BGRA capture.
+
+    Args:
+        frame: C-contiguous BGRA uint8 array (height, width, 4)
+        lut: Output of get_mask_lut()
+        out: Optional uint8 (height, width) buffer for the mask
+        index: Optional uint32 (height, width) scratch buffer
+
+    Returns:
+        The mask
+    """
+    height, width = frame.shape[:2]
+    pixels = frame.view(np.uint32).reshape(height, width)
+    if index is None:
+        index = np.empty((height, width), dtype=np.uint32)
+    if out is None:
+        out = np.empty((height, width), dtype=np.uint8)
+    np.bitwise_and(pixels, 0xFFFFFF, out=index)
+    np.take(lut, index, out=out)
+    return out
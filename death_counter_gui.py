@@ -11,10 +11,14 @@ import os
 import sys
 import json
 import time
+import atexit
 import subprocess
 import threading
 import shutil
 
+import death_journal
+from log_writer import LogWriter
+
 # Fix Tcl/Tk version conflicts by using system Tcl/Tk when available
 # This must be done BEFORE importing tkinter
 # CRITICAL: Set these environment variables before any tkinter import
@@ -147,6 +151,9 @@ LOCK_FILE = os.path.join(BASE_DIR, "daemon.lock")
 READY_FILE = os.path.join(BASE_DIR, "daemon.ready")  # Signal file created after full initialization
 STOP_FILE = os.path.join(BASE_DIR, "STOP")
 GUI_DEBUG_LOG = os.path.join(BASE_DIR, "gui_debug.log")  # Debug log for GUI
+# Buffered writer for gui_debug.log (same LogWriter class as the daemon's debug.log, rotated instead of truncated)
+GUI_LOG = LogWriter(GUI_DEBUG_LOG, max_bytes=1024 * 1024, backups=1)
+atexit.register(GUI_LOG.close)
 # Primary script path (new naming)
 SCRIPT_PATH = os.path.join(BASE_DIR, "multi_game_death_counter.py")
 # Backward compatibility: also try the old name if needed
@@ -295,8 +302,7 @@ class DeathCounterGUI:
             # Try state file first (most up-to-date)
             if os.path.exists(STATE_JSON):
                 try:
-                    with open(STATE_JSON, "r", encoding="utf-8") as f:
-                        state = json.load(f)
+                    state = death_journal.load_state(STATE_JSON)
                     game = state.get("current_game")
                     # Check if game is valid (exists in available games or is None/empty)
                     if game and game in (self.available_games if hasattr(self, 'available_games') and self.available_games else []):
@@ -339,8 +345,7 @@ class DeathCounterGUI:
         """Get death count for a specific game."""
         try:
             if os.path.exists(STATE_JSON):
-                with open(STATE_JSON, "r", encoding="utf-8") as f:
-                    state = json.load(f)
+                state = death_journal.load_state(STATE_JSON)
                 game_deaths = state.get("game_deaths", {})
                 return game_deaths.get(game_name, 0)
         except:
@@ -351,8 +356,7 @@ class DeathCounterGUI:
         """Get total deaths across all games."""
         try:
             if os.path.exists(STATE_JSON):
-                with open(STATE_JSON, "r", encoding="utf-8") as f:
-                    state = json.load(f)
+                state = death_journal.load_state(STATE_JSON)
                 return state.get("total_deaths", 0)
         except:
             pass
@@ -448,19 +452,9 @@ class DeathCounterGUI:
             # Update state
             state_updated = False
             if os.path.exists(STATE_JSON):
-                with open(STATE_JSON, "r", encoding="utf-8") as f:
-                    state = json.load(f)
-                state["current_game"] = game_name
-                # Mark this as the manually selected game (fallback when no game is detected)
-                state["manual_game"] = game_name
-                with open(STATE_JSON, "w", encoding="utf-8") as f:
-                    json.dump(state, f, indent=2)
-                    f.flush()  # Force write to disk
-                    # Ensure file is synced (must be done while file is open)
-                    try:
-                        os.fsync(f.fileno())
-                    except:
-                        pass
+                # Journal the switch; manual=True marks this as the manually selected game
+                # (fallback when no game is detected)
+                death_journal.append_event(STATE_JSON, "switch", game_name, source="GUI", manual=True)
                 state_updated = True
             else:
                 # Create state file if it doesn't exist
@@ -840,7 +834,7 @@ class DeathCounterGUI:
         debug_log_created = False
         try:
             os.makedirs(BASE_DIR, exist_ok=True)  # Ensure directory exists
-            with open(GUI_DEBUG_LOG, "w", encoding="utf-8") as f:
+            with GUI_LOG.open_batch() as f:
                 f.write(f"{'='*70}\n")
                 f.write(f"GUI: start_daemon() called at {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
                 f.write(f"GUI: BASE_DIR = {BASE_DIR}\n")
@@ -860,7 +854,7 @@ class DeathCounterGUI:
         # Check if daemon is running
         try:
             if debug_log_created:
-                with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                with GUI_LOG.open_batch() as f:
                     f.write("GUI: Calling is_daemon_running()...\n")
         except:
             pass
@@ -869,7 +863,7 @@ class DeathCounterGUI:
         
         try:
             if debug_log_created:
-                with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                with GUI_LOG.open_batch() as f:
                     f.write(f"GUI: is_daemon_running() returned: {daemon_running_check}\n")
         except:
             pass
@@ -877,7 +871,7 @@ class DeathCounterGUI:
         if daemon_running_check:
             try:
                 if debug_log_created:
-                    with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                    with GUI_LOG.open_batch() as f:
                         f.write("GUI: Daemon appears to be running - checking process...\n")
             except:
                 pass
@@ -947,7 +941,7 @@ class DeathCounterGUI:
         
         try:
             if debug_log_created:
-                with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                with GUI_LOG.open_batch() as f:
                     f.write("GUI: Finding Python executable...\n")
                     f.write(f"GUI: sys.frozen = {getattr(sys, 'frozen', False)}\n")
         except:
@@ -957,7 +951,7 @@ class DeathCounterGUI:
         python_cmd = None
         try:
             if debug_log_created:
-                with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                with GUI_LOG.open_batch() as f:
                     f.write("GUI: About to check sys.frozen...\n")
                     f.flush()
         except:
@@ -990,7 +984,7 @@ class DeathCounterGUI:
                 # Running as script - use sys.executable
                 try:
                     if debug_log_created:
-                        with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                        with GUI_LOG.open_batch() as f:
                             f.write(f"GUI: Running as script, using sys.executable\n")
                             f.write(f"GUI: sys.executable = {sys.executable}\n")
                             f.flush()
@@ -1001,7 +995,7 @@ class DeathCounterGUI:
                 if python_cmd.endswith('pythonw.exe'):
                     try:
                         if debug_log_created:
-                            with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                            with GUI_LOG.open_batch() as f:
                                 f.write(f"GUI: sys.executable is pythonw.exe, looking for python.exe\n")
                                 f.flush()
                     except:
@@ -1012,7 +1006,7 @@ class DeathCounterGUI:
                         python_cmd = python_exe
                         try:
                             if debug_log_created:
-                                with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                                with GUI_LOG.open_batch() as f:
                                     f.write(f"GUI: Found python.exe: {python_exe}\n")
                                     f.flush()
                         except:
@@ -1020,7 +1014,7 @@ class DeathCounterGUI:
                     else:
                         try:
                             if debug_log_created:
-                                with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                                with GUI_LOG.open_batch() as f:
                                     f.write(f"GUI: python.exe not found in {python_dir}\n")
                                     f.flush()
                         except:
@@ -1028,7 +1022,7 @@ class DeathCounterGUI:
                 else:
                     try:
                         if debug_log_created:
-                            with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                            with GUI_LOG.open_batch() as f:
                                 f.write(f"GUI: Using sys.executable as-is: {python_cmd}\n")
                                 f.flush()
                     except:
@@ -1037,7 +1031,7 @@ class DeathCounterGUI:
             # If there's an error finding Python, log it
             try:
                 if debug_log_created:
-                    with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                    with GUI_LOG.open_batch() as f:
                         f.write(f"GUI: ERROR in Python finding logic: {e}\n")
                         import traceback
                         f.write(traceback.format_exc())
@@ -1049,7 +1043,7 @@ class DeathCounterGUI:
         
         try:
             if debug_log_created:
-                with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                with GUI_LOG.open_batch() as f:
                     f.write(f"GUI: Final Python command: {python_cmd}\n")
                     f.write(f"GUI: Python exists: {os.path.exists(python_cmd) if python_cmd else False}\n")
                     f.flush()
@@ -1059,7 +1053,7 @@ class DeathCounterGUI:
         if not python_cmd:
             try:
                 if debug_log_created:
-                    with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                    with GUI_LOG.open_batch() as f:
                         f.write("GUI: ERROR - python_cmd is None!\n")
                         f.flush()
             except:
@@ -1072,7 +1066,7 @@ class DeathCounterGUI:
         # and we'll get better error messages from the daemon itself if Python doesn't work
         try:
             if debug_log_created:
-                with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                with GUI_LOG.open_batch() as f:
                     f.write("GUI: Skipping Python test (already verified executable exists)\n")
                     f.write(f"GUI: Using Python: {python_cmd}\n")
                     f.write("GUI: Proceeding directly to start daemon\n")
@@ -1083,7 +1077,7 @@ class DeathCounterGUI:
         # Start daemon in background
         try:
             if debug_log_created:
-                with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                with GUI_LOG.open_batch() as f:
                     f.write(f"GUI: About to start daemon process with subprocess.Popen\n")
                     f.write(f"GUI: Python: {python_cmd}\n")
                     f.write(f"GUI: Script: {script_path}\n")
@@ -1097,7 +1091,7 @@ class DeathCounterGUI:
             # Use subprocess.PIPE but also allow seeing output for debugging
             try:
                 if debug_log_created:
-                    with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                    with GUI_LOG.open_batch() as f:
                         f.write("GUI: Calling subprocess.Popen() now...\n")
                         f.flush()
             except:
@@ -1129,7 +1123,7 @@ class DeathCounterGUI:
             
             try:
                 if debug_log_created:
-                    with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                    with GUI_LOG.open_batch() as f:
                         f.write(f"GUI: subprocess.Popen() completed\n")
                         f.write(f"GUI: Daemon process PID: {self.daemon_process.pid}\n")
                         f.write(f"GUI: Process poll result: {self.daemon_process.poll()}\n")
@@ -1137,7 +1131,7 @@ class DeathCounterGUI:
             except Exception as e:
                 try:
                     if debug_log_created:
-                        with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                        with GUI_LOG.open_batch() as f:
                             f.write(f"GUI: ERROR logging process info: {e}\n")
                             f.flush()
                 except:
@@ -1145,7 +1139,7 @@ class DeathCounterGUI:
         except Exception as e:
             try:
                 if debug_log_created:
-                    with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                    with GUI_LOG.open_batch() as f:
                         f.write(f"GUI: ERROR - Exception during subprocess.Popen(): {e}\n")
                         import traceback
                         f.write(traceback.format_exc())
@@ -1165,7 +1159,7 @@ class DeathCounterGUI:
         # Debug: Log paths being checked to file
         try:
             if debug_log_created:
-                with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                with GUI_LOG.open_batch() as f:
                     f.write(f"\n{'='*70}\n")
                     f.write(f"GUI: Starting daemon at {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
                     f.write(f"GUI: Checking for LOCK_FILE at: {LOCK_FILE}\n")
@@ -1184,7 +1178,7 @@ class DeathCounterGUI:
             if waited > 0 and int(waited * 10) % 10 == 0:  # Every 1 second
                     try:
                         if debug_log_created:
-                            with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                            with GUI_LOG.open_batch() as f:
                                 f.write(f"GUI: Wait loop - waited {waited:.1f}s, checking files...\n")
                                 f.write(f"GUI:   LOCK_FILE exists: {os.path.exists(LOCK_FILE)}\n")
                                 f.write(f"GUI:   READY_FILE exists: {os.path.exists(READY_FILE)}\n")
@@ -1252,7 +1246,7 @@ class DeathCounterGUI:
                     lock_file_created = True
                     if waited < 0.5:  # Only log once
                         try:
-                            with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                            with GUI_LOG.open_batch() as f:
                                 f.write(f"GUI: Lock file found at: {LOCK_FILE}\n")
                         except:
                             pass
@@ -1271,7 +1265,7 @@ class DeathCounterGUI:
                                     if self.daemon_process.poll() is None:
                                         # Daemon is fully ready!
                                         try:
-                                            with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                                            with GUI_LOG.open_batch() as f:
                                                 f.write(f"GUI: Ready file found and verified! Size: {stat.st_size} bytes\n")
                                                 f.write(f"GUI: Daemon started successfully!\n")
                                         except:
@@ -1282,27 +1276,27 @@ class DeathCounterGUI:
                                     else:
                                         # Process died - break out and show error
                                         try:
-                                            with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                                            with GUI_LOG.open_batch() as f:
                                                 f.write(f"GUI: Ready file exists but process exited (code: {self.daemon_process.returncode})\n")
                                         except:
                                             pass
                                         break
                                 else:
                                     try:
-                                        with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                                        with GUI_LOG.open_batch() as f:
                                             f.write(f"GUI: Ready file exists but is empty (attempt {check_attempt + 1})\n")
                                     except:
                                         pass
                             except Exception as e:
                                 try:
-                                    with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                                    with GUI_LOG.open_batch() as f:
                                         f.write(f"GUI: Error checking ready file: {e}\n")
                                 except:
                                     pass
                         else:
                             if check_attempt == 0 and waited > 1:
                                 try:
-                                    with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                                    with GUI_LOG.open_batch() as f:
                                         f.write(f"GUI: Ready file not found yet (attempt {check_attempt + 1}), waited {waited:.1f}s\n")
                                         f.write(f"GUI: LOCK_FILE exists: {os.path.exists(LOCK_FILE)}\n")
                                         f.write(f"GUI: READY_FILE exists: {os.path.exists(READY_FILE)}\n")
@@ -1345,7 +1339,7 @@ class DeathCounterGUI:
         # Log timeout to debug file
         try:
             if debug_log_created:
-                with open(GUI_DEBUG_LOG, "a", encoding="utf-8") as f:
+                with GUI_LOG.open_batch() as f:
                     f.write(f"GUI: TIMEOUT after {waited:.1f} seconds\n")
                     f.write(f"GUI: LOCK_FILE exists: {os.path.exists(LOCK_FILE)}\n")
                     f.write(f"GUI: READY_FILE exists: {os.path.exists(READY_FILE)}\n")
@@ -158,10 +158,21 @@ class SettingsWindow:
         self.mem_status_label = ttk.Label(mem_frame, text=mem_status_text, foreground=mem_status_color)
         self.mem_status_label.pack(side=tk.LEFT, padx=(10, 0))
         
+        # Template Matching
+        self.detection_vars["template"] = BooleanVar(value=detection_methods.get("template", False))
+        template_frame = ttk.Frame(methods_frame)
+        template_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+        ttk.Checkbutton(template_frame, text="Template Matching (needs recorded templates)", variable=self.detection_vars["template"]).pack(side=tk.LEFT)
+        template_status_text = "● Active" if detection_methods.get("template", False) else "○ Inactive"
+        template_status_color = "green" if detection_methods.get("template", False) else "gray"
+        self.template_status_label = ttk.Label(template_frame, text=template_status_text, foreground=template_status_color)
+        self.template_status_label.pack(side=tk.LEFT, padx=(10, 0))
+        
         # Bind to update status labels
         self.detection_vars["ocr"].trace("w", lambda *args: self.update_detection_status_labels())
         self.detection_vars["log_monitoring"].trace("w", lambda *args: self.update_detection_status_labels())
         self.detection_vars["memory_scanning"].trace("w", lambda *args: self.update_detection_status_labels())
+        self.detection_vars["template"].trace("w", lambda *args: self.update_detection_status_labels())
         
         # ==========================================
         # OCR SETTINGS
@@ -486,6 +497,7 @@ class SettingsWindow:
         status_ocr = "● Active" if self.detection_vars["ocr"].get() else "○ Inactive"
         status_log = "● Active" if self.detection_vars["log_monitoring"].get() else "○ Inactive"
         status_mem = "● Active" if self.detection_vars["memory_scanning"].get() else "○ Inactive"
+        status_template = "● Active" if self.detection_vars["template"].get() else "○ Inactive"
         
         self.ocr_status_label.config(
             text=status_ocr,
@@ -499,6 +511,10 @@ class SettingsWindow:
             text=status_mem,
             foreground="green" if self.detection_vars["memory_scanning"].get() else "gray"
         )
+        self.template_status_label.config(
+            text=status_template,
+            foreground="green" if self.detection_vars["template"].get() else "gray"
+        )
     
     def update_fuzzy_status(self):
         """Update the fuzzy OCR matching status label."""
@@ -520,6 +536,7 @@ class SettingsWindow:
             self.detection_vars["ocr"].set(True)
             self.detection_vars["log_monitoring"].set(False)
             self.detection_vars["memory_scanning"].set(False)
+            self.detection_vars["template"].set(False)
             
             # Reset OCR settings
             self.vars["fuzzy_ocr_matching"].set(True)
@@ -619,7 +636,8 @@ class SettingsWindow:
             settings["detection_methods"] = {
                 "ocr": self.detection_vars["ocr"].get(),
                 "log_monitoring": self.detection_vars["log_monitoring"].get(),
-                "memory_scanning": self.detection_vars["memory_scanning"].get()
+                "memory_scanning": self.detection_vars["memory_scanning"].get(),
+                "template": self.detection_vars["template"].get()
             }
             
             # Update current game
@@ -0,0 +1,429 @@
+"""
+Death Event Journal Module
+Append-only log of state changes (deaths, game switches, resets, manual corrections)
+next to death_state.json, so a death costs one small line append instead of a full
+JSON rewrite.
+
+death_state.json stays the snapshot every tool reads: the daemon periodically folds
+the journal into it (compaction) and load_state() replays whatever was appended since.
+Events are deltas, so writers in other processes (GUI, reset and switch scripts) can
+append without coordinating with the daemon.
+
+Compaction renames the journal aside as generation N (death_journal.jsonl.N.compacting)
+and folds only that file; the snapshot records the last generation folded in. Replay
+never compares timestamps, so events from other processes or after a clock step are
+never dropped. Compactors (daemon, reset script, `set`) take death_journal.lock, so
+only one folds and deletes renamed files at a time.
+
+    python death_journal.py                       # show the replayed state
+    python death_journal.py set "Elden Ring" 42   # correct a game's death count
+"""
+
+import os
+import sys
+import json
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+JOURNAL_NAME = "death_journal.jsonl"
+COMPACTING_SUFFIX = ".compacting"
+LOCK_NAME = "death_journal.lock"
+
+# How long compact() waits for another process's compaction to finish
+LOCK_WAIT_SECONDS = 2.0
+# Compaction takes milliseconds; a lock file older than this was left by a crashed compactor
+STALE_LOCK_SECONDS = 30.0
+# load_state() attempts when a compaction changes the files while they are being read
+LOAD_ATTEMPTS = 5
+
+
+class JournalBusy(RuntimeError):
+    """Another process holds the compaction lock."""
+
+EVENT_TYPES = ("death", "switch", "reset", "correction")
+
+
+def journal_path(state_path: str) -> str:
+    """Journal file that belongs to a death_state.json snapshot."""
+    return os.path.join(os.path.dirname(os.path.abspath(state_path)), JOURNAL_NAME)
+
+
+def compacting_path(state_path: str, generation: int) -> str:
+    """Name the journal is renamed to while compaction folds it in as this generation."""
+    return f"{journal_path(state_path)}.{int(generation)}{COMPACTING_SUFFIX}"
+
+
+def lock_path(state_path: str) -> str:
+    """Lock file held while a process compacts the journal."""
+    return os.path.join(os.path.dirname(os.path.abspath(state_path)), LOCK_NAME)
+
+
+def _acquire_lock(path: str, wait_seconds: float) -> bool:
+    """Create the lock file exclusively, waiting up to wait_seconds (stale locks are broken)."""
+    deadline = time.time() + wait_seconds
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > STALE_LOCK_SECONDS:
+                    os.remove(path)
+                    continue
+            except OSError:
+                continue  # Released (or broken) meanwhile
+            if time.time() >= deadline:
+                return False
+            time.sleep(0.05)
+            continue
+        try:
+            os.write(fd, str(os.getpid()).encode("ascii"))
+        finally:
+            os.close(fd)
+        return True
+
+
+def _release_lock(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def compacting_files(state_path: str) -> List[Tuple[int, str]]:
+    """Journals renamed aside for compaction, as (generation, path) sorted by generation."""
+    directory = os.path.dirname(journal_path(state_path))
+    prefix = JOURNAL_NAME + "."
+    found = []
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return found
+    for name in names:
+        if name.startswith(prefix) and name.endswith(COMPACTING_SUFFIX):
+            generation = name[len(prefix):-len(COMPACTING_SUFFIX)]
+            if generation.isdigit():
+                found.append((int(generation), os.path.join(directory, name)))
+    return sorted(found)
+
+
+def default_state() -> Dict:
+    """State for a fresh install."""
+    return {
+        "total_deaths": 0,
+        "game_deaths": {},
+        "tick": 0,
+        "streak": 0,
+        "last_death_ts": 0.0,
+        "current_game": None,
+    }
+
+
+def read_snapshot(state_path: str) -> Dict:
+    """Read death_state.json (defaults for anything missing or unreadable)."""
+    state = {}
+    if os.path.exists(state_path):
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except Exception:
+            state = {}
+    for key, value in default_state().items():
+        state.setdefault(key, value)
+    state.setdefault("journal_generation", 0)
+    return state
+
+
+def read_events(path: str) -> List[Dict]:
+    """Read journal events, skipping lines that don't parse (e.g. a write cut short by a crash)."""
+    events = []
+    if not os.path.exists(path):
+        return events
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(event, dict) and event.get("type") in EVENT_TYPES:
+                    events.append(event)
+    except Exception:
+        pass
+    return events
+
+
+def apply_event(state: Dict, event: Dict):
+    """Apply one journal event to a state dict in place."""
+    event_type = event.get("type")
+    game = event.get("game")
+    game_deaths = state.setdefault("game_deaths", {})
+
+    if event_type == "death" and game:
+        game_deaths[game] = int(game_deaths.get(game, 0)) + 1
+        state["total_deaths"] = int(state.get("total_deaths", 0)) + 1
+        state["last_death_ts"] = float(event.get("death_ts", event.get("ts", 0.0)))
+        state["streak"] = 0
+    elif event_type == "switch" and game:
+        state["current_game"] = game
+        if event.get("manual"):
+            state["manual_game"] = game
+    elif event_type == "reset":
+        if game:
+            state["total_deaths"] = max(0, int(state.get("total_deaths", 0)) - int(game_deaths.get(game, 0)))
+            game_deaths[game] = 0
+        else:
+            for name in game_deaths:
+                game_deaths[name] = 0
+            state["total_deaths"] = 0
+        state["last_death_ts"] = 0.0
+        state["streak"] = 0
+    elif event_type == "correction" and game:
+        deaths = max(0, int(event.get("deaths", 0)))
+        delta = deaths - int(game_deaths.get(game, 0))
+        game_deaths[game] = deaths
+        state["total_deaths"] = max(0, int(state.get("total_deaths", 0)) + delta)
+
+    if event.get("tick") is not None:
+        state["tick"] = max(int(state.get("tick", 0)), int(event["tick"]))
+
+
+def _fold_pending(state_path: str, state: Dict) -> List[str]:
+    """
+    Apply renamed journals not yet folded into the snapshot (generation above the
+    snapshot's journal_generation) to state, in generation order.
+
+    Returns:
+        The files applied
+
+    Raises:
+        FileNotFoundError: A listed file was deleted before it could be read (a compactor
+                           folded it into a newer snapshot; read the snapshot again)
+    """
+    applied = []
+    for generation, path in compacting_files(state_path):
+        if generation <= int(state.get("journal_generation", 0)):
+            continue  # Folded already; compaction was interrupted before deleting it
+        events = read_events(path)
+        if not events and not os.path.exists(path):
+            raise FileNotFoundError(path)
+        for event in events:
+            apply_event(state, event)
+        state["journal_generation"] = generation
+        applied.append(path)
+    return applied
+
+
+def load_state(state_path: str) -> Dict:
+    """
+    Load the snapshot and replay every journal event not folded into it yet.
+
+    A journal renamed for compaction is replayed only if its generation is newer than
+    the snapshot's, which makes replay safe after a crash in the middle of compaction.
+    The live journal is always replayed in full. If another process compacts while the
+    files are read (a renamed file disappears, or the snapshot or renamed files change),
+    the read starts over from the new snapshot.
+    """
+    for _ in range(LOAD_ATTEMPTS):
+        state = read_snapshot(state_path)
+        before = (state["journal_generation"], compacting_files(state_path))
+        try:
+            _fold_pending(state_path, state)
+        except FileNotFoundError:
+            continue
+        for event in read_events(journal_path(state_path)):
+            apply_event(state, event)
+        if (read_snapshot(state_path)["journal_generation"], compacting_files(state_path)) == before:
+            break
+    return state
+
+
+def append_event(state_path: str, event_type: str, game: Optional[str] = None, source: Optional[str] = None,
+                 tick: Optional[int] = None, **fields) -> Dict:
+    """
+    Append one event to the journal.
+
+    Args:
+        state_path: Path of death_state.json (the journal lives next to it)
+        event_type: "death", "switch", "reset" or "correction"
+        game: Game the event applies to (None for a reset of all games)
+        source: What produced the event (OCR, LOG, MEMORY, TEMPLATE, GUI, ...)
+        tick: Daemon tick, if known
+        **fields: Extra event fields (death_ts for deaths, manual=True for switches, deaths=N for corrections)
+
+    The event's ts is always the append time, so ts order matches journal order
+    (a death's capture time goes in death_ts).
+
+    Returns:
+        The event as written
+    """
+    event = {"ts": time.time(), "type": event_type, "game": game}
+    if source:
+        event["source"] = source
+    if tick is not None:
+        event["tick"] = int(tick)
+    event.update(fields)
+    line = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+    with open(journal_path(state_path), "a+b") as f:
+        # Start on a fresh line if the last append was cut short by a crash
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                line = b"\n" + line
+        f.write(line)
+        f.flush()
+        try:
+            os.fsync(f.fileno())
+        except OSError:
+            pass
+    return event
+
+
+def write_snapshot(state_path: str, state: Dict):
+    """Write death_state.json atomically (temp file + rename), so readers never see a partial file."""
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+        f.flush()
+        try:
+            os.fsync(f.fileno())
+        except OSError:
+            pass
+    os.replace(tmp_path, state_path)
+
+
+def compact(state_path: str, overrides: Optional[Dict] = None, wait_seconds: float = LOCK_WAIT_SECONDS) -> Dict:
+    """
+    Fold the journal into death_state.json and start a new, empty journal.
+
+    The journal is renamed aside first (as the next generation), so events appended by
+    other processes while compacting land in a fresh file. Only the renamed file is
+    folded into the snapshot, and it is deleted only after the new snapshot, recording
+    its generation, is on disk. A renamed file left by an interrupted compaction is
+    folded first, before the live journal is renamed again.
+
+    Args:
+        state_path: Path of death_state.json
+        overrides: Fields the caller owns and wants persisted (e.g. the daemon's tick)
+        wait_seconds: How long to wait for another process's compaction
+
+    Returns:
+        The compacted state (snapshot plus anything appended since)
+
+    Raises:
+        JournalBusy: Another process is still compacting (events stay in the journal)
+    """
+    lock = lock_path(state_path)
+    if not _acquire_lock(lock, wait_seconds):
+        raise JournalBusy("Another process is compacting the journal")
+    try:
+        return _compact_locked(state_path, overrides)
+    finally:
+        _release_lock(lock)
+
+
+def _compact_locked(state_path: str, overrides: Optional[Dict]) -> Dict:
+    """compact() while holding the lock."""
+    snapshot = read_snapshot(state_path)
+    generation = int(snapshot["journal_generation"])
+    folded = [path for gen, path in compacting_files(state_path) if gen <= generation]
+    if not any(gen > generation for gen, _ in compacting_files(state_path)):
+        path = journal_path(state_path)
+        target = compacting_path(state_path, generation + 1)
+        if os.path.exists(path) and not os.path.exists(target):
+            try:
+                os.rename(path, target)
+            except OSError:
+                pass  # Journal held open by an appender (Windows); it is folded next time
+    folded += _fold_pending(state_path, snapshot)
+    if overrides:
+        snapshot.update(overrides)
+    write_snapshot(state_path, snapshot)
+    for path in folded:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return load_state(state_path)
+
+
+class DeathJournal:
+    """
+    The daemon's handle on the journal: records events as they happen and compacts
+    after every compact_every events or compact_seconds, whichever comes first.
+    """
+
+    def __init__(self, state_path: str, compact_every: int = 50, compact_seconds: float = 300.0,
+                 log_callback: Optional[Callable[[str], None]] = None):
+        """
+        Initialize the journal.
+
+        Args:
+            state_path: Path of death_state.json
+            compact_every: Events recorded before the journal is folded into the snapshot
+            compact_seconds: Max time between compactions while events are pending
+            log_callback: Optional callback function for logging
+        """
+        self.state_path = state_path
+        self.compact_every = max(1, int(compact_every))
+        self.compact_seconds = float(compact_seconds)
+        self.log_callback = log_callback or (lambda msg: None)
+        self.pending = len(read_events(journal_path(state_path)))
+        self.last_compact = time.time()
+
+    def load(self) -> Dict:
+        """Snapshot plus replayed journal."""
+        return load_state(self.state_path)
+
+    def record(self, event_type: str, game: Optional[str] = None, source: Optional[str] = None,
+               tick: Optional[int] = None, **fields) -> Optional[Dict]:
+        """Append an event (see append_event). Errors are logged, never raised."""
+        try:
+            event = append_event(self.state_path, event_type, game, source, tick, **fields)
+        except Exception as e:
+            self.log_callback(f"DeathJournal: Failed to record {event_type} event: {e}")
+            return None
+        self.pending += 1
+        return event
+
+    def needs_compaction(self) -> bool:
+        """Check if enough events (or time) have accumulated to rewrite the snapshot."""
+        if not self.pending:
+            return False
+        return self.pending >= self.compact_every or time.time() - self.last_compact >= self.compact_seconds
+
+    def compact(self, overrides: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Fold the journal into the snapshot (see compact). Errors are logged, never raised.
+        Doesn't wait if another process is compacting: the events stay pending and the next
+        call tries again, so the tick loop never blocks on the lock.
+        """
+        try:
+            state = compact(self.state_path, overrides, wait_seconds=0.0)
+        except JournalBusy:
+            return None
+        except Exception as e:
+            self.log_callback(f"DeathJournal: Compaction failed: {e}")
+            return None
+        self.pending = 0
+        self.last_compact = time.time()
+        return state
+
+
+if __name__ == "__main__":
+    base_dir = os.path.dirname(os.path.abspath(sys.executable if getattr(sys, "frozen", False) else __file__))
+    state_json = os.path.join(base_dir, "death_state.json")
+    if len(sys.argv) == 4 and sys.argv[1] == "set":
+        append_event(state_json, "correction", sys.argv[2], source="MANUAL", deaths=int(sys.argv[3]))
+        try:
+            compact(state_json)
+        except JournalBusy:
+            pass  # The correction is journaled; the compacting process folds it next time
+        print(f"{sys.argv[2]}: deaths set to {int(sys.argv[3])}")
+    elif len(sys.argv) == 1:
+        print(json.dumps(load_state(state_json), indent=2))
+    else:
+        print('Usage: python death_journal.py [set "<game name>" <deaths>]')
+        raise SystemExit(1)
@@ -31,6 +31,17 @@ EMBEDDED_FILES = {
     "death_counter_settings.py": "death_counter_settings.py",
     "log_monitor.py": "log_monitor.py",
     "memory_scanner.py": "memory_scanner.py",
+    "ocr_engine.py": "ocr_engine.py",
+    "ocr_pipeline.py": "ocr_pipeline.py",
+    "template_matcher.py": "template_matcher.py",
+    "keyword_matcher.py": "keyword_matcher.py",
+    "ocr_processing.py": "ocr_processing.py",
+    "death_journal.py": "death_journal.py",
+    "log_writer.py": "log_writer.py",
+    "process_index.py": "process_index.py",
+    "window_tracker.py": "window_tracker.py",
+    "color_mask.py": "color_mask.py",
+    "tick_scheduler.py": "tick_scheduler.py",
     "games_config.json": "games_config.json",
     "reset_death_counter.py": "reset_death_counter.py",
     "switch_game_manual.py": "switch_game_manual.py",
@@ -0,0 +1,224 @@
+"""
+Keyword Matching Module
+Compiles a game's death keywords (plus OCR fuzzy variants and exclusions) once, when the
+config is loaded or the game switches, so each tick is a single regex pass over the OCR text.
+
+Fuzzy variants are expressed as confusable-character classes (O -> [O0], I -> [I1], ...)
+instead of enumerating substituted strings, so long keywords don't lose coverage and
+keywords that only differ by confusables collapse into one alternative.
+
+When a game sets max_edit_distance, frames the regex misses get a second chance through
+a bounded approximate-substring search (weighted edit distance, cheap substitutions for
+confusables), so dropped or garbled letters ("YOUDED", "YOUDIFD") still match a single
+canonical keyword.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+# OCR character substitutions (bidirectional): letters that OCR confuses with digits
+OCR_CONFUSABLES: Dict[str, str] = {
+    'O': '0', '0': 'O',
+    'I': '1', '1': 'I',
+    'E': '3', '3': 'E',
+    'A': '4', '4': 'A',
+    'S': '5', '5': 'S',
+    'G': '6', '6': 'G',
+    'T': '7', '7': 'T',
+    'B': '8', '8': 'B',
+    'Z': '2', '2': 'Z',
+}
+
+# False positives: enemy felled, target destroyed, etc.
+DEFAULT_EXCLUDE_KEYWORDS = ["ENEMYFELLED", "ENEMYFELLE", "TARGETDESTROYED", "TARGETDESTROYE"]
+
+# Edit costs for approximate matching
+CONFUSABLE_COST = 0.25  # O<->0, I<->1, E<->3, ...
+SUBSTITUTION_COST = 1.0
+INSERTION_COST = 1.0  # Extra character in the OCR text
+DELETION_COST = 1.0  # Keyword character missing from the OCR text
+# Never allow more than one full edit per this many keyword characters (keeps "YOUDI" from matching "YOUDA")
+CHARS_PER_EDIT = 6
+# Extra cheap substitutions for approximate matching only (lowercase l is uppercased to L by ocr_text)
+APPROXIMATE_CONFUSABLES: Dict[str, str] = {
+    'I': 'L', 'L': 'I1', '1': 'L',
+}
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Normalize a configured keyword the same way OCR text is cleaned (uppercase, no spaces)."""
+    return keyword.upper().replace(' ', '')
+
+
+def _char_pattern(char: str, fuzzy: bool) -> str:
+    """Regex fragment for one keyword character (a confusable class in fuzzy mode)."""
+    if fuzzy and char in OCR_CONFUSABLES:
+        return '[' + re.escape(char) + re.escape(OCR_CONFUSABLES[char]) + ']'
+    return re.escape(char)
+
+
+def _alternation(keywords: List[str], fuzzy: bool) -> Optional[re.Pattern]:
+    """Compile keywords into one alternation regex (longest first, duplicates removed)."""
+    patterns = []
+    seen = set()
+    for keyword in sorted((normalize_keyword(k) for k in keywords if k), key=len, reverse=True):
+        if not keyword:
+            continue
+        pattern = ''.join(_char_pattern(c, fuzzy) for c in keyword)
+        if pattern not in seen:
+            seen.add(pattern)
+            patterns.append(pattern)
+    if not patterns:
+        return None
+    return re.compile('|'.join(patterns))
+
+
+def _canonical(keyword: str) -> str:
+    """Fold confusables to their letter so keyword variants dedupe (Y0UD13D -> YOUDIED)."""
+    return ''.join(OCR_CONFUSABLES[c] if c.isdigit() and c in OCR_CONFUSABLES else c for c in keyword)
+
+
+def _cost_rows(keyword: str) -> List[Dict[str, float]]:
+    """Per keyword position: substitution cost for each text character that isn't a full edit."""
+    rows = []
+    for char in keyword:
+        row = {char: 0.0}
+        for other in OCR_CONFUSABLES.get(char, '') + APPROXIMATE_CONFUSABLES.get(char, ''):
+            row.setdefault(other, CONFUSABLE_COST)
+        rows.append(row)
+    return rows
+
+
+def _piece_prefilter(cost_rows: List[Dict[str, float]], allowed: float) -> Optional[re.Pattern]:
+    """
+    Regex every text within allowed distance of the keyword must match, or None if there is none.
+
+    A match makes at most floor(allowed / cheapest full edit) full edits, so cutting the
+    keyword into one more piece than that leaves a piece matched with only zero-cost and
+    confusable characters - a plain regex search that rules out most non-matching text
+    before the edit-distance table is computed.
+    """
+    full_edits = int(allowed // min(SUBSTITUTION_COST, INSERTION_COST, DELETION_COST))
+    count = full_edits + 1
+    if count > len(cost_rows):
+        return None
+    size, extra = divmod(len(cost_rows), count)
+    pieces = []
+    start = 0
+    for i in range(count):
+        end = start + size + (1 if i < extra else 0)
+        pieces.append(''.join('[' + ''.join(re.escape(c) for c in row) + ']' for row in cost_rows[start:end]))
+        start = end
+    return re.compile('|'.join(pieces))
+
+
+def approximate_substring_distance(cost_rows: List[Dict[str, float]], text: str, max_distance: float) -> float:
+    """
+    Smallest weighted edit distance between a keyword and any substring of text
+    (Sellers' algorithm: one column of the DP table per text character, so time is
+    linear in len(text) for a fixed keyword). Stops early once max_distance is reached.
+
+    Args:
+        cost_rows: Output of _cost_rows(keyword)
+        text: Cleaned OCR text
+        max_distance: Distance that counts as a match
+
+    Returns:
+        The distance found (<= max_distance on a match)
+    """
+    m = len(cost_rows)
+    column = [j * DELETION_COST for j in range(m + 1)]
+    best = column[m]
+    if best <= max_distance:
+        return best
+    for char in text:
+        diagonal = column[0]
+        column[0] = 0.0  # A match may start anywhere in the text
+        for j in range(1, m + 1):
+            value = min(diagonal + cost_rows[j - 1].get(char, SUBSTITUTION_COST),
+                        column[j] + INSERTION_COST,
+                        column[j - 1] + DELETION_COST)
+            diagonal = column[j]
+            column[j] = value
+        if column[m] < best:
+            best = column[m]
+            if best <= max_distance:
+                break
+    return best
+
+
+class KeywordMatcher:
+    """
+    Precompiled death keyword matcher for one game.
+    Build once per game (or config load); call matches() every tick.
+    """
+
+    def __init__(self, keywords: List[str], fuzzy_matching: bool = True,
+                 exclude_keywords: Optional[List[str]] = None, max_edit_distance: float = 0.0):
+        """
+        Compile the matcher.
+
+        Args:
+            keywords: Death keywords for the game
+            fuzzy_matching: If True, each character also matches its OCR confusable (O/0, I/1, E/3, ...)
+            exclude_keywords: Text that vetoes a match (defaults to DEFAULT_EXCLUDE_KEYWORDS)
+            max_edit_distance: Weighted edit distance still counted as a match (fuzzy mode only, 0 = off).
+                               Capped at one full edit per CHARS_PER_EDIT keyword characters.
+        """
+        self.keywords = list(keywords)
+        self.fuzzy_matching = fuzzy_matching
+        self.exclude_keywords = list(DEFAULT_EXCLUDE_KEYWORDS if exclude_keywords is None else exclude_keywords)
+        self.max_edit_distance = float(max_edit_distance or 0.0) if fuzzy_matching else 0.0
+
+        self.regex = _alternation(self.keywords, fuzzy_matching)
+        # Exclusions stay exact, as before - fuzzy exclusions would veto real deaths
+        self.exclude_regex = _alternation(self.exclude_keywords, False)
+
+        # Approximate matching: one entry per canonical keyword, (cost rows, allowed distance, prefilter)
+        self.approximate: List[Tuple[List[Dict[str, float]], float, Optional[re.Pattern]]] = []
+        if self.max_edit_distance > 0:
+            seen = set()
+            for keyword in sorted((normalize_keyword(k) for k in self.keywords if k), key=len, reverse=True):
+                canonical = _canonical(keyword)
+                allowed = min(self.max_edit_distance, len(keyword) / CHARS_PER_EDIT)
+                # Only confusable spellings of the same keyword (Y0UD13D = YOUDIED) are duplicates:
+                # a truncation (YOUDIE) keeps its own rows, its edits aren't within reach of the longer one
+                if allowed <= 0 or canonical in seen:
+                    continue
+                seen.add(canonical)
+                cost_rows = _cost_rows(keyword)
+                self.approximate.append((cost_rows, allowed, _piece_prefilter(cost_rows, allowed)))
+
+    def matches(self, clean_text: str) -> bool:
+        """Check if cleaned OCR text contains any keyword (and no exclusion)."""
+        if not clean_text or self.regex is None:
+            return False
+        if self.exclude_regex is not None and self.exclude_regex.search(clean_text):
+            return False
+        if self.regex.search(clean_text) is not None:
+            return True
+        for cost_rows, allowed, prefilter in self.approximate:
+            if prefilter is not None and prefilter.search(clean_text) is None:
+                continue
+            if approximate_substring_distance(cost_rows, clean_text, allowed) <= allowed:
+                return True
+        return False
+
+
+# Matchers built so far, keyed by (keywords, fuzzy, exclusions, max edit distance)
+_matcher_cache: Dict[Tuple, KeywordMatcher] = {}
+
+
+def get_keyword_matcher(keywords: List[str], fuzzy_matching: bool = True,
+                        exclude_keywords: Optional[List[str]] = None,
+                        max_edit_distance: float = 0.0) -> KeywordMatcher:
+    """Return the compiled matcher for these keywords, building it on first use."""
+    key = (tuple(keywords), bool(fuzzy_matching),
+           None if exclude_keywords is None else tuple(exclude_keywords), float(max_edit_distance or 0.0))
+    matcher = _matcher_cache.get(key)
+    if matcher is None:
+        if len(_matcher_cache) > 32:
+            _matcher_cache.clear()
+        matcher = KeywordMatcher(keywords, fuzzy_matching, exclude_keywords, max_edit_distance)
+        _matcher_cache[key] = matcher
+    return matcher
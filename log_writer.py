@@ -0,0 +1,230 @@
+"""
+Buffered Log Writer Module
+Background log sink shared by the daemon, its detection modules and the GUI.
+
+Callers only format a line and put it on an in-memory queue; a writer thread keeps
+the log file open, writes whatever has queued up in one batch, and rotates the file
+by size (debug.log -> debug.log.1 -> ... up to a retention count).
+
+Anything that takes a log_callback (LogMonitor, MemoryScanner, OcrEngine, ...) can
+be handed writer.callback() or simply the daemon's log() function.
+"""
+
+import os
+import sys
+import time
+import queue
+import threading
+from datetime import datetime
+from typing import Callable, List, Optional
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUPS = 3
+
+
+def level_value(level: str) -> int:
+    """Numeric value of a level name (unknown names count as INFO)."""
+    return LEVELS.get(str(level).upper(), LEVELS["INFO"])
+
+
+class LogBatch:
+    """File-like adapter for code that writes log text with f.write(): queued as one entry on exit."""
+
+    def __init__(self, writer: "LogWriter"):
+        self.writer = writer
+        self.parts: List[str] = []
+
+    def write(self, text: str):
+        self.parts.append(text)
+
+    def flush(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.parts:
+            self.writer.write("".join(self.parts))
+        return False
+
+
+class LogWriter:
+    """
+    Queue-backed log file writer with size-based rotation.
+    log() never touches the disk; it returns as soon as the line is queued.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path: str, level: str = "INFO", max_bytes: int = DEFAULT_MAX_BYTES,
+                 backups: int = DEFAULT_BACKUPS, echo: bool = False, queue_size: int = 10000):
+        """
+        Initialize the log writer and start its thread.
+
+        Args:
+            path: Log file path
+            level: Minimum level written (DEBUG, INFO, WARNING, ERROR)
+            max_bytes: Rotate once the file reaches this size (0 = never rotate)
+            backups: Rotated files kept (path.1 ... path.N)
+            echo: Also print each line to the console (from the writer thread)
+            queue_size: Max lines waiting to be written; further lines are dropped and counted
+        """
+        self.path = path
+        self.level = level_value(level)
+        self.max_bytes = int(max_bytes)
+        self.backups = max(0, int(backups))
+        self.echo = echo
+        self.dropped = 0
+
+        self.queue: queue.Queue = queue.Queue(maxsize=max(1, int(queue_size)))
+        self.file = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def configure(self, level: Optional[str] = None, max_bytes: Optional[int] = None,
+                  backups: Optional[int] = None):
+        """Apply settings loaded after the writer was created."""
+        if level is not None:
+            self.level = level_value(level)
+        if max_bytes is not None:
+            self.max_bytes = int(max_bytes)
+        if backups is not None:
+            self.backups = max(0, int(backups))
+
+    def is_enabled_for(self, level: str) -> bool:
+        """Check if messages at this level are written."""
+        return level_value(level) >= self.level
+
+    def log(self, msg: str, level: str = "INFO"):
+        """Queue a timestamped line (INFO lines carry no level tag, others are prefixed with it)."""
+        if level_value(level) < self.level:
+            return
+        ts = datetime.now().strftime("[%Y-%m-%d %H:%M:%S]")
+        tag = "" if level.upper() == "INFO" or msg.startswith(level.upper()) else f"{level.upper()}: "
+        self.write(f"{ts} {tag}{msg}\n")
+
+    def write(self, text: str):
+        """Queue raw text (already formatted, newline included)."""
+        try:
+            self.queue.put_nowait(text)
+        except queue.Full:
+            self.dropped += 1
+
+    def callback(self, level: str = "INFO") -> Callable[[str], None]:
+        """A log_callback for modules that take one."""
+        return lambda msg: self.log(msg, level)
+
+    def open_batch(self) -> LogBatch:
+        """File-like object: `with writer.open_batch() as f: f.write(...)` queues the text as one entry."""
+        return LogBatch(self)
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(self.path, "a", encoding="utf-8", errors="replace")
+
+    def _rotate(self):
+        """debug.log -> debug.log.1 -> ... -> debug.log.N (oldest dropped)."""
+        self.file.close()
+        self.file = None
+        try:
+            if self.backups:
+                for index in range(self.backups - 1, 0, -1):
+                    source = f"{self.path}.{index}"
+                    if os.path.exists(source):
+                        os.replace(source, f"{self.path}.{index + 1}")
+                os.replace(self.path, f"{self.path}.1")
+            else:
+                os.remove(self.path)
+        except OSError:
+            pass  # e.g. another process has the file open on Windows - retry at the next batch
+
+    def _write_batch(self, lines: List[str]):
+        text = "".join(lines)
+        if self.echo:
+            # Console gets the message without the timestamp, as print(msg) used to
+            console = "".join(line.split("] ", 1)[-1] if line.startswith("[") else line for line in lines)
+            try:
+                try:
+                    sys.stdout.write(console)
+                except UnicodeEncodeError:
+                    # If console can't handle Unicode, print ASCII version
+                    sys.stdout.write(console.encode("ascii", errors="replace").decode("ascii"))
+                sys.stdout.flush()
+            except Exception:
+                pass  # No console (pythonw)
+        try:
+            if self.file is None:
+                self._open()
+            self.file.write(text)
+            self.file.flush()
+            if self.max_bytes and self.file.tell() >= self.max_bytes:
+                self._rotate()
+        except Exception:
+            # Never let logging take the caller down; reopen on the next batch
+            try:
+                if self.file:
+                    self.file.close()
+            except Exception:
+                pass
+            self.file = None
+
+    def _run(self):
+        """Writer thread: block for one line, then take everything else already queued."""
+        while True:
+            item = self.queue.get()
+            lines = []
+            stop = item is self._STOP
+            if not stop:
+                lines.append(item)
+            while not stop:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stop = True
+                else:
+                    lines.append(item)
+            if self.dropped:
+                lines.append(f"{datetime.now().strftime('[%Y-%m-%d %H:%M:%S]')} "
+                             f"WARNING: Log queue full - {self.dropped} line(s) dropped\n")
+                self.dropped = 0
+            if lines:
+                self._write_batch(lines)
+            if stop:
+                if self.file:
+                    self.file.close()
+                    self.file = None
+                return
+
+    def close(self, timeout: float = 2.0):
+        """Write everything still queued and stop the writer thread."""
+        if not self.thread.is_alive():
+            return
+        try:
+            self.queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self.thread.join(timeout)
+
+
+if __name__ == "__main__":
+    # Quick throughput check: python log_writer.py [lines]
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    target = os.path.join(os.path.dirname(os.path.abspath(__file__)), "log_writer_bench.log")
+    writer = LogWriter(target, max_bytes=1024 * 1024, backups=2)
+    started = time.perf_counter()
+    for i in range(count):
+        writer.log(f"Tick={i} Game=Bench Methods=[OCR] Detected=False")
+    queued = time.perf_counter() - started
+    writer.close(timeout=30)
+    total = time.perf_counter() - started
+    print(f"{count} lines: {queued / count * 1e6:.2f} us/line on the caller, {total:.2f}s until on disk")
+    for path in [target] + [f"{target}.{i}" for i in range(1, 4)]:
+        if os.path.exists(path):
+            os.remove(path)
@@ -2,16 +2,24 @@
 Process Memory Scanning Module for Death Detection
 Scans game process memory for death-related patterns using Windows ReadProcessMemory API.
 
+"pointer" patterns skip the scan: the address of the game's death counter is resolved
+once per process (module base, or an array-of-bytes signature inside the module, then a
+chain of pointer offsets) and afterwards only that integer is read and compared.
+
+Byte patterns ("string", "integer", wildcard "aob" signatures) are compiled once into a
+PatternMatcher that searches each read buffer in a single pass.
+
 Compatible with Windows 10/11.
-No external dependencies required (uses ctypes for Windows API).
+No external dependencies required (uses ctypes for Windows API; numpy, if installed,
+speeds up searching for many patterns at once).
 """
 
 import ctypes
 import ctypes.wintypes
+import re
 import time
 import threading
 from typing import Dict, List, Optional, Callable, Tuple
-import struct
 
 # Import psutil for process checking (optional - main daemon already imports it)
 try:
@@ -26,15 +34,63 @@ except ImportError:
         pass
     psutil = type('psutil', (), {'NoSuchProcess': NoSuchProcess, 'AccessDenied': AccessDenied})()
 
+# numpy for the single-pass multi-pattern search (optional - falls back to one find per pattern)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
 # Windows API constants
 PROCESS_QUERY_INFORMATION = 0x0400
 PROCESS_VM_READ = 0x0010
 MEM_COMMIT = 0x1000
 MEM_PRIVATE = 0x20000
+MEM_MAPPED = 0x40000
+MEM_IMAGE = 0x1000000
+PAGE_NOACCESS = 0x01
 PAGE_READONLY = 0x02
 PAGE_READWRITE = 0x04
+PAGE_WRITECOPY = 0x08
 PAGE_EXECUTE_READ = 0x20
 PAGE_EXECUTE_READWRITE = 0x40
+PAGE_EXECUTE_WRITECOPY = 0x80
+PAGE_GUARD = 0x100
+PAGE_NOCACHE = 0x200
+PAGE_WRITECOMBINE = 0x400
+TH32CS_SNAPMODULE = 0x00000008
+TH32CS_SNAPMODULE32 = 0x00000010
+INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+# Region map: protections that can be read (after stripping the modifier flags below), and the writable ones
+READABLE_PROTECTIONS = {PAGE_READONLY, PAGE_READWRITE, PAGE_WRITECOPY,
+                        PAGE_EXECUTE_READ, PAGE_EXECUTE_READWRITE, PAGE_EXECUTE_WRITECOPY}
+WRITABLE_PROTECTIONS = {PAGE_READWRITE, PAGE_WRITECOPY, PAGE_EXECUTE_READWRITE, PAGE_EXECUTE_WRITECOPY}
+PROTECTION_MODIFIERS = PAGE_GUARD | PAGE_NOCACHE | PAGE_WRITECOMBINE
+# Pattern "region_types" names -> MEMORY_BASIC_INFORMATION.Type
+REGION_TYPES = {"private": MEM_PRIVATE, "image": MEM_IMAGE, "mapped": MEM_MAPPED}
+# Highest user-mode address on 64-bit Windows (used if GetSystemInfo is unavailable)
+DEFAULT_MAX_USER_ADDRESS = 0x7FFFFFFEFFFF
+# VirtualQueryEx calls per region map refresh step; a full sweep of the address space
+# is spread over as many scans as it needs
+REGION_QUERY_BUDGET = 4096
+
+# Pointer patterns: module image read in chunks of this size while looking for the signature
+AOB_CHUNK_SIZE = 1024 * 1024
+# Region scan: bytes read per chunk (config "max_region_size") and per scan (config "max_bytes_per_scan")
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_MAX_BYTES_PER_SCAN = 32 * 1024 * 1024
+# PatternMatcher: byte sequences needed before the anchored single pass beats one find() per sequence,
+# and the most anchor hits per buffer it verifies before falling back to find() for that buffer
+ANCHORED_MIN_SEQUENCES = 4
+MAX_ANCHOR_CANDIDATES = 4096
+# Read buffers kept by a BufferPool
+BUFFER_POOL_SIZE = 2
+# Small reads (pointers, counters) go through one fixed buffer of this size
+SMALL_READ_SIZE = 64
+# Seconds between attempts to resolve a pointer chain that didn't resolve (game still loading)
+POINTER_RETRY_SECONDS = 5.0
 
 # Windows API structures
 class MEMORY_BASIC_INFORMATION(ctypes.Structure):
@@ -49,13 +105,277 @@ class MEMORY_BASIC_INFORMATION(ctypes.Structure):
     ]
 
 
+class SYSTEM_INFO(ctypes.Structure):
+    _fields_ = [
+        ("wProcessorArchitecture", ctypes.wintypes.WORD),
+        ("wReserved", ctypes.wintypes.WORD),
+        ("dwPageSize", ctypes.wintypes.DWORD),
+        ("lpMinimumApplicationAddress", ctypes.c_void_p),
+        ("lpMaximumApplicationAddress", ctypes.c_void_p),
+        ("dwActiveProcessorMask", ctypes.c_size_t),
+        ("dwNumberOfProcessors", ctypes.wintypes.DWORD),
+        ("dwProcessorType", ctypes.wintypes.DWORD),
+        ("dwAllocationGranularity", ctypes.wintypes.DWORD),
+        ("wProcessorLevel", ctypes.wintypes.WORD),
+        ("wProcessorRevision", ctypes.wintypes.WORD),
+    ]
+
+
+class MODULEENTRY32W(ctypes.Structure):
+    _fields_ = [
+        ("dwSize", ctypes.wintypes.DWORD),
+        ("th32ModuleID", ctypes.wintypes.DWORD),
+        ("th32ProcessID", ctypes.wintypes.DWORD),
+        ("GlblcntUsage", ctypes.wintypes.DWORD),
+        ("ProccntUsage", ctypes.wintypes.DWORD),
+        ("modBaseAddr", ctypes.c_void_p),
+        ("modBaseSize", ctypes.wintypes.DWORD),
+        ("hModule", ctypes.wintypes.HMODULE),
+        ("szModule", ctypes.c_wchar * 256),
+        ("szExePath", ctypes.c_wchar * 260),
+    ]
+
+
+def parse_int(value) -> int:
+    """Config integer: a number, or a string in any base Python accepts ("0x98", "152")."""
+    if isinstance(value, str):
+        return int(value, 0)
+    return int(value)
+
+
+class BufferPool:
+    """
+    Preallocated read buffers, reused across reads and scans.
+    Each entry is a bytearray plus a ctypes array over the same memory, so
+    ReadProcessMemory writes straight into the bytearray and searches run on it in place.
+    """
+    
+    def __init__(self, max_buffers: int = BUFFER_POOL_SIZE):
+        self.max_buffers = max_buffers
+        self.free: List[Tuple[bytearray, ctypes.Array]] = []
+        self.allocations = 0
+    
+    def acquire(self, size: int) -> Tuple[bytearray, ctypes.Array]:
+        """A free buffer of at least size bytes (allocated only if none fits)."""
+        for i, entry in enumerate(self.free):
+            if len(entry[0]) >= size:
+                return self.free.pop(i)
+        buffer = bytearray(size)
+        self.allocations += 1
+        return buffer, (ctypes.c_char * size).from_buffer(buffer)
+    
+    def release(self, entry: Tuple[bytearray, ctypes.Array]):
+        """Return a buffer to the pool (the smallest is dropped when the pool is full)."""
+        self.free.append(entry)
+        if len(self.free) > self.max_buffers:
+            self.free.sort(key=lambda e: len(e[0]))
+            self.free.pop(0)
+
+
+def is_readable(protect: int) -> bool:
+    """Check if pages with this protection can be read (guard pages never are: touching one faults in the game)."""
+    if protect & PAGE_GUARD:
+        return False
+    return (protect & ~PROTECTION_MODIFIERS) in READABLE_PROTECTIONS
+
+
+def compile_region_filter(pattern_config: Dict) -> Tuple[int, bool, int, int]:
+    """
+    Per-pattern region filter from its config.
+
+    Args:
+        pattern_config: Pattern dict; optional "region_types" (list of "private", "image",
+                        "mapped"; default all), "writable" (only writable pages, default false)
+                        and "region_size" ([min, max] bytes; default any)
+
+    Returns:
+        (type mask, writable only, min size, max size)
+    """
+    types = pattern_config.get("region_types")
+    type_mask = 0
+    for name in types or REGION_TYPES:
+        type_mask |= REGION_TYPES[name]
+    min_size, max_size = pattern_config.get("region_size") or (0, 0)
+    return type_mask, bool(pattern_config.get("writable", False)), parse_int(min_size), parse_int(max_size)
+
+
+def region_matches(region: Tuple[int, int, int, int], region_filter: Tuple[int, bool, int, int]) -> bool:
+    """Check a (base, size, type, protect) region against a compile_region_filter() result."""
+    _, size, region_type, protect = region
+    type_mask, writable, min_size, max_size = region_filter
+    if not region_type & type_mask:
+        return False
+    if writable and (protect & ~PROTECTION_MODIFIERS) not in WRITABLE_PROTECTIONS:
+        return False
+    return size >= min_size and (not max_size or size <= max_size)
+
+
+def signature_bytes(signature: str) -> List[Optional[int]]:
+    """Byte values of an array-of-bytes signature ("48 8B ?? ?? 05"), None for "??" (or "?") wildcards."""
+    values = [None if token in ("?", "??") else int(token, 16) for token in signature.split()]
+    if not values:
+        raise ValueError("Empty AOB signature")
+    return values
+
+
+def sequence_regex(sequence: List[Optional[int]]) -> "re.Pattern":
+    """Bytes regex for a byte sequence with wildcards (re.DOTALL, so wildcards match every byte value)."""
+    return re.compile(b"".join(b"." if value is None else re.escape(bytes([value])) for value in sequence), re.DOTALL)
+
+
+def parse_aob(signature: str) -> "re.Pattern":
+    """
+    Compile an array-of-bytes signature ("48 8B 05 ?? ?? ?? ??") into a bytes regex.
+
+    Args:
+        signature: Space-separated hex bytes; "??" (or "?") matches any byte
+
+    Returns:
+        Compiled pattern (re.DOTALL, so wildcards match every byte value)
+    """
+    return sequence_regex(signature_bytes(signature))
+
+
+def pattern_sequences(pattern_config: Dict) -> List[List[Optional[int]]]:
+    """
+    Byte sequences a scan pattern matches (any one of them is a hit).
+
+    Args:
+        pattern_config: "string" (value + optional encoding), "integer" (value + size,
+                        little- and big-endian) or "aob" (value is a wildcard signature)
+
+    Returns:
+        List of sequences of byte values, None = wildcard
+    """
+    pattern_type = pattern_config.get("type", "string")
+    pattern_value = pattern_config.get("value")
+    if pattern_type == "string":
+        return [list(pattern_value.encode(pattern_config.get("encoding", "utf-8")))]
+    if pattern_type == "integer":
+        size = int(pattern_config.get("size", 4))  # 4 bytes default
+        value = parse_int(pattern_value)
+        signed = value < 0
+        return [list(value.to_bytes(size, "little", signed=signed)), list(value.to_bytes(size, "big", signed=signed))]
+    if pattern_type == "aob":
+        return [signature_bytes(pattern_value)]
+    raise ValueError(f"Unknown pattern type: {pattern_type}")
+
+
+def _anchor(sequence: List[Optional[int]]) -> Optional[int]:
+    """
+    Offset of the adjacent fixed byte pair to look for first, or None if there is none.
+    Pairs without 00/FF bytes are preferred: they are far rarer in game memory.
+    """
+    best = None
+    for i in range(len(sequence) - 1):
+        pair = sequence[i], sequence[i + 1]
+        if None in pair:
+            continue
+        score = sum(value in (0x00, 0xFF) for value in pair)
+        if best is None or score < best[0]:
+            best = (score, i)
+            if score == 0:
+                break
+    return None if best is None else best[1]
+
+
+class PatternMatcher:
+    """
+    A set of byte patterns compiled once, searched in a single pass per buffer.
+    
+    Every sequence is anchored on one fixed byte pair. A 65536-entry table marks the
+    anchor pairs, so one vectorized lookup over the buffer (read as 16-bit words at even
+    and odd offsets) finds every position where any pattern could start; only those are
+    verified. Sequences without a fixed pair, sets too small to pay off, buffers with too
+    many anchor hits and installs without numpy use one find()/regex search per sequence.
+    """
+    
+    def __init__(self, patterns: List[Tuple[int, List[List[Optional[int]]]]]):
+        """
+        Args:
+            patterns: (pattern index, pattern_sequences() result) per pattern
+        """
+        # (pattern index, sequence start offset of the anchor, fixed bytes or wildcard regex)
+        self.by_pair: Dict[int, List[Tuple[int, int, object]]] = {}
+        self.sequential: List[Tuple[int, object]] = []
+        self.max_length = 1
+        count = 0
+        for index, sequences in patterns:
+            for sequence in sequences:
+                self.max_length = max(self.max_length, len(sequence))
+                matcher = bytes(sequence) if None not in sequence else sequence_regex(sequence)
+                self.sequential.append((index, matcher))
+                anchor = _anchor(sequence)
+                if anchor is not None:
+                    pair = sequence[anchor] | (sequence[anchor + 1] << 8)
+                    self.by_pair.setdefault(pair, []).append((index, anchor, matcher))
+                    count += 1
+        
+        # Anchored pass only when every sequence has an anchor and there are enough of them
+        self.table = None
+        if NUMPY_AVAILABLE and count >= ANCHORED_MIN_SEQUENCES and count == len(self.sequential):
+            self.table = np.zeros(65536, dtype=bool)
+            self.table[list(self.by_pair)] = True
+            self.even_hits = np.empty(0, dtype=bool)
+            self.odd_hits = np.empty(0, dtype=bool)
+    
+    def search(self, buffer, length: int) -> Optional[Tuple[int, int]]:
+        """
+        Look for any pattern in buffer[:length].
+        
+        Returns:
+            (pattern index, offset in buffer) of a match, or None
+        """
+        if self.table is not None and length >= 2:
+            found = self._search_anchored(buffer, length)
+            if found is not False:
+                return found
+        for index, matcher in self.sequential:
+            if isinstance(matcher, bytes):
+                offset = buffer.find(matcher, 0, length)
+                if offset != -1:
+                    return index, offset
+            else:
+                match = matcher.search(buffer, 0, length)
+                if match:
+                    return index, match.start()
+        return None
+    
+    def _search_anchored(self, buffer, length: int):
+        """Anchored single pass; False if there were too many anchor hits to verify one by one."""
+        even = np.frombuffer(buffer, dtype="<u2", count=length // 2)
+        odd = np.frombuffer(buffer, dtype="<u2", count=(length - 1) // 2, offset=1)
+        if len(self.even_hits) < len(even):
+            self.even_hits = np.empty(len(even), dtype=bool)
+            self.odd_hits = np.empty(len(even), dtype=bool)
+        even_hits = np.take(self.table, even, out=self.even_hits[:len(even)])
+        odd_hits = np.take(self.table, odd, out=self.odd_hits[:len(odd)])
+        candidates = np.concatenate((np.flatnonzero(even_hits) * 2, np.flatnonzero(odd_hits) * 2 + 1))
+        if len(candidates) > MAX_ANCHOR_CANDIDATES:
+            return False
+        candidates.sort()
+        
+        for position in candidates.tolist():
+            for index, anchor, matcher in self.by_pair[buffer[position] | (buffer[position + 1] << 8)]:
+                start = position - anchor
+                if start < 0:
+                    continue
+                if isinstance(matcher, bytes):
+                    if start + len(matcher) <= length and buffer.startswith(matcher, start):
+                        return index, start
+                elif matcher.match(buffer, start, length):
+                    return index, start
+        return None
+
+
 class MemoryScanner:
     """
     Scans game process memory for death-related patterns.
     Compatible with Windows 10/11 using ReadProcessMemory API.
     """
     
-    def __init__(self, game_config: Dict, process: Optional[object] = None, log_callback: Optional[Callable[[str], None]] = None):
+    def __init__(self, game_config: Dict, process: Optional[object] = None, log_callback: Optional[Callable[[str], None]] = None,
+                 process_index: Optional[object] = None):
         """
         Initialize memory scanner for a game configuration.
         
@@ -63,10 +383,17 @@ class MemoryScanner:
             game_config: Game configuration dict with optional 'memory_scanning' section
             process: Optional psutil.Process object for the game process
             log_callback: Optional callback function for logging (for debugging)
+            process_index: Optional shared ProcessIndex; liveness checks then use its snapshot
+                           instead of querying the OS every scan
         """
         self.game_config = game_config
         self.process = process
         self.log_callback = log_callback or (lambda msg: None)
+        self.process_index = process_index
+        
+        # Counter increments seen by pointer patterns, not yet taken by the daemon
+        self.pending_increments = 0
+        self.counter_lock = threading.Lock()
         
         # Get memory scanning config
         self.config = game_config.get("memory_scanning", {})
@@ -76,7 +403,7 @@ class MemoryScanner:
             return
         
         # Get patterns
-        self.patterns = self.config.get("patterns", [])
+        self._set_patterns(self.config.get("patterns", []))
         self.scan_interval = self.config.get("scan_interval_seconds", 1.0)
         
         # Windows API functions
@@ -95,9 +422,20 @@ class MemoryScanner:
         self.stop_scanning = False
         self.lock = threading.Lock()
         
-        # Cache for scanned addresses (to avoid re-scanning)
-        self.scanned_regions = set()
+        # Readable committed regions of the game process: base -> (base, size, type, protect).
+        # Refreshed a REGION_QUERY_BUDGET-sized slice at a time from region_cursor, not rebuilt per scan
+        self.region_map: Dict[int, Tuple[int, int, int, int]] = {}
+        self.region_cursor = None
+        self.region_sweeps = 0
+        # Address the next scan continues from (scans stop after max_regions_per_scan regions or
+        # max_bytes_per_scan bytes, round-robin, possibly in the middle of a large region)
+        self.scan_cursor = 0
+        # Reused read buffers: pooled chunk buffers for scans, one small buffer for pointer reads
+        self.buffer_pool = BufferPool()
+        self.small_buffer = ctypes.create_string_buffer(SMALL_READ_SIZE)
+        self.bytes_read = 0
         self.last_scan_time = 0
+        self.min_address, self.max_address = self._user_address_range()
         
         # Setup VirtualQueryEx function signature (Windows 10/11 compatible)
         if self.kernel32:
@@ -112,17 +450,60 @@ class MemoryScanner:
                 self.VirtualQueryEx.restype = ctypes.c_size_t
             except Exception:
                 self.VirtualQueryEx = None
+            # Module lookup for pointer patterns (Toolhelp snapshot of the game's loaded modules)
+            try:
+                self.kernel32.CreateToolhelp32Snapshot.argtypes = [ctypes.wintypes.DWORD, ctypes.wintypes.DWORD]
+                self.kernel32.CreateToolhelp32Snapshot.restype = ctypes.wintypes.HANDLE
+                for name in ("Module32FirstW", "Module32NextW"):
+                    func = getattr(self.kernel32, name)
+                    func.argtypes = [ctypes.wintypes.HANDLE, ctypes.POINTER(MODULEENTRY32W)]
+                    func.restype = ctypes.wintypes.BOOL
+            except Exception:
+                pass
         else:
             self.VirtualQueryEx = None
         
         if self.process and self.patterns:
             self._open_process()
     
+    def _set_patterns(self, patterns: List[Dict]):
+        """Split patterns into polled pointer chains and byte patterns for the region scan."""
+        self.patterns = patterns
+        self.pointer_patterns = [p for p in patterns if p.get("type") == "pointer"]
+        self.scan_patterns = [p for p in patterns if p.get("type") != "pointer"]
+        self.region_filters = [compile_region_filter(p) for p in self.scan_patterns]
+        for pattern_config in self.pointer_patterns:
+            if pattern_config.get("mode", "delta") != "delta":
+                self.log_callback(f"MemoryScanner: Pointer {pattern_config.get('name', 'pointer')}: "
+                                  f"mode {pattern_config.get('mode')!r} is no longer supported, counting increments directly")
+        self._reset_pointers()
+        
+        # Byte sequences of every scan pattern, encoded once; matchers per set of patterns a region wants
+        self.pattern_sequences: Dict[int, List[List[Optional[int]]]] = {}
+        for index, pattern_config in enumerate(self.scan_patterns):
+            try:
+                self.pattern_sequences[index] = pattern_sequences(pattern_config)
+            except Exception as e:
+                self.log_callback(f"MemoryScanner: Skipping pattern {pattern_config.get('value')!r}: {e}")
+        self.matchers: Dict[Tuple[int, ...], PatternMatcher] = {}
+        self.pattern_overlap = self._matcher(tuple(self.pattern_sequences)).max_length - 1
+        self.last_match = None
+    
+    def _reset_pointers(self):
+        """Forget resolved pointer addresses and last values (new process or new patterns)."""
+        # Per pointer pattern: "static" resolved address, "value" last read, "failed_at" last failed resolve
+        self.pointer_state = [{} for _ in self.pointer_patterns]
+    
     def _open_process(self):
         """Open process handle for memory reading."""
         if not self.process:
             return
         
+        # Resolved addresses and the region map belong to the previous process
+        self._reset_pointers()
+        self.region_map = {}
+        self.region_cursor = None
+        self.scan_cursor = 0
         try:
             pid = self.process.pid
             # Try to open process with required permissions
@@ -145,185 +526,374 @@ class MemoryScanner:
             self.log_callback(f"MemoryScanner: Exception opening process: {e}")
     
     def _close_process(self):
-        """Close process handle."""
+        """Close process handle and drop the counter state that belonged to the process."""
         if self.process_handle:
             try:
                 self.kernel32.CloseHandle(self.process_handle)
             except Exception:
                 pass
             self.process_handle = None
+        self._reset_pointers()
+        with self.counter_lock:
+            self.pending_increments = 0
     
-    def _read_memory_region(self, address: int, size: int) -> Optional[bytes]:
-        """Read memory region from process."""
+    def _read_into(self, address: int, size: int, target: ctypes.Array) -> int:
+        """ReadProcessMemory straight into target (a ctypes buffer of at least size bytes); returns bytes read."""
         if not self.process_handle:
-            return None
+            return 0
         
         try:
-            buffer = ctypes.create_string_buffer(size)
             bytes_read = ctypes.c_size_t(0)
-            
             success = self.kernel32.ReadProcessMemory(
                 self.process_handle,
                 ctypes.c_void_p(address),
-                buffer,
+                target,
                 size,
                 ctypes.byref(bytes_read)
             )
-            
-            if success and bytes_read.value > 0:
-                return buffer.raw[:bytes_read.value]
+            if success:
+                self.bytes_read += bytes_read.value
+                return bytes_read.value
         except Exception:
             pass
         
-        return None
+        return 0
+    
+    def _read_memory_region(self, address: int, size: int) -> Optional[bytes]:
+        """Read a few bytes (pointers, counters) through the reused small buffer."""
+        if size > SMALL_READ_SIZE:
+            entry = self.buffer_pool.acquire(size)
+            try:
+                read = self._read_into(address, size, entry[1])
+                return bytes(entry[0][:read]) if read else None
+            finally:
+                self.buffer_pool.release(entry)
+        read = self._read_into(address, size, self.small_buffer)
+        return self.small_buffer.raw[:read] if read else None
     
-    def _get_memory_regions(self) -> List[Tuple[int, int]]:
-        """Get readable memory regions from process."""
-        regions = []
+    def _read_chunks(self, address: int, size: int, chunk_size: int, overlap: int):
+        """
+        Read [address, address + size) in chunks into one pooled buffer.
+        Consecutive chunks overlap by overlap bytes, so a match up to overlap + 1 bytes long
+        that straddles a chunk edge is still inside one chunk.
         
+        Yields:
+            (chunk address, buffer, bytes valid) - the buffer is reused: search it before the next chunk
+        """
+        chunk_size = max(chunk_size, overlap + 1)
+        entry = self.buffer_pool.acquire(chunk_size)
+        buffer, target = entry
+        try:
+            offset = 0
+            while offset < size and not self.stop_scanning:
+                length = min(chunk_size, size - offset)
+                read = self._read_into(address + offset, length, target)
+                if read:
+                    yield address + offset, buffer, read
+                if offset + length >= size:
+                    break
+                offset += chunk_size - overlap
+        finally:
+            self.buffer_pool.release(entry)
+    
+    def _user_address_range(self) -> Tuple[int, int]:
+        """Lowest and highest user-mode address (GetSystemInfo), so the walk covers the full 64-bit space."""
+        try:
+            info = SYSTEM_INFO()
+            self.kernel32.GetSystemInfo(ctypes.byref(info))
+            if info.lpMaximumApplicationAddress:
+                return info.lpMinimumApplicationAddress or 0, info.lpMaximumApplicationAddress
+        except Exception:
+            pass
+        return 0, DEFAULT_MAX_USER_ADDRESS
+    
+    def _query_region(self, address: int) -> Optional[Tuple[int, int, int, int, int]]:
+        """VirtualQueryEx at address: (base, size, state, protect, type), or None past the end / on error."""
+        mbi = MEMORY_BASIC_INFORMATION()
+        result = self.VirtualQueryEx(
+            self.process_handle,
+            ctypes.c_void_p(address),
+            ctypes.byref(mbi),
+            ctypes.sizeof(mbi)
+        )
+        if result == 0:
+            # No more regions or error
+            return None
+        return mbi.BaseAddress or 0, mbi.RegionSize, mbi.State, mbi.Protect, mbi.Type
+    
+    def _refresh_region_map(self, budget: int = REGION_QUERY_BUDGET) -> bool:
+        """
+        Walk up to budget regions from region_cursor and update that slice of region_map.
+        
+        Returns:
+            True when this step finished a sweep of the whole user-mode range
+        """
+        address = self.min_address if self.region_cursor is None else self.region_cursor
+        start = address
+        found = {}
+        done = False
+        for _ in range(budget):
+            if address >= self.max_address:
+                done = True
+                break
+            region = self._query_region(address)
+            if region is None:
+                done = True
+                break
+            base_addr, region_size, region_state, protect, region_type = region
+            if region_state == MEM_COMMIT and is_readable(protect):
+                found[base_addr] = (base_addr, region_size, region_type, protect)
+            next_addr = base_addr + region_size
+            if next_addr <= address:
+                # Prevent infinite loop if address doesn't advance
+                done = True
+                break
+            address = next_addr
+        
+        # Replace what the map had for the walked slice
+        end = self.max_address if done else address
+        for base_addr in [b for b in self.region_map if start <= b < end]:
+            del self.region_map[base_addr]
+        self.region_map.update(found)
+        
+        if done:
+            self.region_cursor = None
+            self.region_sweeps += 1
+        else:
+            self.region_cursor = address
+        return done
+    
+    def _get_memory_regions(self) -> List[Tuple[int, int, int, int]]:
+        """
+        Readable committed regions of the whole user-mode address space, sorted by address,
+        as (base, size, type, protect). The first call walks everything; later calls only
+        advance the incremental refresh by one step and return the cached map.
+        """
         if not self.process_handle or not self.VirtualQueryEx:
-            return regions
+            return []
         
         try:
-            address = 0
-            max_address = 0x7FFFFFFF  # 32-bit user space limit (for compatibility with Windows 10/11)
-            max_iterations = 10000  # Safety limit to prevent infinite loops
-            
-            iteration = 0
-            while address < max_address and iteration < max_iterations:
-                iteration += 1
-                
-                mbi = MEMORY_BASIC_INFORMATION()
-                size = ctypes.sizeof(mbi)
-                
-                result = self.VirtualQueryEx(
-                    self.process_handle,
-                    ctypes.c_void_p(address),
-                    ctypes.byref(mbi),
-                    size
-                )
-                
-                if result == 0:
-                    # No more regions or error
-                    break
-                
-                # Extract address and size values (handle both int and ctypes value types)
-                try:
-                    if isinstance(mbi.BaseAddress, int):
-                        base_addr = mbi.BaseAddress
-                    else:
-                        base_addr = mbi.BaseAddress.value if hasattr(mbi.BaseAddress, 'value') else int(mbi.BaseAddress)
-                    
-                    if isinstance(mbi.RegionSize, int):
-                        region_size = mbi.RegionSize
-                    else:
-                        region_size = mbi.RegionSize.value if hasattr(mbi.RegionSize, 'value') else int(mbi.RegionSize)
-                except (AttributeError, ValueError, TypeError):
-                    # If we can't extract values, skip this region
-                    break
-                
-                # Check if region is readable and committed
-                if (mbi.State == MEM_COMMIT and
-                    mbi.Protect in (PAGE_READONLY, PAGE_READWRITE, PAGE_EXECUTE_READ, PAGE_EXECUTE_READWRITE)):
-                    regions.append((base_addr, region_size))
-                
-                # Move to next region
-                next_addr = base_addr + region_size
-                
-                if next_addr <= address:
-                    # Prevent infinite loop if address doesn't advance
-                    break
-                
-                address = next_addr
-                
+            if not self.region_sweeps:
+                while not self._refresh_region_map() and not self.stop_scanning:
+                    pass
+            else:
+                self._refresh_region_map()
         except Exception:
-            # Silently handle errors (access denied, invalid handle, etc.)
+            # Silently handle errors (access denied, invalid handle, etc.) - keep the cached map
             pass
         
-        return regions
+        return sorted(self.region_map.values())
+    
+    def _matcher(self, indices: Tuple[int, ...]) -> PatternMatcher:
+        """PatternMatcher for these scan patterns (built on first use, kept until the patterns change)."""
+        matcher = self.matchers.get(indices)
+        if matcher is None:
+            matcher = PatternMatcher([(index, self.pattern_sequences[index]) for index in indices])
+            self.matchers[indices] = matcher
+        return matcher
     
     def _scan_memory_for_patterns(self) -> bool:
-        """Scan memory for configured patterns. Returns True if pattern found."""
-        if not self.process_handle or not self.patterns:
+        """
+        Scan memory for configured patterns. Returns True if pattern found.
+        
+        Regions are read in max_region_size chunks into a pooled buffer (overlapping by the
+        longest pattern, so nothing is missed at chunk edges) and searched in place, once for
+        all the patterns that want the region (PatternMatcher). A scan
+        stops after max_regions_per_scan regions or max_bytes_per_scan bytes; the next one
+        resumes at that address, inside a large region if need be.
+        """
+        if not self.process_handle or not self.scan_patterns:
             return False
         
         try:
-            # Get memory regions
-            regions = self._get_memory_regions()
+            # Regions at least one pattern wants, with the patterns that want them
+            candidates = []
+            for region in self._get_memory_regions():
+                wanted = tuple(index for index in self.pattern_sequences
+                               if region_matches(region, self.region_filters[index]))
+                if wanted:
+                    candidates.append((region, wanted))
             
-            # Limit scanning to reasonable number of regions to avoid performance issues
+            overlap = self.pattern_overlap
+            chunk_size = self.config.get("max_region_size", DEFAULT_CHUNK_SIZE)
+            max_bytes = self.config.get("max_bytes_per_scan", DEFAULT_MAX_BYTES_PER_SCAN)
             max_regions = self.config.get("max_regions_per_scan", 100)
-            regions = regions[:max_regions]
             
-            # Scan each region
-            for base_address, region_size in regions:
-                if self.stop_scanning:
+            # Continue with the region the previous scan stopped in (wrap around past the last one)
+            start = next((i for i, ((base, size, _, _), _) in enumerate(candidates) if base + size > self.scan_cursor), None)
+            if start is None:
+                start, self.scan_cursor = 0, 0
+            batch = (candidates[start:] + candidates[:start])[:max_regions]
+            
+            scanned = 0
+            for (base_address, region_size, _, _), wanted in batch:
+                if self.stop_scanning or scanned >= max_bytes:
                     break
+                begin = base_address
+                if base_address < self.scan_cursor < base_address + region_size:
+                    begin = self.scan_cursor
+                matcher = self._matcher(wanted)
                 
-                # Limit region size to avoid huge reads
-                max_region_size = self.config.get("max_region_size", 1024 * 1024)  # 1MB default
-                scan_size = min(region_size, max_region_size)
-                
-                # Skip if we've scanned this region recently
-                region_key = (base_address, scan_size)
-                if region_key in self.scanned_regions:
-                    continue
-                
-                # Read memory
-                memory_data = self._read_memory_region(base_address, scan_size)
-                if not memory_data:
-                    continue
-                
-                # Check each pattern
-                for pattern_config in self.patterns:
-                    if self.stop_scanning:
+                for chunk_address, buffer, length in self._read_chunks(begin, base_address + region_size - begin,
+                                                                       chunk_size, overlap):
+                    scanned += length
+                    self.scan_cursor = chunk_address + length - overlap
+                    found = matcher.search(buffer, length)
+                    if found:
+                        index, offset = found
+                        match = (index, chunk_address + offset)
+                        if match != self.last_match:
+                            self.log_callback(f"MemoryScanner: Pattern {self.scan_patterns[index].get('value')!r} "
+                                              f"found at 0x{match[1]:X}")
+                            self.last_match = match
+                        return True
+                    if scanned >= max_bytes:
                         break
-                    
-                    pattern_type = pattern_config.get("type", "string")
-                    pattern_value = pattern_config.get("value")
-                    
-                    if pattern_type == "string":
-                        # String pattern matching
-                        encoding = pattern_config.get("encoding", "utf-8")
-                        try:
-                            pattern_bytes = pattern_value.encode(encoding)
-                            if pattern_bytes in memory_data:
-                                self.scanned_regions.add(region_key)
-                                return True
-                        except Exception:
-                            pass
-                    
-                    elif pattern_type == "integer":
-                        # Integer pattern matching
-                        try:
-                            value_size = pattern_config.get("size", 4)  # 4 bytes default
-                            value = int(pattern_value)
-                            
-                            # Try different endianness
-                            if value_size == 4:
-                                pattern_bytes = struct.pack("<I", value)  # Little-endian
-                                if pattern_bytes in memory_data:
-                                    self.scanned_regions.add(region_key)
-                                    return True
-                                pattern_bytes = struct.pack(">I", value)  # Big-endian
-                                if pattern_bytes in memory_data:
-                                    self.scanned_regions.add(region_key)
-                                    return True
-                        except Exception:
-                            pass
-                
-                # Mark region as scanned
-                self.scanned_regions.add(region_key)
-                
-                # Limit number of cached regions
-                if len(self.scanned_regions) > 1000:
-                    self.scanned_regions.clear()
+                else:
+                    self.scan_cursor = base_address + region_size
                 
         except Exception:
             pass
         
         return False
     
+    def _read_int(self, address: int, size: int, signed: bool = False) -> Optional[int]:
+        """Little-endian integer at address, or None if it can't be read."""
+        data = self._read_memory_region(address, size)
+        if not data or len(data) < size:
+            return None
+        return int.from_bytes(data[:size], "little", signed=signed)
+    
+    def _find_module(self, module_name: str) -> Optional[Tuple[int, int]]:
+        """Base address and size of a module loaded in the game process (name is case-insensitive)."""
+        if not self.process or not hasattr(self.process, 'pid'):
+            return None
+        snapshot = self.kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPMODULE | TH32CS_SNAPMODULE32, self.process.pid)
+        if not snapshot or snapshot == INVALID_HANDLE_VALUE:
+            return None
+        try:
+            entry = MODULEENTRY32W()
+            entry.dwSize = ctypes.sizeof(MODULEENTRY32W)
+            found = self.kernel32.Module32FirstW(snapshot, ctypes.byref(entry))
+            while found:
+                if entry.szModule.lower() == module_name.lower():
+                    return entry.modBaseAddr, entry.modBaseSize
+                found = self.kernel32.Module32NextW(snapshot, ctypes.byref(entry))
+        finally:
+            self.kernel32.CloseHandle(ctypes.wintypes.HANDLE(snapshot))
+        return None
+    
+    def _find_signature(self, base: int, size: int, signature: str) -> Optional[int]:
+        """
+        Address of the first match of an AOB signature in [base, base + size).
+        The range is read in AOB_CHUNK_SIZE pieces that overlap by the signature length,
+        so a match across a chunk boundary is still found.
+        """
+        pattern = parse_aob(signature)
+        overlap = len(signature.split()) - 1
+        for chunk_address, buffer, length in self._read_chunks(base, size, AOB_CHUNK_SIZE, overlap):
+            match = pattern.search(buffer, 0, length)
+            if match:
+                return chunk_address + match.start()
+        return None
+    
+    def _resolve_pointer(self, pattern_config: Dict) -> Optional[int]:
+        """
+        Static address a pointer pattern's chain starts from.
+        
+        Either module base + base_offset, or found through an AOB signature in the module:
+        the match + aob_offset is the address, or - with instruction_length set - holds the
+        signed 32-bit RIP-relative displacement of an instruction (target = match +
+        instruction_length + displacement), the usual way to find a game's static manager
+        pointer independent of the game version.
+        """
+        module_name = pattern_config.get("module") or self.process.name()
+        module = self._find_module(module_name)
+        if not module:
+            self.log_callback(f"MemoryScanner: Module {module_name} not found in the game process")
+            return None
+        base, size = module
+        
+        signature = pattern_config.get("aob")
+        if not signature:
+            return base + parse_int(pattern_config.get("base_offset", 0))
+        match = self._find_signature(base, size, signature)
+        if match is None:
+            self.log_callback(f"MemoryScanner: Signature for {pattern_config.get('name', 'pointer')} not found in {module_name}")
+            return None
+        address = match + parse_int(pattern_config.get("aob_offset", 0))
+        if "instruction_length" in pattern_config:
+            displacement = self._read_int(address, 4, signed=True)
+            if displacement is None:
+                return None
+            address = match + parse_int(pattern_config["instruction_length"]) + displacement
+        return address
+    
+    def _follow_chain(self, static_address: int, pattern_config: Dict) -> Optional[int]:
+        """
+        Walk the offsets from the static address: each step reads a pointer and adds the offset.
+        Returns the watched integer's address, or None if a pointer on the way is null/unreadable.
+        """
+        pointer_size = int(pattern_config.get("pointer_size", 8))
+        address = static_address
+        for offset in pattern_config.get("offsets", []):
+            pointer = self._read_int(address, pointer_size)
+            if not pointer:
+                return None
+            address = pointer + parse_int(offset)
+        return address
+    
+    def _poll_pointer_patterns(self):
+        """
+        Read each pointer pattern's integer and queue every increment since the last read
+        as one death (see take_increments).
+        
+        The static address is resolved once per process; the offsets are walked again on every
+        read (a handful of small reads) because the game reallocates what they point through,
+        e.g. when a save is loaded. A null pointer on the way (title screen, loading) just skips
+        the read; an unreadable static address drops it so the next poll resolves it again.
+        """
+        now = time.time()
+        for pattern_config, state in zip(self.pointer_patterns, self.pointer_state):
+            if self.stop_scanning:
+                break
+            name = pattern_config.get("name", "pointer")
+            try:
+                if state.get("static") is None:
+                    if now - state.get("failed_at", 0) < POINTER_RETRY_SECONDS:
+                        continue
+                    static_address = self._resolve_pointer(pattern_config)
+                    if static_address is None:
+                        state["failed_at"] = now
+                        continue
+                    state["static"] = static_address
+                    self.log_callback(f"MemoryScanner: Resolved {name} at 0x{static_address:X}")
+                
+                address = self._follow_chain(state["static"], pattern_config)
+                value = None
+                if address is not None:
+                    value = self._read_int(address, int(pattern_config.get("size", 4)))
+                if value is None:
+                    if self._read_int(state["static"], int(pattern_config.get("pointer_size", 8))) is None:
+                        self.log_callback(f"MemoryScanner: Pointer chain for {name} went invalid, resolving again")
+                        state.clear()
+                    continue
+                
+                last_value = state.get("value")
+                state["value"] = value
+                if last_value is None or value <= last_value:
+                    continue  # First read or counter reset (other character/save): new baseline
+                step = value - last_value
+                if step > int(pattern_config.get("max_step", 5)):
+                    self.log_callback(f"MemoryScanner: {name} jumped {last_value} -> {value}, treating as a new baseline")
+                else:
+                    with self.counter_lock:
+                        self.pending_increments += step
+            except Exception as e:
+                self.log_callback(f"MemoryScanner: Pointer {name} error: {e}")
+                state.clear()
+                state["failed_at"] = now
+    
     def _scan_loop(self):
         """Main scanning loop (runs in separate thread)."""
         while not self.stop_scanning:
@@ -332,7 +902,12 @@ class MemoryScanner:
                 try:
                     if not self.process:
                         break
-                    if PSUTIL_AVAILABLE and hasattr(self.process, 'is_running'):
+                    if self.process_index is not None and hasattr(self.process, 'pid'):
+                        # Shared process-table snapshot (refreshed by the index at most every max_age)
+                        if not self.process_index.has_pid(self.process.pid):
+                            self.log_callback("MemoryScanner: Process no longer running")
+                            break
+                    elif PSUTIL_AVAILABLE and hasattr(self.process, 'is_running'):
                         # psutil.Process has is_running method
                         if not self.process.is_running():
                             self.log_callback("MemoryScanner: Process no longer running")
@@ -367,18 +942,16 @@ class MemoryScanner:
                         time.sleep(self.scan_interval)
                         continue
                 
-                # Scan memory
-                if self._scan_memory_for_patterns():
+                # Poll resolved pointers (a few bytes each); the region scan only runs for byte patterns
+                if self.pointer_patterns:
+                    self._poll_pointer_patterns()
+                if self.scan_patterns and self._scan_memory_for_patterns():
                     if self.detection_callback:
                         try:
                             self.detection_callback()
                         except Exception:
                             pass
                 
-                # Clear cache periodically to allow re-scanning
-                if len(self.scanned_regions) > 500:
-                    self.scanned_regions.clear()
-                
             except Exception as e:
                 # Log unexpected errors but continue
                 try:
@@ -441,20 +1014,39 @@ class MemoryScanner:
                 time.sleep(0.5)
             
             self._close_process()
-            self.scanned_regions.clear()
             self.detection_callback = None
     
+    def take_increments(self) -> int:
+        """Counter increments from pointer patterns since the last call (one per death)."""
+        with self.counter_lock:
+            increments, self.pending_increments = self.pending_increments, 0
+        return increments
+    
+    def counter_ready(self) -> bool:
+        """
+        True while a pointer pattern is resolved and has a baseline value to compare against,
+        and the scan thread is still polling it (it exits when the game process does).
+        """
+        if not (getattr(self, 'process_handle', None) and self.scan_thread and self.scan_thread.is_alive()):
+            return False
+        return any(state.get("value") is not None for state in getattr(self, 'pointer_state', []))
+    
     def is_enabled(self) -> bool:
         """Check if scanning is enabled."""
         return self.enabled and bool(self.patterns)
     
     def update_process(self, process: Optional[object]):
         """Update target process (e.g., when game switches)."""
-        # Check if actually changing (compare PIDs if both are psutil.Process objects)
+        # Check if actually changing (the daemon shares one cached handle, so usually the same object;
+        # otherwise compare PID and create time, which also catches a reused PID)
         try:
+            if self.process is process:
+                return  # Same handle, no change needed
             if self.process and process:
                 if hasattr(self.process, 'pid') and hasattr(process, 'pid'):
-                    if self.process.pid == process.pid:
+                    if self.process.pid == process.pid and (
+                            not hasattr(process, 'create_time')
+                            or self.process.create_time() == process.create_time()):
                         return  # Same process, no change needed
             elif self.process is None and process is None:
                 return  # Both None, no change needed
@@ -464,10 +1056,13 @@ class MemoryScanner:
         
         was_running = False
         with self.lock:
-            was_running = self.scan_thread and self.scan_thread.is_alive()
+            # Also restart a thread that exited on its own because the previous process closed
+            was_running = self.scan_thread is not None
         
-        # Stop outside lock to avoid deadlock (stop() uses lock internally)
+        # Stop outside lock to avoid deadlock (stop() uses lock internally); keep the daemon's callback
+        detection_callback = self.detection_callback
         self.stop()
+        self.detection_callback = detection_callback
         
         # Update process and restart if needed
         self.process = process
@@ -502,9 +1097,8 @@ class MemoryScanner:
             self.process = process
         
         if self.enabled:
-            self.patterns = self.config.get("patterns", [])
+            self._set_patterns(self.config.get("patterns", []))
             self.scan_interval = self.config.get("scan_interval_seconds", 1.0)
-            self.scanned_regions = set()
             
             if self.process and self.patterns:
                 self.start()
@@ -13,11 +13,12 @@ import sys
 import time
 import ctypes
 import json
+import atexit
+import threading
 import traceback
 import subprocess
 import psutil
-from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Optional
 
 # Windows API types for window detection
 try:
@@ -27,10 +28,19 @@ except ImportError:
 
 import cv2
 import numpy as np
-from PIL import Image
 from mss import mss
 import pytesseract
 
+from keyword_matcher import get_keyword_matcher
+import death_journal
+from death_journal import DeathJournal
+from log_writer import LogWriter
+from process_index import ProcessIndex, GameProcessHandle
+from window_tracker import WindowTracker, default_provider
+from ocr_processing import frame_to_image, save_ocr_debug_image, is_death_candidate, preprocess_for_ocr, ocr_text
+from tick_scheduler import TickScheduler, IDLE, NORMAL, BURST
+from ocr_engine import OcrEngine, find_tesseract_executable
+
 # Import detection modules (optional dependencies)
 try:
     from log_monitor import LogMonitor
@@ -46,6 +56,20 @@ except ImportError:
     MEMORY_SCANNER_AVAILABLE = False
     MemoryScanner = None
 
+try:
+    from template_matcher import TemplateMatcher
+    TEMPLATE_MATCHER_AVAILABLE = True
+except ImportError:
+    TEMPLATE_MATCHER_AVAILABLE = False
+    TemplateMatcher = None
+
+try:
+    from ocr_pipeline import OcrPipeline
+    OCR_PIPELINE_AVAILABLE = True
+except ImportError:
+    OCR_PIPELINE_AVAILABLE = False
+    OcrPipeline = None
+
 # =========================
 # CONFIGURATION
 # =========================
@@ -75,49 +99,34 @@ CURRENT_GAME_TXT = os.path.join(BASE_DIR, "current_game.txt")  # Current game na
 CURRENT_DEATHS_TXT = os.path.join(BASE_DIR, "current_deaths.txt")  # Current game death count for Streamer.bot
 TOTAL_DEATHS_TXT = os.path.join(BASE_DIR, "total_deaths.txt")  # Total deaths across all games for Streamer.bot
 
-# Find Tesseract executable - check common locations
-def find_tesseract_executable():
-    """Find Tesseract OCR executable in common installation locations."""
-    # Common Tesseract installation paths
-    common_paths = [
-        r"C:\Program Files\Tesseract-OCR\tesseract.exe",
-        r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
-        os.path.join(os.getenv('ProgramFiles', r'C:\Program Files'), 'Tesseract-OCR', 'tesseract.exe'),
-        os.path.join(os.getenv('ProgramFiles(x86)', r'C:\Program Files (x86)'), 'Tesseract-OCR', 'tesseract.exe'),
-    ]
-    
-    # Check if tesseract is in PATH
-    try:
-        result = subprocess.run(['tesseract', '--version'], 
-                              capture_output=True, text=True, timeout=2)
-        if result.returncode == 0:
-            return 'tesseract'  # Use command name if in PATH
-    except:
-        pass
-    
-    # Check common paths
-    for path in common_paths:
-        if os.path.exists(path):
-            return path
-    
-    # Default fallback
-    return r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-
 TESSERACT_EXE = find_tesseract_executable()
 pytesseract.pytesseract.tesseract_cmd = TESSERACT_EXE
 
 # Default settings
 DEFAULT_SETTINGS = {
-    "tick_seconds": 0.30,
+    "tick_seconds": 0.30,  # Tick period while the game is running (deadline-based: work time is part of it)
+    "idle_tick_seconds": 1.0,  # Tick period while no process of the current game is running
+    "burst_tick_seconds": 0.10,  # Tick period while a detection streak is building toward consecutive_hits
     "debug_every_ticks": 30,
     "consecutive_hits": 2,
     "cooldown_seconds": 8.0,
     "monitor_index": 1,  # 1-indexed (monitor 1 is primary)
     "fuzzy_ocr_matching": True,  # Enable fuzzy OCR matching (handles misreadings like O->0, I->1, etc.)
+    "ocr_engine": "auto",  # "auto" (persistent Tesseract C API, falls back to pytesseract), "capi" or "pytesseract"
+    "pipelined_ocr": False,  # Run OCR in worker processes so a slow OCR call never delays the next capture
+    "ocr_workers": 2,  # Number of OCR worker processes in pipelined mode
+    "frame_diff_gate": True,  # Skip OCR (reuse previous verdict) when the capture region hasn't changed
+    "ocr_glyph_height": 40,  # Text is cropped and scaled to this glyph height (px) before OCR
+    "frame_diff_threshold": 2.0,  # Mean absolute difference (0-255) on a downsampled frame that counts as a change
+    "log_level": "INFO",  # debug.log verbosity: DEBUG (every periodic tick line), INFO, WARNING or ERROR
+    "log_max_bytes": 5242880,  # Rotate debug.log at this size (0 = never)
+    "log_backups": 3,  # Rotated logs kept (debug.log.1 ... debug.log.N)
+    "process_scan_seconds": 1.0,  # How often the PID list is diffed for game start/exit events
     "detection_methods": {
         "ocr": True,  # OCR-based detection (default, always available)
         "log_monitoring": False,  # Log file monitoring (optional, requires watchdog)
         "memory_scanning": False,  # Memory scanning (optional, Windows only)
+        "template": False,  # Template matching against recorded death banners (templates/<game>/)
     },
 }
 
@@ -127,35 +136,45 @@ DEFAULT_SETTINGS = {
 DEFAULT_GAMES = {
     "Elden Ring": {
         "region": {"use_percentages": True, "left": 0.2708, "top": 0.4352, "width": 0.4583, "height": 0.1852},
-        "keywords": ["YOUDIED", "YOUDIE", "YOUDED", "DIED", "Y0UDIED", "Y0UDIE", "Y0UDED", "YOUD13D", "YOUD1ED", "YOUDI3D", "Y0UD13D", "Y0UD1ED", "Y0UDI3D", "Y0U DIED", "YOU D13D", "Y0U D13D"],
+        "keywords": ["YOUDIED", "YOUDIE", "YOUDED", "DIED"],
+        "max_edit_distance": 1.0,
+        "ocr_candidate": {"enabled": True, "min_coverage": 0.003, "max_coverage": 0.6, "min_components": 2, "max_components": 60, "min_extent": 0.2},
         "tesseract_config": "--oem 3 --psm 7 -c tessedit_char_whitelist=YOUDIEADFT",
         "monitor_index": 2,
         "process_names": ["eldenring.exe", "elden ring.exe"],  # Process names to detect
     },
     "Dark Souls 3": {
         "region": {"use_percentages": True, "left": 0.2708, "top": 0.4352, "width": 0.4583, "height": 0.1852},
-        "keywords": ["YOUDIED", "YOUDIE", "YOUD1ED", "YOUDlED", "YOUDI", "OUDIED", "YOUDIE0", "Y0UDIED", "Y0UDIE", "Y0UD13D", "YOUD13D", "Y0U DIED", "YOU D13D", "Y0U D13D", "1OUDIED"],
+        "keywords": ["YOUDIED", "YOUDIE", "YOUDI", "OUDIED"],
+        "max_edit_distance": 1.0,
+        "ocr_candidate": {"enabled": True, "min_coverage": 0.003, "max_coverage": 0.6, "min_components": 2, "max_components": 60, "min_extent": 0.2},
         "tesseract_config": "--oem 3 --psm 7 -c tessedit_char_whitelist=YOUDIEADFT",
         "monitor_index": 2,
         "process_names": ["darksoulsiii.exe", "dark souls iii.exe"],
     },
     "Dark Souls Remastered": {
         "region": {"use_percentages": True, "left": 0.2708, "top": 0.4352, "width": 0.4583, "height": 0.1852},
-        "keywords": ["YOUDIED", "YOUDIE", "YOUD1ED", "YOUDlED", "YOUDI", "OUDIED", "YOUDIE0", "Y0UDIED", "Y0UDIE", "Y0UD13D", "YOUD13D", "Y0U DIED", "YOU D13D", "Y0U D13D", "1OUDIED"],
+        "keywords": ["YOUDIED", "YOUDIE", "YOUDI", "OUDIED"],
+        "max_edit_distance": 1.0,
+        "ocr_candidate": {"enabled": True, "min_coverage": 0.003, "max_coverage": 0.6, "min_components": 2, "max_components": 60, "min_extent": 0.2},
         "tesseract_config": "--oem 3 --psm 7 -c tessedit_char_whitelist=YOUDIEADFT",
         "monitor_index": 2,
         "process_names": ["darksoulsremastered.exe", "dark souls remastered.exe"],
     },
     "Dark Souls II: Scholar of the First Sin": {
         "region": {"use_percentages": True, "left": 0.2708, "top": 0.4352, "width": 0.4583, "height": 0.1852},
-        "keywords": ["YOUDIED", "YOUDIE", "YOUD1ED", "YOUDlED", "YOUDI", "OUDIED", "YOUDIE0", "Y0UDIED", "Y0UDIE", "Y0UD13D", "YOUD13D", "Y0U DIED", "YOU D13D", "Y0U D13D", "1OUDIED"],
+        "keywords": ["YOUDIED", "YOUDIE", "YOUDI", "OUDIED"],
+        "max_edit_distance": 1.0,
+        "ocr_candidate": {"enabled": True, "min_coverage": 0.003, "max_coverage": 0.6, "min_components": 2, "max_components": 60, "min_extent": 0.2},
         "tesseract_config": "--oem 3 --psm 7 -c tessedit_char_whitelist=YOUDIEADFT",
         "monitor_index": 2,
         "process_names": ["darksoulsii.exe", "dark souls ii.exe"],
     },
     "Sekiro": {
         "region": {"use_percentages": True, "left": 0.3802, "top": 0.2685, "width": 0.2240, "height": 0.4074},
-        "keywords": ["DEATH", "死", "D34TH", "DE4TH", "DEA7H", "YOUDIED", "Y0UDIED", "YOUD13D"],
+        "keywords": ["DEATH", "死", "YOUDIED", "YOUDIE"],
+        "max_edit_distance": 1.0,
+        "ocr_candidate": {"enabled": True, "min_coverage": 0.003, "max_coverage": 0.6, "min_components": 1, "max_components": 60, "min_extent": 0.1},
         "tesseract_config": "--oem 3 --psm 7",
         "tesseract_lang": "jpn+eng",
         "monitor_index": 2,
@@ -163,21 +182,27 @@ DEFAULT_GAMES = {
     },
     "Demon's Souls (Remake)": {
         "region": {"use_percentages": True, "left": 0.2708, "top": 0.4352, "width": 0.4583, "height": 0.1852},
-        "keywords": ["YOUDIED", "YOUDIE", "YOUD1ED", "YOUDlED", "YOUDI", "OUDIED", "YOUDIE0", "Y0UDIED", "Y0UDIE", "Y0UD13D", "YOUD13D", "Y0U DIED", "YOU D13D", "Y0U D13D", "1OUDIED"],
+        "keywords": ["YOUDIED", "YOUDIE", "YOUDI", "OUDIED"],
+        "max_edit_distance": 1.0,
+        "ocr_candidate": {"enabled": True, "min_coverage": 0.003, "max_coverage": 0.6, "min_components": 2, "max_components": 60, "min_extent": 0.2},
         "tesseract_config": "--oem 3 --psm 7 -c tessedit_char_whitelist=YOUDIEADFT",
         "monitor_index": 2,
         "process_names": ["demonssouls.exe", "demon's souls.exe", "demons-souls.exe", "psplus.exe", "remoteplay.exe"],
     },
     "Dark Souls: Prepare to Die Edition": {
         "region": {"use_percentages": True, "left": 0.2708, "top": 0.4352, "width": 0.4583, "height": 0.1852},
-        "keywords": ["YOUDIED", "YOUDIE", "YOUD1ED", "YOUDlED", "YOUDI", "OUDIED", "YOUDIE0", "Y0UDIED", "Y0UDIE", "Y0UD13D", "YOUD13D", "Y0U DIED", "YOU D13D", "Y0U D13D", "1OUDIED"],
+        "keywords": ["YOUDIED", "YOUDIE", "YOUDI", "OUDIED"],
+        "max_edit_distance": 1.0,
+        "ocr_candidate": {"enabled": True, "min_coverage": 0.003, "max_coverage": 0.6, "min_components": 2, "max_components": 60, "min_extent": 0.2},
         "tesseract_config": "--oem 3 --psm 7 -c tessedit_char_whitelist=YOUDIEADFT",
         "monitor_index": 2,
         "process_names": ["darksouls.exe", "dark souls.exe", "darksoulspreparetodie.exe", "darksoulsptde.exe", "data.exe"],
     },
     "Dark Souls 2": {
         "region": {"use_percentages": True, "left": 0.2708, "top": 0.4352, "width": 0.4583, "height": 0.1852},
-        "keywords": ["YOUDIED", "YOUDIE", "YOUD1ED", "YOUDlED", "YOUDI", "OUDIED", "YOUDIE0", "Y0UDIED", "Y0UDIE", "Y0UD13D", "YOUD13D", "Y0U DIED", "YOU D13D", "Y0U D13D", "1OUDIED"],
+        "keywords": ["YOUDIED", "YOUDIE", "YOUDI", "OUDIED"],
+        "max_edit_distance": 1.0,
+        "ocr_candidate": {"enabled": True, "min_coverage": 0.003, "max_coverage": 0.6, "min_components": 2, "max_components": 60, "min_extent": 0.2},
         "tesseract_config": "--oem 3 --psm 7 -c tessedit_char_whitelist=YOUDIEADFT",
         "monitor_index": 2,
         "process_names": ["darksouls2.exe", "dark souls 2.exe"],
@@ -232,21 +257,29 @@ def move_console_to_top_right():
 # =========================
 # LOGGING
 # =========================
-def log(msg: str):
-    os.makedirs(BASE_DIR, exist_ok=True)
-    ts = datetime.now().strftime("[%Y-%m-%d %H:%M:%S]")
-    try:
-        with open(DEBUG_LOG, "a", encoding="utf-8", errors='replace') as f:
-            f.write(f"{ts} {msg}\n")
-        # Print to console with error handling for Unicode
-        try:
-            print(msg)
-        except UnicodeEncodeError:
-            # If console can't handle Unicode, print ASCII version
-            print(msg.encode('ascii', errors='replace').decode('ascii'))
-    except Exception as e:
-        # Silently fail if we can't write to log
-        pass
+# Shared log sink: created on first use, settings applied by configure_logging()
+_log_writer: Optional[LogWriter] = None
+
+
+def get_log_writer() -> LogWriter:
+    """The daemon's LogWriter (debug.log, echoed to the console)."""
+    global _log_writer
+    if _log_writer is None:
+        _log_writer = LogWriter(DEBUG_LOG, echo=True)
+        atexit.register(_log_writer.close)
+    return _log_writer
+
+
+def configure_logging(settings: Dict):
+    """Apply log_level / log_max_bytes / log_backups from settings."""
+    get_log_writer().configure(settings.get("log_level", DEFAULT_SETTINGS["log_level"]),
+                               settings.get("log_max_bytes", DEFAULT_SETTINGS["log_max_bytes"]),
+                               settings.get("log_backups", DEFAULT_SETTINGS["log_backups"]))
+
+
+def log(msg: str, level: str = "INFO"):
+    """Queue a line for debug.log and the console (written by the LogWriter thread)."""
+    get_log_writer().log(msg, level)
 
 
 # =========================
@@ -265,7 +298,7 @@ def load_config() -> Dict:
             games = {**DEFAULT_GAMES, **config.get("games", {})}
             return {"settings": settings, "games": games}
         except Exception as e:
-            log(f"Error loading config: {e}. Using defaults.")
+            log(f"Error loading config: {e}. Using defaults.", "ERROR")
     
     # Create default config file
     default_config = {
@@ -288,7 +321,7 @@ def save_config(config: Dict):
             except:
                 pass  # os.fsync might not be available on all systems
     except Exception as e:
-        log(f"Error saving config: {e}")
+        log(f"Error saving config: {e}", "ERROR")
 
 
 # =========================
@@ -334,196 +367,129 @@ def release_lock():
 # STATE MANAGEMENT
 # =========================
 def load_state() -> Dict:
-    """Load state from JSON file."""
-    if not os.path.exists(STATE_JSON):
-        return {
-            "total_deaths": 0,
-            "game_deaths": {},
-            "tick": 0,
-            "streak": 0,
-            "last_death_ts": 0.0,
-            "current_game": None,
-        }
-    try:
-        with open(STATE_JSON, "r", encoding="utf-8") as f:
-            state = json.load(f)
-    except Exception:
-        state = {}
-    
-    state.setdefault("total_deaths", 0)
-    state.setdefault("game_deaths", {})
-    state.setdefault("tick", 0)
-    state.setdefault("streak", 0)
-    state.setdefault("last_death_ts", 0.0)
-    state.setdefault("current_game", None)
-    return state
+    """Load state: the death_state.json snapshot plus journal events appended since (see death_journal)."""
+    return death_journal.load_state(STATE_JSON)
 
 
-def save_state(state: Dict):
-    """Save state to JSON file."""
-    try:
-        with open(STATE_JSON, "w", encoding="utf-8") as f:
-            json.dump(state, f, indent=2)
-            f.flush()  # Force write to disk immediately
-            try:
-                os.fsync(f.fileno())  # Ensure file is synced to disk
-            except:
-                pass  # os.fsync might not be available on all systems
-    except Exception as e:
-        log(f"Error saving state: {e}")
+# =========================
+# OVERLAY OUTPUT
+# =========================
+class OverlayWriter:
+    """
+    Output stage for the OBS/Streamer.bot text files.
 
+    The tick thread hands over the in-memory counts with publish(); a background thread
+    writes only the files whose content changed, each atomically (temp file + rename) so
+    readers never see a half-written number. Failed writes (e.g. a file briefly locked
+    by a reader on Windows) are retried until they succeed or newer content arrives.
+    """
 
-def write_text(deaths: int, game_name: str = None):
-    """Write death count to text file for OBS."""
-    try:
-        # Write total deaths
-        with open(DEATH_TXT, "w", encoding="utf-8") as f:
-            f.write(str(deaths))
-        
-        # Also write per-game file if game name provided
+    RETRY_SECONDS = 0.5
+
+    def __init__(self, log_callback: Optional[Callable[[str], None]] = None):
+        self.log_callback = log_callback or (lambda msg: None)
+        self.condition = threading.Condition()
+        self.dirty: Dict[str, str] = {}  # path -> content still to write
+        self.written: Dict[str, str] = {}  # path -> content on disk (as far as we know)
+        self.stopping = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def outputs(state: Dict, game_name: Optional[str]) -> Dict[str, str]:
+        """File contents for the current state: {path: text}."""
+        game_deaths = str(state.get("game_deaths", {}).get(game_name, 0)) if game_name else "0"
+        files = {
+            DEATH_TXT: game_deaths,  # Current game's death count (not total)
+            TOTAL_DEATHS_TXT: str(state.get("total_deaths", 0)),
+        }
         if game_name:
-            game_txt = os.path.join(BASE_DIR, f"death_counter_{game_name.replace(' ', '_')}.txt")
-            try:
-                state = load_state()
-                game_deaths = state.get("game_deaths", {}).get(game_name, 0)
-                with open(game_txt, "w", encoding="utf-8") as f:
-                    f.write(str(game_deaths))
-            except Exception as e:
-                log(f"Error writing game text file: {e}")
-    except Exception as e:
-        log(f"Error writing death text: {e}")
+            files[os.path.join(BASE_DIR, f"death_counter_{game_name.replace(' ', '_')}.txt")] = game_deaths
+            # Streamer.bot chat command: game name and its count in separate files
+            files[CURRENT_GAME_TXT] = game_name
+            files[CURRENT_DEATHS_TXT] = game_deaths
+        return files
 
+    def publish(self, state: Dict, game_name: Optional[str]):
+        """Queue the text files for this state (cheap; the writes happen on the writer thread)."""
+        files = self.outputs(state, game_name)
+        with self.condition:
+            for path, content in files.items():
+                if self.written.get(path) != content:
+                    self.dirty[path] = content
+                else:
+                    self.dirty.pop(path, None)
+            if self.dirty:
+                self.condition.notify()
 
-def write_chat_info(game_name: str, death_count: int):
-    """Write simple text files for Streamer.bot chat command.
-    Creates two separate files:
-    - current_game.txt: Just the game name
-    - current_deaths.txt: Just the death count
-    This makes it easier for Streamer.bot to read.
-    """
-    try:
-        # Write game name to separate file
-        with open(CURRENT_GAME_TXT, "w", encoding="utf-8") as f:
-            f.write(game_name)
-        
-        # Write death count to separate file
-        with open(CURRENT_DEATHS_TXT, "w", encoding="utf-8") as f:
-            f.write(str(death_count))
-    except Exception as e:
-        log(f"Error writing chat info: {e}")
+    def _write(self, path: str, content: str):
+        """Write one file atomically."""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
 
+    def _run(self):
+        """Writer thread: flush dirty files whenever publish() queues some."""
+        while True:
+            with self.condition:
+                while not self.dirty and not self.stopping:
+                    self.condition.wait()
+                if not self.dirty and self.stopping:
+                    return
+                batch = dict(self.dirty)
+            failed = False
+            for path, content in batch.items():
+                try:
+                    self._write(path, content)
+                except Exception as e:
+                    failed = True
+                    self.log_callback(f"Error writing {os.path.basename(path)}: {e}")
+                    continue
+                with self.condition:
+                    self.written[path] = content
+                    # Leave it dirty if publish() queued newer content meanwhile
+                    if self.dirty.get(path) == content:
+                        del self.dirty[path]
+            if failed:
+                with self.condition:
+                    if self.stopping:
+                        return
+                    self.condition.wait(self.RETRY_SECONDS)
 
-def write_total_deaths(total_deaths: int):
-    """Write total deaths across all games to a separate file for Streamer.bot."""
-    try:
-        with open(TOTAL_DEATHS_TXT, "w", encoding="utf-8") as f:
-            f.write(str(total_deaths))
-    except Exception as e:
-        log(f"Error writing total deaths: {e}")
+    def stop(self, timeout: float = 2.0):
+        """Write whatever is still queued, then stop the writer thread."""
+        with self.condition:
+            self.stopping = True
+            self.condition.notify()
+        self.thread.join(timeout)
 
 
 # =========================
 # GAME DETECTION
 # =========================
+# Shared snapshot of the process table (max age set from settings in main_loop)
+PROCESS_INDEX = ProcessIndex(log_callback=lambda msg: log(msg, "ERROR"))
+# The active game's process, shared by window tracking and the memory scanner
+GAME_PROCESS = GameProcessHandle(PROCESS_INDEX)
+# The game's main window: enumerated once per process, then only GetWindowRect
+WINDOW_TRACKER = WindowTracker(default_provider(), log_callback=log)
+
+
 def get_running_processes() -> List[str]:
     """Get list of all running process names (lowercase, without .exe)."""
-    processes = []
-    try:
-        for proc in psutil.process_iter(['name']):
-            try:
-                proc_name = proc.info['name'].lower()
-                # Remove .exe extension for matching
-                if proc_name.endswith('.exe'):
-                    proc_name = proc_name[:-4]
-                processes.append(proc_name)
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-    except Exception as e:
-        log(f"Error getting processes: {e}")
-    return processes
+    return PROCESS_INDEX.names()
 
 
 def get_game_process(game_config: Dict) -> Optional[psutil.Process]:
-    """Get the process object for the current game."""
-    process_names = game_config.get("process_names", [])
-    if not process_names:
-        return None
-    
-    try:
-        for proc in psutil.process_iter(['name', 'pid']):
-            try:
-                proc_name = proc.info['name'].lower()
-                if proc_name.endswith('.exe'):
-                    proc_name = proc_name[:-4]
-                
-                for game_proc_name in process_names:
-                    normalized = game_proc_name.lower()
-                    if normalized.endswith('.exe'):
-                        normalized = normalized[:-4]
-                    
-                    if normalized == proc_name:
-                        return psutil.Process(proc.info['pid'])
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-    except Exception as e:
-        log(f"Error finding game process: {e}")
-    return None
+    """Get the process object for the current game (cached handle, re-validated each call)."""
+    return GAME_PROCESS.get(game_config.get("process_names", []))
 
 
 def get_window_rect(process: psutil.Process) -> Optional[dict]:
-    """Get the window rectangle for a process using Windows API."""
+    """Get the window rectangle for a process (cached window handle, see WindowTracker)."""
     try:
-        # Windows API constants
-        GW_OWNER = 4
-        
-        # Find window by process ID
-        windows = []
-        
-        def enum_windows_callback(hwnd, lParam):
-            try:
-                if ctypes.windll.user32.IsWindowVisible(hwnd):
-                    pid = ctypes.c_ulong()
-                    ctypes.windll.user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
-                    if pid.value == process.pid:
-                        # Check if it's not a child window
-                        owner = ctypes.windll.user32.GetWindow(hwnd, GW_OWNER)
-                        if owner == 0:
-                            windows.append(hwnd)
-            except:
-                pass
-            return True
-        
-        # Define callback type
-        EnumWindowsProc = ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.c_void_p, ctypes.c_void_p)
-        callback = EnumWindowsProc(enum_windows_callback)
-        
-        # Find all windows for this process
-        ctypes.windll.user32.EnumWindows(callback, None)
-        
-        if not windows:
-            return None
-        
-        # Use the first (main) window
-        hwnd = windows[0]
-        
-        # Get window rectangle
-        class RECT(ctypes.Structure):
-            _fields_ = [("left", ctypes.c_long),
-                        ("top", ctypes.c_long),
-                        ("right", ctypes.c_long),
-                        ("bottom", ctypes.c_long)]
-        
-        rect = RECT()
-        ctypes.windll.user32.GetWindowRect(hwnd, ctypes.byref(rect))
-        
-        return {
-            'left': rect.left,
-            'top': rect.top,
-            'right': rect.right,
-            'bottom': rect.bottom,
-            'width': rect.right - rect.left,
-            'height': rect.bottom - rect.top
-        }
+        return WINDOW_TRACKER.get_rect(process.pid)
     except Exception:
         # Silently fail - will fall back to configured monitor
         return None
@@ -591,62 +557,47 @@ def detect_game(games: Dict) -> Optional[str]:
     Auto-detect which game is currently running by checking process names.
     Returns the game name if detected, None otherwise.
     """
-    running_procs = get_running_processes()
-    
-    # Check each game's process names
-    for game_name, game_config in games.items():
-        process_names = game_config.get("process_names", [])
-        if not process_names:
-            continue
-        
-        # Check if any of this game's process names are running
-        for proc_name in process_names:
-            # Normalize: remove .exe, lowercase
-            normalized = proc_name.lower()
-            if normalized.endswith('.exe'):
-                normalized = normalized[:-4]
-            
-            # Check if this process is running
-            if normalized in running_procs:
-                log(f"Auto-detected game: {game_name} (process: {proc_name})")
-                return game_name
-    
+    match = PROCESS_INDEX.detect_game(games)
+    if match:
+        game_name, proc_name = match
+        log(f"Auto-detected game: {game_name} (process: {proc_name})")
+        return game_name
     return None
 
 
 # =========================
 # IMAGE PROCESSING
 # =========================
-def grab_region(sct: mss, monitor_index: int, region: dict, game_config: Dict = None, window_rect: Optional[dict] = None) -> Image.Image:
+def compute_capture_box(monitors: List[dict], monitor_index: int, region: dict,
+                        window_rect: Optional[dict] = None) -> dict:
     """
-    Capture a region from the specified monitor or game window.
+    Absolute capture rectangle for a region on the specified monitor or game window.
     Supports both absolute pixel coordinates and percentage-based coordinates for multi-resolution support.
     Automatically detects if window is fullscreen/borderless (uses monitor-relative) or windowed (uses window-relative).
     
     Args:
-        sct: MSS screenshot context
+        monitors: mss monitor list (sct.monitors)
         monitor_index: Monitor index to use (fallback if window detection fails)
         region: Region configuration dict
-        game_config: Optional game configuration dict
         window_rect: Optional window rectangle dict (if None, uses monitor-based capture)
     
-    Note: Monitor auto-detection is now handled in the main loop with throttling
-    to prevent race conditions. This function just uses the provided monitor_index.
+    Returns:
+        Dict with left/top/width/height, ready for sct.grab()
     """
     
     # mss uses 0-indexed monitors (0 is all monitors, 1+ are individual)
     # Validate monitor index before using it
-    num_monitors = len(sct.monitors)
+    num_monitors = len(monitors)
     max_valid_index = num_monitors - 1
     
     if monitor_index < 0 or monitor_index > max_valid_index:
         # Invalid monitor index - use monitor 1 (primary) as fallback
-        log(f"WARNING: Monitor {monitor_index} is invalid (valid range: 0-{max_valid_index}). Using monitor 1.")
+        log(f"WARNING: Monitor {monitor_index} is invalid (valid range: 0-{max_valid_index}). Using monitor 1.", "WARNING")
         actual_index = 1
     else:
         actual_index = monitor_index
     
-    mon = sct.monitors[actual_index]
+    mon = monitors[actual_index]
     mon_width = mon["width"]
     mon_height = mon["height"]
     
@@ -670,11 +621,11 @@ def grab_region(sct: mss, monitor_index: int, region: dict, game_config: Dict =
                 # Validate window dimensions before using windowed mode
                 # If window is too small or invalid, fallback to monitor mode
                 if window_width < 100 or window_height < 100:
-                    log(f"WARNING: Window too small ({window_width}x{window_height}), falling back to monitor mode")
+                    log(f"WARNING: Window too small ({window_width}x{window_height}), falling back to monitor mode", "WARNING")
                     use_windowed_mode = False
         except Exception as e:
             # If anything fails in windowed detection, fallback to monitor mode (safe)
-            log(f"WARNING: Error in windowed mode detection: {e}, falling back to monitor mode")
+            log(f"WARNING: Error in windowed mode detection: {e}, falling back to monitor mode", "WARNING")
             import traceback
             log(traceback.format_exc())
             use_windowed_mode = False
@@ -748,7 +699,7 @@ def grab_region(sct: mss, monitor_index: int, region: dict, game_config: Dict =
             
             # If region is invalid after clamping, fallback to monitor mode
             if region_width <= 0 or region_height <= 0:
-                log(f"WARNING: Windowed mode region invalid after clamping (width={region_width}, height={region_height}), falling back to monitor mode")
+                log(f"WARNING: Windowed mode region invalid after clamping (width={region_width}, height={region_height}), falling back to monitor mode", "WARNING")
                 use_windowed_mode = False
             else:
                 abs_region = {
@@ -761,7 +712,7 @@ def grab_region(sct: mss, monitor_index: int, region: dict, game_config: Dict =
                 # Detailed logging happens in main loop when window is first detected
         except Exception as e:
             # If anything fails in windowed calculation, fallback to monitor mode
-            log(f"WARNING: Error calculating windowed region: {e}, falling back to monitor mode")
+            log(f"WARNING: Error calculating windowed region: {e}, falling back to monitor mode", "WARNING")
             use_windowed_mode = False
     
     # MONITOR MODE: Calculate region relative to monitor (original behavior)
@@ -804,235 +755,138 @@ def grab_region(sct: mss, monitor_index: int, region: dict, game_config: Dict =
                     "height": region["height"],
                 }
     
-    # Capture at full quality (mss captures at native resolution)
-    grab = sct.grab(abs_region)
-    img = Image.frombytes("RGB", grab.size, grab.rgb)
-    
-    # If the captured region is very small, upscale it immediately to improve quality
-    # This helps with pixelated text from small capture regions
-    if img.size[0] < 200 or img.size[1] < 100:
-        # Small region - upscale using high-quality resampling
-        new_width = img.size[0] * 2
-        new_height = img.size[1] * 2
-        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-    
-    return img
+    return abs_region
 
 
-def preprocess_for_ocr(img_rgb: Image.Image) -> Tuple[Image.Image, Dict]:
+class CapturePlan:
     """
-    Preprocess image for OCR with multiple fallback strategies.
-    Improved upscaling and sharpening for better OCR accuracy and reduced pixelation.
+    The capture box grab_region() uses, computed once per (monitor geometry, window rect,
+    region config) and reused until one of those changes.
     """
-    # Convert PIL to numpy array
-    rgb = np.array(img_rgb)
-    
-    # If image is very small, upscale it first before processing
-    if rgb.shape[0] < 150 or rgb.shape[1] < 300:
-        # Very small image - upscale using high-quality method
-        scale_factor = max(300 / rgb.shape[1], 150 / rgb.shape[0])
-        new_width = int(rgb.shape[1] * scale_factor)
-        new_height = int(rgb.shape[0] * scale_factor)
-        # Use PIL's LANCZOS for better quality upscaling
-        img_rgb = img_rgb.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        rgb = np.array(img_rgb)
-    
-    bgr = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
-    
-    def upscale(img_cv):
-        """Upscale image 3x for better OCR quality and reduced pixelation."""
-        # Use LANCZOS interpolation for better quality (slower but much better for text)
-        # 3x upscale gives better results than 2x for pixelated text
-        return cv2.resize(img_cv, None, fx=3.0, fy=3.0, interpolation=cv2.INTER_LANCZOS4)
-    
-    # Strategy 1: Try HSV red mask (for "YOU DIED" red text)
-    hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
-    
-    # Wide red thresholds (both low and high hue ranges)
-    lower1 = np.array([0, 30, 30], dtype=np.uint8)
-    upper1 = np.array([15, 255, 255], dtype=np.uint8)
-    lower2 = np.array([165, 30, 30], dtype=np.uint8)
-    upper2 = np.array([180, 255, 255], dtype=np.uint8)
-    
-    mask1 = cv2.inRange(hsv, lower1, upper1)
-    mask2 = cv2.inRange(hsv, lower2, upper2)
-    red_mask = cv2.bitwise_or(mask1, mask2)
-    
-    # Strategy 1b: Also detect white/bright text (for Sekiro white death message)
-    # White/bright colors have high value (brightness) and low saturation
-    white_lower = np.array([0, 0, 200], dtype=np.uint8)  # Low saturation, high brightness
-    white_upper = np.array([180, 30, 255], dtype=np.uint8)
-    white_mask = cv2.inRange(hsv, white_lower, white_upper)
-    
-    # Combine red and white masks
-    mask = cv2.bitwise_or(red_mask, white_mask)
-    
-    # Clean noise with better morphology operations
-    # Use smaller kernel for less aggressive cleaning (preserves text better)
-    kernel = np.ones((2, 2), np.uint8)
-    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel, iterations=1)
-    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel, iterations=1)
-    # Gentle dilation to connect text characters
-    mask = cv2.dilate(mask, kernel, iterations=1)
-    
-    white = int(cv2.countNonZero(mask))
-    total = int(mask.shape[0] * mask.shape[1])
-    coverage = white / max(1, total)
     
-    info = {"mode": "HSV_RED_WHITE", "coverage": coverage}
-    
-    # Use red/white mask if coverage is reasonable (at least 0.3% of image - lowered threshold)
-    if coverage >= 0.003:
-        # Invert mask: white text on black background -> black text on white
-        inv = cv2.bitwise_not(mask)
-        # Apply slight sharpening to improve text clarity
-        kernel_sharpen = np.array([[-1, -1, -1],
-                                   [-1,  9, -1],
-                                   [-1, -1, -1]])
-        inv = cv2.filter2D(inv, -1, kernel_sharpen)
-        out = upscale(inv)
-        return Image.fromarray(out), info
+    def __init__(self):
+        self.key = None
+        self.box = None
+        # The input objects of the last call - the tick loop passes the same ones every tick
+        self.inputs = None
+        # Counters for the periodic tick log
+        self.rebuilds = 0
+        self.hits = 0
+    
+    def get(self, monitors: List[dict], monitor_index: int, region: dict, window_rect: Optional[dict] = None) -> dict:
+        """Capture box for these inputs (recomputed only when they differ from the last call)."""
+        inputs = self.inputs
+        if (inputs is not None and inputs[0] is monitors and inputs[1] == monitor_index
+                and inputs[2] is region and inputs[3] is window_rect):
+            self.hits += 1
+            return self.box
+        self.inputs = (monitors, monitor_index, region, window_rect)
+        # New objects (e.g. a fresh window rect every window check) - compare by value
+        key = (
+            monitor_index,
+            tuple((m["left"], m["top"], m["width"], m["height"]) for m in monitors),
+            None if not window_rect else (window_rect.get('left', 0), window_rect.get('top', 0),
+                                          window_rect.get('width', 0), window_rect.get('height', 0)),
+            tuple(region.items()),
+        )
+        if key != self.key:
+            self.box = compute_capture_box(monitors, monitor_index, region, window_rect)
+            self.key = key
+            self.rebuilds += 1
+        else:
+            self.hits += 1
+        return self.box
     
-    # Strategy 2: Grayscale with adaptive threshold (works for any text color)
-    # This fallback ensures we NEVER get a black image - adaptive threshold always produces output
-    gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
-    # Use less blur to preserve text details
-    gray_blur = cv2.GaussianBlur(gray, (3, 3), 0)
-    # Apply unsharp mask for better text clarity
-    gaussian = cv2.GaussianBlur(gray_blur, (0, 0), 2.0)
-    unsharp = cv2.addWeighted(gray_blur, 1.5, gaussian, -0.5, 0)
+    def invalidate(self):
+        """Force the next get() to recompute."""
+        self.key = None
+        self.inputs = None
     
-    thr_adapt = cv2.adaptiveThreshold(
-        unsharp, 255,
-        cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-        cv2.THRESH_BINARY,
-        31, 5
-    )
-    # Invert: make text dark on light background (Tesseract prefers dark text on light)
-    thr_adapt_inv = cv2.bitwise_not(thr_adapt)
-    # Apply slight sharpening to improve text clarity
-    kernel_sharpen = np.array([[-1, -1, -1],
-                               [-1,  9, -1],
-                               [-1, -1, -1]])
-    thr_adapt_inv = cv2.filter2D(thr_adapt_inv, -1, kernel_sharpen)
-    out = upscale(thr_adapt_inv)
-    info["mode"] = "ADAPTIVE_THRESHOLD"
-    info["coverage"] = 0.0  # Set coverage for consistency
-    return Image.fromarray(out), info
-
-
-def ocr_text(img_for_ocr: Image.Image, tesseract_config: str, tesseract_lang: str = "eng") -> str:
-    """Extract text from image using OCR. Supports multiple languages including Japanese."""
-    try:
-        text = pytesseract.image_to_string(img_for_ocr, lang=tesseract_lang, config=tesseract_config)
-        # For English-only, keep alphanumeric (to capture OCR variations like Y0U, D13D) and uppercase
-        # For Japanese/multi-language, keep all characters including Japanese, Chinese, etc. but remove spaces
-        if tesseract_lang == "eng" or (tesseract_lang.startswith("eng") and "+" not in tesseract_lang):
-            # Keep alphanumeric to capture OCR misreadings (letters + numbers like Y0U, D13D)
-            clean = "".join(c for c in text.upper() if c.isalnum())
-        else:
-            # For Japanese/multi-language: keep all characters including Japanese, Chinese, etc.
-            # Remove spaces and newlines, but keep all other characters
-            clean = "".join(c for c in text if not c.isspace())
-        return clean
-    except Exception as e:
-        log(f"OCR error: {e}")
-        return ""
+    def stats_summary(self) -> str:
+        """Short summary for the periodic tick log."""
+        return f"{self.rebuilds} rebuilt/{self.hits} reused"
+
 
+# Capture geometry of the daemon's tick loop
+CAPTURE_PLAN = CapturePlan()
 
-def contains_keyword(clean_text: str, keywords: List[str], fuzzy_matching: bool = True) -> bool:
+
+def grab_region(sct: mss, monitor_index: int, region: dict, game_config: Dict = None, window_rect: Optional[dict] = None) -> np.ndarray:
     """
-    Check if cleaned text contains any keyword.
+    Capture a region from the specified monitor or game window.
+    The capture box comes from CAPTURE_PLAN (see compute_capture_box), so a tick with
+    unchanged geometry is a single sct.grab().
+    
+    Returns:
+        BGRA uint8 array (height, width, 4) viewing mss's capture buffer - no copy is made.
+        Upscaling of small regions happens in preprocess_for_ocr.
     
     Args:
-        clean_text: The OCR-processed text to search in
-        keywords: List of keywords to search for
-        fuzzy_matching: If True, use fuzzy OCR matching (handles misreadings like O->0, I->1, etc.)
-                       If False, use direct matching only (faster, but requires exact keyword matches)
+        sct: MSS screenshot context
+        monitor_index: Monitor index to use (fallback if window detection fails)
+        region: Region configuration dict
+        game_config: Optional game configuration dict
+        window_rect: Optional window rectangle dict (if None, uses monitor-based capture)
     
-    Fuzzy matching supports OCR variations where letters can be misread as numbers:
-    - O <-> 0 (zero), I <-> 1 (one), E <-> 3 (three)
-    - A <-> 4 (four), S <-> 5 (five), G <-> 6 (six)
-    - T <-> 7 (seven), B <-> 8 (eight), Z <-> 2 (two)
+    Note: Monitor auto-detection is now handled in the main loop with throttling
+    to prevent race conditions. This function just uses the provided monitor_index.
     """
-    # Exclude false positives: enemy felled, target destroyed, etc.
-    exclude_keywords = ["ENEMYFELLED", "ENEMYFELLE", "TARGETDESTROYED", "TARGETDESTROYE"]
-    for exclude in exclude_keywords:
-        if exclude in clean_text:
-            return False
+    abs_region = CAPTURE_PLAN.get(sct.monitors, monitor_index, region, window_rect)
     
-    # DIRECT MATCHING MODE (faster, no fuzzy substitutions)
-    if not fuzzy_matching:
-        for keyword in keywords:
-            keyword_clean = keyword.upper().replace(' ', '')
-            if keyword_clean in clean_text:
-                return True
-        return False
-    
-    # FUZZY MATCHING MODE (slower, handles OCR misreadings)
-    # OCR character substitution map (bidirectional)
-    ocr_subs = {
-        'O': ['0'], '0': ['O'],
-        'I': ['1'], '1': ['I'],
-        'E': ['3'], '3': ['E'],
-        'A': ['4'], '4': ['A'],
-        'S': ['5'], '5': ['S'],
-        'G': ['6'], '6': ['G'],
-        'T': ['7'], '7': ['T'],
-        'B': ['8'], '8': ['B'],
-        'Z': ['2'], '2': ['Z'],
-    }
+    # Capture at full quality (mss captures at native resolution) and wrap the raw BGRA buffer
+    grab = sct.grab(abs_region)
+    width, height = grab.size
+    return np.frombuffer(grab.raw, dtype=np.uint8).reshape(height, width, 4)
+
+
+class FrameChangeDetector:
+    """
+    Cheap change detector between grab_region() and preprocess_for_ocr().
+    Compares a downsampled grayscale copy of each capture against the last frame that
+    was actually OCR'd, so gameplay with no death banner doesn't hit Tesseract every tick.
+    """
     
-    def normalize_for_matching(text: str, keyword: str) -> bool:
-        """Check if keyword matches text considering OCR substitutions."""
-        # Direct match first (fast path)
-        keyword_clean = keyword.upper().replace(' ', '')
-        if keyword_clean in clean_text:
-            return True
-        
-        # Generate OCR variation patterns
-        def generate_variations(pattern: str, max_variations: int = 50) -> List[str]:
-            """Generate common OCR variations of a pattern."""
-            variations = set([pattern])  # Start with original
-            chars = list(pattern)
-            
-            # Single character substitutions
-            for i, char in enumerate(chars):
-                if char in ocr_subs:
-                    for sub in ocr_subs[char]:
-                        new_chars = chars.copy()
-                        new_chars[i] = sub
-                        variations.add(''.join(new_chars))
-            
-            # Two character substitutions (common combinations)
-            for i in range(len(chars) - 1):
-                char1, char2 = chars[i], chars[i+1]
-                if char1 in ocr_subs or char2 in ocr_subs:
-                    for sub1 in (ocr_subs.get(char1, [char1]) + [char1]):
-                        for sub2 in (ocr_subs.get(char2, [char2]) + [char2]):
-                            new_chars = chars.copy()
-                            new_chars[i] = sub1
-                            new_chars[i+1] = sub2
-                            variations.add(''.join(new_chars))
-                            if len(variations) >= max_variations:
-                                return list(variations)
-            
-            return list(variations)
-        
-        # Check variations
-        variations = generate_variations(keyword_clean)
-        for variation in variations:
-            if variation in clean_text:
-                return True
-        
-        return False
+    def __init__(self, threshold: float = 2.0, sample_step: int = 8):
+        """
+        Args:
+            threshold: Mean absolute difference (0-255) above which a frame counts as changed
+            sample_step: Downsampling factor in each dimension before comparing
+        """
+        self.threshold = threshold
+        self.sample_step = max(1, int(sample_step))
+        self.reference = None  # Downsampled frame that produced the current verdict
+        self.context = None  # Game the verdict belongs to (keywords/region differ per game)
+        self.checked = 0
+        self.skipped = 0
+    
+    def _sample(self, frame: np.ndarray) -> np.ndarray:
+        # Strided view (nearest-neighbour downsample), then only the small copy is converted
+        small = np.ascontiguousarray(frame[::self.sample_step, ::self.sample_step])
+        code = cv2.COLOR_BGRA2GRAY if small.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+        return cv2.cvtColor(small, code).astype(np.int16)
+    
+    def has_changed(self, frame: np.ndarray, context=None) -> bool:
+        """Return True if frame (BGRA capture) differs meaningfully from the last OCR'd frame (and make it the new reference)."""
+        self.checked += 1
+        sample = self._sample(frame)
+        if (self.reference is not None and context == self.context and
+                sample.shape == self.reference.shape and
+                float(np.mean(np.abs(sample - self.reference))) < self.threshold):
+            self.skipped += 1
+            return False
+        # Only move the reference when we OCR, so slow fade-ins still accumulate into a change
+        self.reference = sample
+        self.context = context
+        return True
     
-    # Try each keyword with fuzzy matching
-    for keyword in keywords:
-        if normalize_for_matching(clean_text, keyword):
-            return True
+    def reset(self):
+        """Forget the reference frame (next frame will always be OCR'd)."""
+        self.reference = None
+        self.context = None
     
-    return False
+    def skip_ratio(self) -> float:
+        """Fraction of checked frames that skipped OCR."""
+        return self.skipped / self.checked if self.checked else 0.0
 
 
 # =========================
@@ -1057,7 +911,7 @@ def main_loop():
         tesseract_available = os.path.exists(TESSERACT_EXE)
     
     if not tesseract_available:
-        log(f"ERROR: Tesseract not found at: {TESSERACT_EXE}")
+        log(f"ERROR: Tesseract not found at: {TESSERACT_EXE}", "ERROR")
         log("Please install Tesseract OCR from: https://github.com/UB-Mannheim/tesseract/wiki")
         log("Or ensure Tesseract is in your PATH.")
         log("Daemon will exit - Tesseract is required.")
@@ -1067,9 +921,12 @@ def main_loop():
     config = load_config()
     settings = config["settings"]
     games = config["games"]
+    configure_logging(settings)
+    PROCESS_INDEX.max_age = float(settings.get("process_scan_seconds", DEFAULT_SETTINGS["process_scan_seconds"]))
+    PROCESS_INDEX.watch(games)
     
     if not games:
-        log("ERROR: No games configured!")
+        log("ERROR: No games configured!", "ERROR")
         log("Daemon will exit - games configuration is required.")
         # Don't create ready file - daemon is not ready
         return
@@ -1131,7 +988,8 @@ def main_loop():
         print("ERROR: Ready file was not created successfully!")
         return
     
-    state = load_state()
+    journal = DeathJournal(STATE_JSON, log_callback=log)
+    state = journal.load()
     
     # Track manually selected game (fallback when no game is detected)
     # This is the game that was manually selected and should be used when no game is running
@@ -1166,18 +1024,14 @@ def main_loop():
         state["manual_game"] = manual_game
         config["manual_game"] = manual_game
     
-    # Save initial state and config with manual_game
-    save_state(state)
+    # Record the starting game and fold anything journaled by the last run into the snapshot
+    journal.record("switch", current_game_name, source="STARTUP", tick=state["tick"])
+    journal.compact({"manual_game": state["manual_game"]} if state.get("manual_game") else None)
     save_config(config)
     
-    # Get the current game's death count (not total)
-    game_deaths = state.get("game_deaths", {}).get(current_game_name, 0)
-    # Write initial text file so OBS has current game's count on startup
-    write_text(game_deaths, current_game_name)
-    # Write initial chat info file
-    write_chat_info(current_game_name, game_deaths)
-    # Write initial total deaths file
-    write_total_deaths(state.get("total_deaths", 0))
+    # Write initial text files so OBS has current game's count on startup
+    overlay = OverlayWriter(log_callback=log)
+    overlay.publish(state, current_game_name)
     
     log("=" * 60)
     log("Multi-Game Soulsborne Death Counter Daemon Started")
@@ -1195,6 +1049,8 @@ def main_loop():
         methods_enabled.append("LOG")
     if detection_methods.get("memory_scanning", False):
         methods_enabled.append("MEMORY")
+    if detection_methods.get("template", False):
+        methods_enabled.append("TEMPLATE")
     log(f"Detection Methods: {', '.join(methods_enabled) if methods_enabled else 'NONE'}")
     log(f"Current Deaths - Total: {state['total_deaths']}, {current_game_name}: {state['game_deaths'].get(current_game_name, 0)}")
     log("=" * 60)
@@ -1203,13 +1059,13 @@ def main_loop():
     if os.path.exists(READY_FILE):
         log(f"READY_FILE verified: {READY_FILE}")
     else:
-        log(f"WARNING: READY_FILE missing, recreating...")
+        log(f"WARNING: READY_FILE missing, recreating...", "WARNING")
         try:
             with open(READY_FILE, "w", encoding="utf-8") as f:
                 f.write(str(os.getpid()))
             log(f"READY_FILE recreated: {READY_FILE}")
         except Exception as e:
-            log(f"ERROR: Could not recreate ready file: {e}")
+            log(f"ERROR: Could not recreate ready file: {e}", "ERROR")
     
     # Now enter mss context - if this hangs, ready file already exists
     with mss() as sct:
@@ -1225,7 +1081,7 @@ def main_loop():
         # Valid indices are 0 (all) and 1 to (num_monitors-1) for individual monitors
         max_valid_index = num_monitors - 1
         if monitor_index < 0 or monitor_index > max_valid_index:
-            log(f"WARNING: Configured monitor_index {monitor_index} is invalid (valid range: 0-{max_valid_index}). Using monitor 1.")
+            log(f"WARNING: Configured monitor_index {monitor_index} is invalid (valid range: 0-{max_valid_index}). Using monitor 1.", "WARNING")
             monitor_index = 1  # Default to monitor 1 (primary display)
             # Update the config to save the corrected value
             game_config["monitor_index"] = monitor_index
@@ -1234,6 +1090,9 @@ def main_loop():
         
         region = game_config.get("region", {})
         keywords = game_config.get("keywords", ["YOUDIED"])
+        # Compile keywords (+ fuzzy variants and exclusions) once per game instead of every tick
+        keyword_matcher = get_keyword_matcher(keywords, fuzzy_matching, game_config.get("exclude_keywords"),
+                                              game_config.get("max_edit_distance", 0.0))
         tesseract_config = game_config.get("tesseract_config", "--oem 3 --psm 7")
         tesseract_lang = game_config.get("tesseract_lang", "eng")
         
@@ -1242,14 +1101,61 @@ def main_loop():
         ocr_enabled = detection_methods.get("ocr", True)
         log_monitoring_enabled = detection_methods.get("log_monitoring", False)
         memory_scanning_enabled = detection_methods.get("memory_scanning", False)
+        template_enabled = detection_methods.get("template", False)
+        
+        # Persistent OCR engine (one Tesseract instance for the whole daemon)
+        ocr_engine = None
+        if ocr_enabled:
+            try:
+                ocr_engine = OcrEngine(TESSERACT_EXE, backend=settings.get("ocr_engine", "auto"), log_callback=log)
+                ocr_engine.configure(tesseract_lang, tesseract_config)
+            except Exception as e:
+                log(f"Failed to initialize OCR engine (using pytesseract): {e}")
+                ocr_engine = None
+        
+        # Pipelined OCR (capture on this thread, OCR in worker processes, stale frames dropped)
+        ocr_pipeline = None
+        if ocr_enabled and settings.get("pipelined_ocr", False) and OCR_PIPELINE_AVAILABLE and OcrPipeline:
+            try:
+                ocr_pipeline = OcrPipeline(workers=settings.get("ocr_workers", 2),
+                                           engine_backend=settings.get("ocr_engine", "auto"),
+                                           tesseract_exe=TESSERACT_EXE, log_callback=log)
+            except Exception as e:
+                log(f"Failed to start OCR pipeline (using serial OCR): {e}")
+                ocr_pipeline = None
+        
+        # Frame-difference gate (reuse the previous OCR verdict while the region is unchanged)
+        frame_detector = None
+        if ocr_enabled and settings.get("frame_diff_gate", True):
+            frame_detector = FrameChangeDetector(threshold=float(settings.get("frame_diff_threshold", 2.0)))
+        last_ocr_verdict = False
+        # Text crops are scaled so glyphs come out this tall, whatever the monitor resolution
+        glyph_height = int(settings.get("ocr_glyph_height", DEFAULT_SETTINGS["ocr_glyph_height"]))
+        # Candidate pre-filter counters (frames preprocessed vs frames rejected before Tesseract)
+        candidate_frames = 0
+        candidate_rejects = 0
         
         # Detection flags (set by each method) - must be defined BEFORE callbacks
-        detection_flags = {"ocr": False, "log": False, "memory": False}
+        detection_flags = {"ocr": False, "log": False, "memory": False, "template": False}
         
         # Initialize log monitor and memory scanner (if enabled)
         log_monitor = None
         memory_scanner = None
         
+        template_matcher = None
+        last_template_verdict = False
+        if template_enabled and TEMPLATE_MATCHER_AVAILABLE and TemplateMatcher:
+            try:
+                template_matcher = TemplateMatcher(game_config, current_game_name, BASE_DIR, log_callback=log)
+                if template_matcher.is_enabled():
+                    log("Template matching initialized")
+                else:
+                    log("Template matching enabled in settings but no templates recorded for this game")
+                    template_matcher = None
+            except Exception as e:
+                log(f"Failed to initialize template matcher: {e}")
+                template_matcher = None
+        
         if log_monitoring_enabled and LOG_MONITOR_AVAILABLE and LogMonitor:
             try:
                 log_monitor = LogMonitor(game_config, log_callback=log)
@@ -1271,7 +1177,8 @@ def main_loop():
             try:
                 game_process = get_game_process(game_config)
                 if game_process:
-                    memory_scanner = MemoryScanner(game_config, process=game_process, log_callback=log)
+                    memory_scanner = MemoryScanner(game_config, process=game_process, log_callback=log,
+                                                   process_index=PROCESS_INDEX)
                     if memory_scanner.is_enabled():
                         # Use a proper closure that captures detection_flags
                         def memory_detection_callback():
@@ -1289,20 +1196,30 @@ def main_loop():
                 log(f"Failed to initialize memory scanner: {e}")
                 memory_scanner = None
         
-        # Auto-detection check interval (check every 30 ticks = ~9 seconds at 0.3s tick)
-        auto_detect_interval = 30
-        # Window position update interval (check every 10 ticks = ~3 seconds for responsive movement)
+        # Tick pacing: monotonic deadlines, slower while the game isn't running, faster during a streak
+        scheduler = TickScheduler({
+            IDLE: settings.get("idle_tick_seconds", DEFAULT_SETTINGS["idle_tick_seconds"]),
+            NORMAL: settings["tick_seconds"],
+            BURST: settings.get("burst_tick_seconds", DEFAULT_SETTINGS["burst_tick_seconds"]),
+        }, log_callback=lambda msg: log(msg, "WARNING"))
+        
+        # The periodic checks below are timed in seconds, not ticks, since the tick period varies
+        # Auto-detection check interval (~9 seconds)
+        # Game launches/exits don't wait for it: PROCESS_INDEX raises events within process_scan_seconds
+        auto_detect_seconds = 9.0
+        # Window position update interval (~3 seconds for responsive movement)
         # More frequent than monitor detection, but not every tick to avoid performance issues
-        window_update_interval = 10
-        last_auto_detect_tick = 0
-        last_monitor_detect_tick = 0
-        last_window_update_tick = 0
+        window_update_seconds = 3.0
+        loop_started = time.monotonic()
+        last_auto_detect_at = loop_started
+        last_monitor_detect_at = loop_started
+        last_window_update_at = loop_started
         cached_monitor_index = monitor_index  # Cache the detected monitor
         cached_window_rect = None  # Cache the detected window rect for windowed mode support
         
         # Flag to track if daemon has fully started (only run monitor detection after this)
         daemon_started = False
-        startup_ticks = 10  # Wait 10 ticks (~3 seconds) after initialization before starting monitor detection
+        startup_seconds = 3.0  # Wait ~3 seconds after initialization before starting monitor detection
         
         try:
             while True:
@@ -1312,14 +1229,25 @@ def main_loop():
                 
                 state["tick"] += 1
                 now = time.time()
+                tick_clock = time.monotonic()
                 
                 # Mark daemon as started after initial startup period
-                if not daemon_started and state["tick"] >= startup_ticks:
+                if not daemon_started and tick_clock - loop_started >= startup_seconds:
                     daemon_started = True
                     log("Monitor auto-detection enabled.")
                 
-                # Auto-detect game periodically (every 9 seconds / 30 ticks)
-                if state["tick"] - last_auto_detect_tick >= auto_detect_interval:
+                # Game process started/exited since the last tick (PID-set diff, no name lookups while stable)
+                process_events = PROCESS_INDEX.poll_events()
+                for event in process_events:
+                    log(f"Game process {event['type']}: {event['game']} ({event['process']}, PID {event['pid']})")
+                if process_events and daemon_started:
+                    # Re-check the window/monitor right away instead of at the next interval
+                    last_monitor_detect_at = float("-inf")
+                    last_window_update_at = float("-inf")
+                
+                # Auto-detect game on process events, and periodically (every 9 seconds / 30 ticks)
+                # to pick up manual switches and count changes made by the GUI/scripts
+                if process_events or tick_clock - last_auto_detect_at >= auto_detect_seconds:
                     # CRITICAL: Reload state/config at the START to get latest manual_game value
                     # This ensures we pick up manual game switches within the auto-detect interval
                     # This is especially important when no game is running
@@ -1337,6 +1265,21 @@ def main_loop():
                         state["current_game"] = current_state["current_game"]
                     if "current_game" in current_config:
                         config["current_game"] = current_config["current_game"]
+                    # Deaths are journaled as they happen, so the file is authoritative for counts -
+                    # pick up resets and corrections made by the GUI/scripts while the daemon runs
+                    if (current_state["game_deaths"] != state["game_deaths"]
+                            or current_state["total_deaths"] != state["total_deaths"]):
+                        state["game_deaths"] = current_state["game_deaths"]
+                        state["total_deaths"] = current_state["total_deaths"]
+                        state["last_death_ts"] = current_state["last_death_ts"]
+                        log(f"Death counts changed outside the daemon -> Total: {state['total_deaths']}")
+                        overlay.publish(state, current_game_name)
+                    # Mask color ranges are looked up per frame, so edited ones apply without a restart
+                    # (the Preprocessor for the new ranges builds its color table on first use)
+                    for reloaded_name, reloaded_game in current_config.get("games", {}).items():
+                        if reloaded_name in games and reloaded_game.get("mask_hsv_ranges") != games[reloaded_name].get("mask_hsv_ranges"):
+                            games[reloaded_name]["mask_hsv_ranges"] = reloaded_game.get("mask_hsv_ranges")
+                            log(f"Mask color ranges changed for {reloaded_name}")
                     
                     detected_game = detect_game(games)
                     
@@ -1361,19 +1304,17 @@ def main_loop():
                         state["current_game"] = current_game_name
                         config["current_game"] = current_game_name
                         save_config(config)
-                        save_state(state)
+                        journal.record("switch", current_game_name, source="MANUAL", tick=state["tick"])
                         
                         # Get the manual game's death count
                         game_deaths = state.get("game_deaths", {}).get(current_game_name, 0)
-                        write_text(game_deaths, current_game_name)
-                        write_chat_info(current_game_name, game_deaths)
-                        write_total_deaths(state.get("total_deaths", 0))
+                        overlay.publish(state, current_game_name)
                         
                         # Update monitor and region settings
                         monitor_index = game_config.get("monitor_index", settings["monitor_index"])
                         max_valid_index = len(sct.monitors) - 1
                         if monitor_index < 0 or monitor_index > max_valid_index:
-                            log(f"WARNING: Monitor {monitor_index} invalid for {current_game_name} (valid: 0-{max_valid_index}). Using monitor 1.")
+                            log(f"WARNING: Monitor {monitor_index} invalid for {current_game_name} (valid: 0-{max_valid_index}). Using monitor 1.", "WARNING")
                             monitor_index = 1
                             game_config["monitor_index"] = monitor_index
                             config["games"][current_game_name] = game_config
@@ -1382,10 +1323,26 @@ def main_loop():
                         cached_window_rect = None
                         region = game_config.get("region", {})
                         keywords = game_config.get("keywords", ["YOUDIED"])
+                        # Compile keywords (+ fuzzy variants and exclusions) once per game instead of every tick
+                        keyword_matcher = get_keyword_matcher(keywords, fuzzy_matching, game_config.get("exclude_keywords"),
+                                                              game_config.get("max_edit_distance", 0.0))
                         tesseract_config = game_config.get("tesseract_config", "--oem 3 --psm 7")
                         tesseract_lang = game_config.get("tesseract_lang", "eng")
                         
                         # Reinitialize detection methods for manual game
+                        template_matcher = None
+                        last_template_verdict = False
+                        if template_enabled and TEMPLATE_MATCHER_AVAILABLE and TemplateMatcher:
+                            try:
+                                template_matcher = TemplateMatcher(game_config, current_game_name, BASE_DIR, log_callback=log)
+                                if template_matcher.is_enabled():
+                                    log(f"Template matching reinitialized for {current_game_name}")
+                                else:
+                                    template_matcher = None
+                            except Exception as e:
+                                log(f"Failed to reinitialize template matcher: {e}")
+                                template_matcher = None
+                        
                         if log_monitoring_enabled and LOG_MONITOR_AVAILABLE and LogMonitor:
                             try:
                                 log_monitor = LogMonitor(game_config, log_callback=log)
@@ -1403,7 +1360,8 @@ def main_loop():
                             try:
                                 manual_game_process = get_game_process(game_config)
                                 if manual_game_process:
-                                    memory_scanner = MemoryScanner(game_config, process=manual_game_process, log_callback=log)
+                                    memory_scanner = MemoryScanner(game_config, process=manual_game_process, log_callback=log,
+                                                                   process_index=PROCESS_INDEX)
                                     if memory_scanner.is_enabled():
                                         def memory_detection_callback():
                                             detection_flags["memory"] = True
@@ -1442,22 +1400,18 @@ def main_loop():
                             # Update config file
                             config["current_game"] = current_game_name
                             save_config(config)
-                            # Save state immediately so GUI picks up the change
-                            save_state(state)
+                            # Journal the switch immediately so GUI picks up the change
+                            journal.record("switch", current_game_name, source="AUTO", tick=state["tick"])
                             
                             # Get the new game's death count
                             game_deaths = state.get("game_deaths", {}).get(current_game_name, 0)
                             # Write updated text files with the new game's count
-                            write_text(game_deaths, current_game_name)
-                            # Write updated chat info
-                            write_chat_info(current_game_name, game_deaths)
-                            # Write updated total deaths
-                            write_total_deaths(state.get("total_deaths", 0))
+                            overlay.publish(state, current_game_name)
                             # Update monitor and region settings - validate monitor index
                             monitor_index = game_config.get("monitor_index", settings["monitor_index"])
                             max_valid_index = len(sct.monitors) - 1
                             if monitor_index < 0 or monitor_index > max_valid_index:
-                                log(f"WARNING: Monitor {monitor_index} invalid for {current_game_name} (valid: 0-{max_valid_index}). Using monitor 1.")
+                                log(f"WARNING: Monitor {monitor_index} invalid for {current_game_name} (valid: 0-{max_valid_index}). Using monitor 1.", "WARNING")
                                 monitor_index = 1
                                 game_config["monitor_index"] = monitor_index
                                 config["games"][current_game_name] = game_config
@@ -1466,10 +1420,26 @@ def main_loop():
                             cached_window_rect = None  # Reset window cache when game changes (will be detected on next check)
                             region = game_config.get("region", {})
                             keywords = game_config.get("keywords", ["YOUDIED"])
+                            # Compile keywords (+ fuzzy variants and exclusions) once per game instead of every tick
+                            keyword_matcher = get_keyword_matcher(keywords, fuzzy_matching, game_config.get("exclude_keywords"),
+                                                                  game_config.get("max_edit_distance", 0.0))
                             tesseract_config = game_config.get("tesseract_config", "--oem 3 --psm 7")
                             tesseract_lang = game_config.get("tesseract_lang", "eng")
                             
                             # Reinitialize detection methods for new game
+                            template_matcher = None
+                            last_template_verdict = False
+                            if template_enabled and TEMPLATE_MATCHER_AVAILABLE and TemplateMatcher:
+                                try:
+                                    template_matcher = TemplateMatcher(game_config, current_game_name, BASE_DIR, log_callback=log)
+                                    if template_matcher.is_enabled():
+                                        log(f"Template matching reinitialized for {current_game_name}")
+                                    else:
+                                        template_matcher = None
+                                except Exception as e:
+                                    log(f"Failed to reinitialize template matcher: {e}")
+                                    template_matcher = None
+                            
                             if log_monitoring_enabled and LOG_MONITOR_AVAILABLE and LogMonitor:
                                 try:
                                     log_monitor = LogMonitor(game_config, log_callback=log)
@@ -1488,7 +1458,8 @@ def main_loop():
                                 try:
                                     new_game_process = get_game_process(game_config)
                                     if new_game_process:
-                                        memory_scanner = MemoryScanner(game_config, process=new_game_process, log_callback=log)
+                                        memory_scanner = MemoryScanner(game_config, process=new_game_process, log_callback=log,
+                                                                       process_index=PROCESS_INDEX)
                                         if memory_scanner.is_enabled():
                                             # Use a proper closure that captures detection_flags
                                             def memory_detection_callback():
@@ -1527,22 +1498,18 @@ def main_loop():
                             # Update config file
                             config["current_game"] = current_game_name
                             save_config(config)
-                            # Save state immediately so GUI picks up the change
-                            save_state(state)
+                            # Journal the switch immediately so GUI picks up the change
+                            journal.record("switch", current_game_name, source="MANUAL", tick=state["tick"])
                             
                             # Get the manual game's death count
                             game_deaths = state.get("game_deaths", {}).get(current_game_name, 0)
                             # Write updated text files with the manual game's count
-                            write_text(game_deaths, current_game_name)
-                            # Write updated chat info
-                            write_chat_info(current_game_name, game_deaths)
-                            # Write updated total deaths
-                            write_total_deaths(state.get("total_deaths", 0))
+                            overlay.publish(state, current_game_name)
                             # Update monitor and region settings - validate monitor index
                             monitor_index = game_config.get("monitor_index", settings["monitor_index"])
                             max_valid_index = len(sct.monitors) - 1
                             if monitor_index < 0 or monitor_index > max_valid_index:
-                                log(f"WARNING: Monitor {monitor_index} invalid for {current_game_name} (valid: 0-{max_valid_index}). Using monitor 1.")
+                                log(f"WARNING: Monitor {monitor_index} invalid for {current_game_name} (valid: 0-{max_valid_index}). Using monitor 1.", "WARNING")
                                 monitor_index = 1
                                 game_config["monitor_index"] = monitor_index
                                 config["games"][current_game_name] = game_config
@@ -1551,10 +1518,26 @@ def main_loop():
                             cached_window_rect = None  # Reset window cache when game changes (will be detected on next check)
                             region = game_config.get("region", {})
                             keywords = game_config.get("keywords", ["YOUDIED"])
+                            # Compile keywords (+ fuzzy variants and exclusions) once per game instead of every tick
+                            keyword_matcher = get_keyword_matcher(keywords, fuzzy_matching, game_config.get("exclude_keywords"),
+                                                                  game_config.get("max_edit_distance", 0.0))
                             tesseract_config = game_config.get("tesseract_config", "--oem 3 --psm 7")
                             tesseract_lang = game_config.get("tesseract_lang", "eng")
                             
                             # Reinitialize detection methods for manual game
+                            template_matcher = None
+                            last_template_verdict = False
+                            if template_enabled and TEMPLATE_MATCHER_AVAILABLE and TemplateMatcher:
+                                try:
+                                    template_matcher = TemplateMatcher(game_config, current_game_name, BASE_DIR, log_callback=log)
+                                    if template_matcher.is_enabled():
+                                        log(f"Template matching reinitialized for {current_game_name}")
+                                    else:
+                                        template_matcher = None
+                                except Exception as e:
+                                    log(f"Failed to reinitialize template matcher: {e}")
+                                    template_matcher = None
+                            
                             if log_monitoring_enabled and LOG_MONITOR_AVAILABLE and LogMonitor:
                                 try:
                                     log_monitor = LogMonitor(game_config, log_callback=log)
@@ -1573,7 +1556,8 @@ def main_loop():
                                 try:
                                     manual_game_process = get_game_process(game_config)
                                     if manual_game_process:
-                                        memory_scanner = MemoryScanner(game_config, process=manual_game_process, log_callback=log)
+                                        memory_scanner = MemoryScanner(game_config, process=manual_game_process, log_callback=log,
+                                                                       process_index=PROCESS_INDEX)
                                         if memory_scanner.is_enabled():
                                             # Use a proper closure that captures detection_flags
                                             def memory_detection_callback():
@@ -1592,20 +1576,19 @@ def main_loop():
                             
                             log(f"Reverted to manually selected game: {current_game_name} | Monitor: {monitor_index} | Region: {region} | Deaths: {game_deaths}")
                     
-                    last_auto_detect_tick = state["tick"]
+                    last_auto_detect_at = tick_clock
                 
                 # Auto-detect monitor periodically (throttled to prevent race conditions)
                 # Only run after daemon has fully started to avoid race conditions during initialization
-                if daemon_started and state["tick"] - last_monitor_detect_tick >= auto_detect_interval:
+                if daemon_started and tick_clock - last_monitor_detect_at >= auto_detect_seconds:
                     try:
                         game_process = get_game_process(game_config)
                         if game_process:
                             # Update memory scanner if it needs a process and doesn't have one (or process changed)
                             if memory_scanning_enabled and memory_scanner:
                                 try:
-                                    # Check if we need to update the process
-                                    current_scanner_process = getattr(memory_scanner, 'process', None)
-                                    if not current_scanner_process or (hasattr(current_scanner_process, 'pid') and hasattr(game_process, 'pid') and current_scanner_process.pid != game_process.pid):
+                                    # The handle is shared: a different object means the game process changed
+                                    if getattr(memory_scanner, 'process', None) is not game_process:
                                         memory_scanner.update_process(game_process)
                                         log("Memory scanner: Updated with detected game process")
                                 except Exception as e:
@@ -1629,11 +1612,11 @@ def main_loop():
                         # Clear window cache on error to ensure we use monitor mode
                         cached_window_rect = None
                         log(f"Window detection error (using monitor mode): {e}")
-                    last_monitor_detect_tick = state["tick"]
+                    last_monitor_detect_at = tick_clock
                 
                 # Update window position periodically when in windowed mode (for responsive window movement)
                 # Check more frequently than monitor detection (every 10 ticks = ~3s) but not every tick for performance
-                if daemon_started and state["tick"] - last_window_update_tick >= window_update_interval:
+                if daemon_started and tick_clock - last_window_update_at >= window_update_seconds:
                     try:
                         game_process = get_game_process(game_config)
                         if game_process:
@@ -1660,43 +1643,116 @@ def main_loop():
                     except Exception:
                         # Silently fail - keep using cached position if available
                         pass
-                    last_window_update_tick = state["tick"]
+                    last_window_update_at = tick_clock
                 
                 try:
                     # Reset detection flags for this tick (except log/memory which are async)
                     detection_flags["ocr"] = False
                     detection_methods_active = []
+                    # Capture time of the frame behind the OCR/template verdict (cooldown uses grab time, not OCR finish time)
+                    frame_ts = None
+                    template_detected = False
+                    # Pipelined mode: consecutive positive frames completed this tick / no new result yet
+                    ocr_hits = 0
+                    ocr_pending = False
                     
                     # Save debug images periodically (for OCR)
                     save_debug = (state["tick"] % settings["debug_every_ticks"] == 0)
                     
-                    # Method 1: OCR Detection (if enabled)
-                    if ocr_enabled:
+                    # Method 1: OCR Detection (if enabled) - also captures/preprocesses for template matching
+                    if ocr_enabled or template_matcher:
                         try:
                             # Capture region using cached monitor index and window rect (if available)
                             # Window rect is passed for automatic windowed mode detection
-                            img_rgb = grab_region(sct, cached_monitor_index, region, game_config, cached_window_rect)
+                            capture_ts = time.time()
+                            frame = grab_region(sct, cached_monitor_index, region, game_config, cached_window_rect)
                             
                             if save_debug:
                                 try:
-                                    img_rgb.save(DEBUG_RAW)
+                                    frame_to_image(frame).save(DEBUG_RAW)
                                 except Exception as e:
                                     log(f"DEBUG RAW SAVE ERROR: {e}")
                             
-                            # Preprocess + OCR
-                            ocr_img, info = preprocess_for_ocr(img_rgb)
+                            fuzzy_matching = settings.get("fuzzy_ocr_matching", DEFAULT_SETTINGS.get("fuzzy_ocr_matching", True))
+                            # Frame-difference gate: unchanged region -> reuse the previous OCR verdict
+                            frame_changed = not frame_detector or frame_detector.has_changed(frame, current_game_name)
+                            ocr_img = None
                             
-                            if save_debug:
-                                try:
-                                    ocr_img.save(DEBUG_OCR)
-                                except Exception as e:
-                                    log(f"DEBUG OCR SAVE ERROR: {e}")
+                            # Method 4: Template matching on the preprocessed mask (no Tesseract)
+                            if template_matcher:
+                                if frame_changed:
+                                    ocr_img, info = preprocess_for_ocr(frame, glyph_height, game_config.get("mask_hsv_ranges"), log)
+                                    last_template_verdict = template_matcher.match(ocr_img, info)
+                                template_detected = last_template_verdict
+                                detection_flags["template"] = template_detected
+                                detection_methods_active.append("TEMPLATE")
+                                if template_detected:
+                                    frame_ts = capture_ts
                             
-                            clean = ocr_text(ocr_img, tesseract_config, tesseract_lang)
-                            fuzzy_matching = settings.get("fuzzy_ocr_matching", DEFAULT_SETTINGS.get("fuzzy_ocr_matching", True))
-                            ocr_detected = contains_keyword(clean, keywords, fuzzy_matching=fuzzy_matching)
-                            detection_flags["ocr"] = ocr_detected
-                            detection_methods_active.append("OCR")
+                            if not ocr_enabled:
+                                ocr_detected = False
+                            elif ocr_pipeline:
+                                # Hand the frame to the worker pool and pick up whatever has finished
+                                if frame_changed:
+                                    ocr_pipeline.submit(frame, capture_ts, {
+                                        "tesseract_config": tesseract_config,
+                                        "tesseract_lang": tesseract_lang,
+                                        "keywords": keywords,
+                                        "fuzzy_matching": fuzzy_matching,
+                                        "exclude_keywords": game_config.get("exclude_keywords"),
+                                        "max_edit_distance": game_config.get("max_edit_distance", 0.0),
+                                        "save_debug": save_debug,
+                                        "debug_path": DEBUG_OCR,
+                                        "glyph_height": glyph_height,
+                                        "mask_hsv_ranges": game_config.get("mask_hsv_ranges"),
+                                        "candidate": game_config.get("ocr_candidate"),
+                                    })
+                                ocr_results = ocr_pipeline.drain()
+                                candidate_frames += len(ocr_results)
+                                candidate_rejects += sum(1 for r in ocr_results if not r["candidate"])
+                                if ocr_results:
+                                    # Newest frame decides; trailing positive frames all count toward the streak
+                                    for result in reversed(ocr_results):
+                                        if not result["detected"]:
+                                            break
+                                        ocr_hits += 1
+                                    ocr_detected = ocr_hits > 0
+                                    frame_ts = ocr_results[-1]["capture_ts"]
+                                    last_ocr_verdict = ocr_results[-1]["detected"]
+                                elif not frame_changed:
+                                    ocr_detected = last_ocr_verdict
+                                    ocr_hits = 1 if ocr_detected else 0
+                                    frame_ts = capture_ts
+                                else:
+                                    ocr_detected = False
+                                    ocr_pending = True
+                            elif not frame_changed:
+                                ocr_detected = last_ocr_verdict
+                                frame_ts = capture_ts
+                            else:
+                                # Preprocess + OCR (reuse the template stage's preprocessing if it ran)
+                                if ocr_img is None:
+                                    ocr_img, info = preprocess_for_ocr(frame, glyph_height, game_config.get("mask_hsv_ranges"), log)
+                                
+                                if save_debug:
+                                    try:
+                                        save_ocr_debug_image(ocr_img, info, DEBUG_OCR)
+                                    except Exception as e:
+                                        log(f"DEBUG OCR SAVE ERROR: {e}")
+                                
+                                # Only pay for Tesseract when the mask looks like a banner
+                                candidate_frames += 1
+                                if is_death_candidate(info, game_config.get("ocr_candidate")):
+                                    clean = ocr_text(ocr_img, tesseract_config, tesseract_lang, engine=ocr_engine, log_callback=log)
+                                    ocr_detected = keyword_matcher.matches(clean)
+                                else:
+                                    candidate_rejects += 1
+                                    ocr_detected = False
+                                frame_ts = capture_ts
+                                last_ocr_verdict = ocr_detected
+                            if ocr_enabled:
+                                detection_flags["ocr"] = ocr_detected
+                                detection_methods_active.append("OCR")
                         except Exception as e:
                             log(f"OCR detection error: {e}")
                             ocr_detected = False
@@ -1724,11 +1780,11 @@ def main_loop():
                         memory_detected = False
                     
                     # Combine all detection methods - if ANY method detects, increment streak
-                    any_detected = ocr_detected or log_detected or memory_detected
+                    any_detected = ocr_detected or log_detected or memory_detected or template_detected
                     
                     # Update streak
                     if any_detected:
-                        state["streak"] = state["streak"] + 1
+                        state["streak"] = state["streak"] + max(1, ocr_hits)
                         # Log which method detected
                         methods = []
                         if ocr_detected:
@@ -1737,49 +1793,94 @@ def main_loop():
                             methods.append("LOG")
                         if memory_detected:
                             methods.append("MEMORY")
+                        if template_detected:
+                            methods.append("TEMPLATE")
                         detection_source = "+".join(methods) if methods else "UNKNOWN"
                     else:
-                        state["streak"] = 0
+                        # Pipelined OCR with no finished frame this tick: keep the streak as-is
+                        if not ocr_pending:
+                            state["streak"] = 0
                         detection_source = "NONE"
                     
                     # Log periodically
                     if state["tick"] % 10 == 0 or save_debug:
                         methods_str = "/".join(detection_methods_active) if detection_methods_active else "NONE"
+                        ocr_latency_str = f" OCR={ocr_engine.latency_summary()}" if ocr_engine else ""
+                        if ocr_pipeline:
+                            ocr_latency_str += f" Pipeline=[{ocr_pipeline.stats_summary()}]"
+                        if frame_detector:
+                            ocr_latency_str += f" Skip={frame_detector.skip_ratio():.0%}"
+                        if candidate_frames:
+                            ocr_latency_str += f" Rejected={candidate_rejects}/{candidate_frames}"
+                        ocr_latency_str += f" ProcScans=[{PROCESS_INDEX.stats_summary()}] HandleLookups={GAME_PROCESS.lookups}"
+                        ocr_latency_str += f" Window=[{WINDOW_TRACKER.stats_summary()}]"
+                        ocr_latency_str += f" Capture=[{CAPTURE_PLAN.stats_summary()}]"
+                        ocr_latency_str += f" Schedule=[{scheduler.stats_summary()}]"
+                        # Every debug_every_ticks at INFO, the ticks in between only at DEBUG
                         log(f"Tick={state['tick']} Game={current_game_name} Methods=[{methods_str}] "
                             f"Detected={any_detected} Source={detection_source} "
-                            f"Streak={state['streak']}/{settings['consecutive_hits']}")
+                            f"Streak={state['streak']}/{settings['consecutive_hits']}{ocr_latency_str}",
+                            "INFO" if save_debug else "DEBUG")
+                    
+                    # Memory counter ("pointer" pattern): one death per increment of the game's own
+                    # counter - exact, so no streak confirmation or cooldown. While it is live it is the
+                    # only source that counts; the other methods keep running but are only logged.
+                    counter_active = bool(memory_scanner) and memory_scanner.counter_ready()
+                    counter_deaths = memory_scanner.take_increments() if memory_scanner else 0
+                    if counter_deaths:
+                        state["game_deaths"].setdefault(current_game_name, 0)
+                        for _ in range(counter_deaths):
+                            state["total_deaths"] = int(state["total_deaths"]) + 1
+                            state["game_deaths"][current_game_name] = int(state["game_deaths"][current_game_name]) + 1
+                            journal.record("death", current_game_name, source="MEMORY_COUNTER",
+                                           tick=state["tick"], death_ts=now)
+                        state["last_death_ts"] = now
+                        overlay.publish(state, current_game_name)
+                        log(f"DEATH COUNTED (MEMORY_COUNTER x{counter_deaths}) -> Total: {state['total_deaths']} | "
+                            f"{current_game_name}: {state['game_deaths'][current_game_name]}")
                     
                     # Count death: stable detection + cooldown
-                    cooldown_passed = (now - float(state["last_death_ts"])) >= settings["cooldown_seconds"]
-                    if state["streak"] >= settings["consecutive_hits"] and cooldown_passed:
+                    # When OCR/template confirmed the death, time it by when the frame was captured
+                    death_ts = frame_ts if ((ocr_detected or template_detected) and frame_ts) else now
+                    cooldown_passed = (death_ts - float(state["last_death_ts"])) >= settings["cooldown_seconds"]
+                    if counter_active:
+                        state["streak"] = 0
+                    elif state["streak"] >= settings["consecutive_hits"] and cooldown_passed:
                         state["total_deaths"] = int(state["total_deaths"]) + 1
                         state["game_deaths"].setdefault(current_game_name, 0)
                         state["game_deaths"][current_game_name] = int(state["game_deaths"][current_game_name]) + 1
-                        state["last_death_ts"] = now
+                        state["last_death_ts"] = death_ts
                         state["streak"] = 0
                         
-                        # Save state and write text file
-                        save_state(state)
-                        # Write the current game's death count (not total)
-                        game_deaths = state["game_deaths"].get(current_game_name, 0)
-                        write_text(game_deaths, current_game_name)
-                        # Write updated chat info
-                        write_chat_info(current_game_name, game_deaths)
-                        # Write updated total deaths
-                        write_total_deaths(state["total_deaths"])
+                        # Journal the death (one line append) and hand the new counts to the overlay writer
+                        journal.record("death", current_game_name, source=detection_source,
+                                       tick=state["tick"], death_ts=death_ts)
+                        overlay.publish(state, current_game_name)
                         log(f"DEATH COUNTED ({detection_source}) -> Total: {state['total_deaths']} | "
                             f"{current_game_name}: {state['game_deaths'][current_game_name]}")
                     
-                    # Save state periodically (every 10 ticks to reduce I/O)
-                    if state["tick"] % 10 == 0:
-                        save_state(state)
+                    # Fold the journal into death_state.json every so often
+                    if journal.needs_compaction():
+                        journal.compact({"tick": state["tick"]})
                     
                 except Exception as e:
-                    log(f"Error in main loop: {e}")
-                    log(traceback.format_exc())
+                    log(f"Error in main loop: {e}", "ERROR")
+                    log(traceback.format_exc(), "ERROR")
                 
-                # Sleep at the end of each loop iteration (outside try-except so it always runs)
-                time.sleep(settings["tick_seconds"])
+                # Pick the next tick's rate: burst while a streak builds towards a count, idle while the game
+                # isn't running (games without process_names can't be checked, so they stay at the normal rate).
+                # A banner still on screen during the cooldown keeps the streak up but can't count, so no burst.
+                process_names = game_config.get("process_names")
+                in_cooldown = now - float(state["last_death_ts"]) < settings["cooldown_seconds"]
+                if 0 < state["streak"] < settings["consecutive_hits"] and not in_cooldown:
+                    scheduler.set_state(BURST)
+                elif process_names and not PROCESS_INDEX.find(process_names):
+                    scheduler.set_state(IDLE)
+                else:
+                    scheduler.set_state(NORMAL)
+                
+                # Sleep until the tick's deadline (outside try-except so it always runs)
+                scheduler.wait()
         finally:
             # Cleanup: Stop all detection methods when loop exits (even on exception)
             log("Cleaning up detection methods...")
@@ -1793,12 +1894,29 @@ def main_loop():
                     memory_scanner.stop()
                 except Exception:
                     pass
+            if ocr_pipeline:
+                try:
+                    ocr_pipeline.stop()
+                except Exception:
+                    pass
+            if ocr_engine:
+                try:
+                    ocr_engine.close()
+                except Exception:
+                    pass
+            # Leave a compact snapshot behind for the GUI and the next start
+            journal.compact({"tick": state["tick"]})
+            overlay.stop()
 
 
 # =========================
 # ENTRYPOINT
 # =========================
 if __name__ == "__main__":
+    # Required for the OCR worker processes if the daemon is ever frozen into an .exe
+    import multiprocessing
+    multiprocessing.freeze_support()
+    
     # Create lock file FIRST - before anything else
     if not acquire_lock():
         print("Another instance is already running. Exiting.")
@@ -0,0 +1,399 @@
+"""
+Persistent OCR Engine Module
+Keeps one initialized Tesseract instance alive for the whole daemon instead of
+spawning a new tesseract.exe (and reloading traineddata) for every OCR call.
+
+Uses the Tesseract C API (libtesseract) through ctypes. If the library cannot be
+loaded, falls back to the pytesseract subprocess path so OCR keeps working.
+
+Compatible with Windows 10/11 (UB-Mannheim Tesseract builds ship libtesseract-*.dll
+next to tesseract.exe) and Linux/macOS (libtesseract.so / .dylib).
+"""
+
+import os
+import sys
+import glob
+import time
+import shlex
+import ctypes
+import subprocess
+import ctypes.util
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+try:
+    import pytesseract
+    PYTESSERACT_AVAILABLE = True
+except ImportError:
+    PYTESSERACT_AVAILABLE = False
+    pytesseract = None
+
+# Tesseract engine modes (TessOcrEngineMode)
+OEM_DEFAULT = 3
+# Tesseract default when an image carries no DPI information (matches the CLI path)
+DEFAULT_SOURCE_RESOLUTION = 70
+
+
+def parse_tesseract_config(tesseract_config: str) -> Dict:
+    """
+    Parse a pytesseract-style config string into C API settings.
+
+    Args:
+        tesseract_config: Config string like "--oem 3 --psm 7 -c tessedit_char_whitelist=YOUDIE"
+
+    Returns:
+        Dict with 'oem', 'psm', 'dpi' (None if not set) and 'variables' (list of (name, value))
+    """
+    parsed = {"oem": OEM_DEFAULT, "psm": None, "dpi": None, "variables": []}
+    try:
+        tokens = shlex.split(tesseract_config or "", posix=(sys.platform != "win32"))
+    except ValueError:
+        tokens = (tesseract_config or "").split()
+
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        value = tokens[i + 1] if i + 1 < len(tokens) else None
+        if token == "--oem" and value is not None:
+            parsed["oem"] = int(value)
+            i += 2
+        elif token == "--psm" and value is not None:
+            parsed["psm"] = int(value)
+            i += 2
+        elif token == "--dpi" and value is not None:
+            parsed["dpi"] = int(value)
+            i += 2
+        elif token == "-c" and value is not None and "=" in value:
+            name, var_value = value.split("=", 1)
+            parsed["variables"].append((name, var_value))
+            i += 2
+        elif token.startswith("-c") and "=" in token[2:]:
+            name, var_value = token[2:].split("=", 1)
+            parsed["variables"].append((name, var_value))
+            i += 1
+        else:
+            # Unknown/unsupported option (e.g. --tessdata-dir, -l) - ignore
+            i += 1
+    return parsed
+
+
+def find_tesseract_executable() -> str:
+    """Find the Tesseract executable: 'tesseract' if it's on PATH, else a common install location."""
+    # Common Tesseract installation paths
+    common_paths = [
+        r"C:\Program Files\Tesseract-OCR\tesseract.exe",
+        r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
+        os.path.join(os.getenv('ProgramFiles', r'C:\Program Files'), 'Tesseract-OCR', 'tesseract.exe'),
+        os.path.join(os.getenv('ProgramFiles(x86)', r'C:\Program Files (x86)'), 'Tesseract-OCR', 'tesseract.exe'),
+    ]
+
+    # Check if tesseract is in PATH
+    try:
+        result = subprocess.run(['tesseract', '--version'],
+                                capture_output=True, text=True, timeout=2)
+        if result.returncode == 0:
+            return 'tesseract'  # Use command name if in PATH
+    except Exception:
+        pass
+
+    # Check common paths
+    for path in common_paths:
+        if os.path.exists(path):
+            return path
+
+    # Default fallback
+    return r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+
+
+def find_tesseract_library(tesseract_cmd: Optional[str] = None) -> Optional[str]:
+    """Find the libtesseract shared library, preferring the one next to tesseract_cmd."""
+    search_dirs = []
+    if tesseract_cmd:
+        if os.path.isabs(tesseract_cmd):
+            search_dirs.append(os.path.dirname(tesseract_cmd))
+        else:
+            import shutil
+            resolved = shutil.which(tesseract_cmd)
+            if resolved:
+                search_dirs.append(os.path.dirname(os.path.realpath(resolved)))
+
+    if sys.platform == "win32":
+        for directory in search_dirs:
+            matches = sorted(glob.glob(os.path.join(directory, "libtesseract*.dll")), reverse=True)
+            if matches:
+                return matches[0]
+        return ctypes.util.find_library("libtesseract-5") or ctypes.util.find_library("libtesseract-4")
+
+    found = ctypes.util.find_library("tesseract")
+    if found:
+        return found
+    for directory in search_dirs:
+        lib_dir = os.path.join(os.path.dirname(directory), "lib")
+        matches = sorted(glob.glob(os.path.join(lib_dir, "libtesseract.*")), reverse=True)
+        if matches:
+            return matches[0]
+    return None
+
+
+def find_tessdata_dir(tesseract_cmd: Optional[str] = None) -> Optional[str]:
+    """Find the tessdata directory (TESSDATA_PREFIX, or next to tesseract_cmd)."""
+    prefix = os.environ.get("TESSDATA_PREFIX")
+    if prefix and os.path.isdir(prefix):
+        return prefix
+    if tesseract_cmd and os.path.isabs(tesseract_cmd):
+        candidate = os.path.join(os.path.dirname(tesseract_cmd), "tessdata")
+        if os.path.isdir(candidate):
+            return candidate
+    # Let libtesseract use its compiled-in default
+    return None
+
+
+class TesseractCAPI:
+    """
+    Thin ctypes wrapper around a single TessBaseAPI handle.
+    Not thread-safe - OcrEngine serializes access with a lock.
+    """
+
+    def __init__(self, library_path: str):
+        if sys.platform == "win32" and hasattr(os, "add_dll_directory"):
+            # Leptonica and the other DLLs live next to libtesseract
+            lib_dir = os.path.dirname(os.path.abspath(library_path))
+            if os.path.isdir(lib_dir):
+                self._dll_dir = os.add_dll_directory(lib_dir)
+        self.lib = ctypes.CDLL(library_path)
+        lib = self.lib
+
+        lib.TessVersion.restype = ctypes.c_char_p
+        lib.TessVersion.argtypes = []
+        lib.TessBaseAPICreate.restype = ctypes.c_void_p
+        lib.TessBaseAPICreate.argtypes = []
+        lib.TessBaseAPIDelete.restype = None
+        lib.TessBaseAPIDelete.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIEnd.restype = None
+        lib.TessBaseAPIEnd.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIInit2.restype = ctypes.c_int
+        lib.TessBaseAPIInit2.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+        lib.TessBaseAPISetPageSegMode.restype = None
+        lib.TessBaseAPISetPageSegMode.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        lib.TessBaseAPISetVariable.restype = ctypes.c_int
+        lib.TessBaseAPISetVariable.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p]
+        lib.TessBaseAPISetImage.restype = None
+        lib.TessBaseAPISetImage.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int,
+                                            ctypes.c_int, ctypes.c_int, ctypes.c_int]
+        lib.TessBaseAPISetSourceResolution.restype = None
+        lib.TessBaseAPISetSourceResolution.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        lib.TessBaseAPIGetUTF8Text.restype = ctypes.c_void_p
+        lib.TessBaseAPIGetUTF8Text.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIClear.restype = None
+        lib.TessBaseAPIClear.argtypes = [ctypes.c_void_p]
+        lib.TessDeleteText.restype = None
+        lib.TessDeleteText.argtypes = [ctypes.c_void_p]
+
+        self.version = lib.TessVersion().decode("utf-8", errors="replace")
+        self.handle = None
+        self.dpi = DEFAULT_SOURCE_RESOLUTION
+
+    def init(self, datapath: Optional[str], lang: str, config: Dict):
+        """(Re)initialize the engine for a language and parsed config."""
+        self.end()
+        handle = self.lib.TessBaseAPICreate()
+        if not handle:
+            raise RuntimeError("TessBaseAPICreate failed")
+
+        datapath_bytes = datapath.encode("utf-8") if datapath else None
+        if self.lib.TessBaseAPIInit2(handle, datapath_bytes, lang.encode("utf-8"), int(config["oem"])) != 0:
+            self.lib.TessBaseAPIDelete(handle)
+            raise RuntimeError(f"TessBaseAPIInit2 failed (lang={lang}, datapath={datapath})")
+
+        if config["psm"] is not None:
+            self.lib.TessBaseAPISetPageSegMode(handle, int(config["psm"]))
+        for name, value in config["variables"]:
+            if not self.lib.TessBaseAPISetVariable(handle, name.encode("utf-8"), value.encode("utf-8")):
+                self.lib.TessBaseAPIDelete(handle)
+                raise RuntimeError(f"Unknown Tesseract variable: {name}")
+
+        self.dpi = config["dpi"] or DEFAULT_SOURCE_RESOLUTION
+        self.handle = handle
+
+    def image_to_string(self, img: Image.Image) -> str:
+        """Run recognition on a PIL image and return the UTF-8 text."""
+        if img.mode not in ("L", "RGB", "RGBA"):
+            img = img.convert("RGB")
+        bytes_per_pixel = {"L": 1, "RGB": 3, "RGBA": 4}[img.mode]
+        width, height = img.size
+        data = img.tobytes()
+
+        self.lib.TessBaseAPISetImage(self.handle, data, width, height,
+                                     bytes_per_pixel, width * bytes_per_pixel)
+        self.lib.TessBaseAPISetSourceResolution(self.handle, self.dpi)
+        text_ptr = self.lib.TessBaseAPIGetUTF8Text(self.handle)
+        if not text_ptr:
+            return ""
+        try:
+            return ctypes.string_at(text_ptr).decode("utf-8", errors="replace")
+        finally:
+            self.lib.TessDeleteText(text_ptr)
+            self.lib.TessBaseAPIClear(self.handle)
+
+    def end(self):
+        """Release the current TessBaseAPI handle."""
+        if self.handle:
+            try:
+                self.lib.TessBaseAPIEnd(self.handle)
+                self.lib.TessBaseAPIDelete(self.handle)
+            except Exception:
+                pass
+            self.handle = None
+
+
+class OcrEngine:
+    """
+    Long-lived OCR engine shared by the whole daemon.
+    Re-initializes Tesseract only when the language or config changes (game switch),
+    and tracks per-call latency so it can be compared to the pytesseract path.
+    """
+
+    def __init__(self, tesseract_cmd: Optional[str] = None, backend: str = "auto",
+                 log_callback: Optional[Callable[[str], None]] = None):
+        """
+        Initialize the OCR engine.
+
+        Args:
+            tesseract_cmd: Path to tesseract.exe (used to locate libtesseract and tessdata)
+            backend: "auto" (C API with pytesseract fallback), "capi" or "pytesseract"
+            log_callback: Optional callback function for logging
+        """
+        self.tesseract_cmd = tesseract_cmd
+        self.log_callback = log_callback or (lambda msg: None)
+        self.lock = threading.Lock()
+
+        self.capi = None
+        self.backend = "pytesseract"
+        self.current_key: Optional[Tuple[str, str]] = None
+        self.datapath = find_tessdata_dir(tesseract_cmd)
+
+        # Latency stats per backend: {backend: [calls, total_seconds]}
+        self.stats: Dict[str, List[float]] = {}
+
+        if backend in ("auto", "capi"):
+            library_path = find_tesseract_library(tesseract_cmd)
+            if library_path:
+                try:
+                    self.capi = TesseractCAPI(library_path)
+                    self.backend = "capi"
+                    self.log_callback(f"OcrEngine: Loaded Tesseract {self.capi.version} C API from {library_path}")
+                except Exception as e:
+                    self.log_callback(f"OcrEngine: Failed to load {library_path}: {e}. Using pytesseract.")
+                    self.capi = None
+            else:
+                self.log_callback("OcrEngine: libtesseract not found. Using pytesseract.")
+
+    def configure(self, tesseract_lang: str, tesseract_config: str):
+        """Initialize the persistent engine for lang/config (no-op if unchanged)."""
+        key = (tesseract_lang, tesseract_config)
+        if key == self.current_key:
+            return
+        self.current_key = key
+        if not self.capi:
+            return
+
+        start = time.perf_counter()
+        try:
+            self.capi.init(self.datapath, tesseract_lang, parse_tesseract_config(tesseract_config))
+            self.backend = "capi"
+            self.log_callback(f"OcrEngine: Initialized lang={tesseract_lang} config='{tesseract_config}' "
+                              f"in {(time.perf_counter() - start) * 1000:.0f}ms")
+        except Exception as e:
+            self.log_callback(f"OcrEngine: C API init failed ({e}). Using pytesseract for this game.")
+            self.capi.end()
+            self.backend = "pytesseract"
+
+    def image_to_string(self, img: Image.Image, tesseract_lang: str = "eng",
+                        tesseract_config: str = "") -> str:
+        """Run OCR on img, re-initializing only if lang/config changed."""
+        with self.lock:
+            self.configure(tesseract_lang, tesseract_config)
+
+            start = time.perf_counter()
+            if self.backend == "capi":
+                text = self.capi.image_to_string(img)
+            else:
+                text = pytesseract.image_to_string(img, lang=tesseract_lang, config=tesseract_config)
+            self._record(self.backend, time.perf_counter() - start)
+            return text
+
+    def _record(self, backend: str, elapsed: float):
+        entry = self.stats.setdefault(backend, [0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed
+
+    def log_comparison(self, img: Image.Image, tesseract_lang: str = "eng", tesseract_config: str = ""):
+        """
+        Time one C API call against one pytesseract call on the same image.
+
+        Spawns tesseract.exe, so it's only run from the self-check below, never per tick.
+        """
+        if not self.capi or not PYTESSERACT_AVAILABLE:
+            return
+        try:
+            start = time.perf_counter()
+            self.capi.image_to_string(img)
+            capi_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            pytesseract.image_to_string(img, lang=tesseract_lang, config=tesseract_config)
+            subprocess_ms = (time.perf_counter() - start) * 1000
+            self._record("pytesseract", subprocess_ms / 1000)
+            self.log_callback(f"OcrEngine: Latency C API {capi_ms:.1f}ms vs pytesseract {subprocess_ms:.1f}ms "
+                              f"({subprocess_ms / max(capi_ms, 0.001):.1f}x)")
+        except Exception as e:
+            self.log_callback(f"OcrEngine: Latency comparison failed: {e}")
+
+    def average_ms(self, backend: Optional[str] = None) -> float:
+        """Average per-call latency in milliseconds for a backend (default: active backend)."""
+        calls, total = self.stats.get(backend or self.backend, (0, 0.0))
+        return (total / calls) * 1000 if calls else 0.0
+
+    def latency_summary(self) -> str:
+        """Short latency summary for the periodic tick log."""
+        return f"{self.backend}:{self.average_ms():.1f}ms"
+
+    def close(self):
+        """Release the Tesseract handle."""
+        with self.lock:
+            if self.capi:
+                self.capi.end()
+            self.current_key = None
+
+
+if __name__ == "__main__":
+    # Compare per-call latency of the persistent C API engine and pytesseract.
+    # Usage: python ocr_engine.py [image] [iterations]
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    image_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(base_dir, "debug_capture.png")
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    lang = "eng"
+    config = "--oem 3 --psm 7 -c tessedit_char_whitelist=YOUDIEADFT"
+
+    tesseract_exe = find_tesseract_executable()
+    if PYTESSERACT_AVAILABLE:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_exe
+    image = Image.open(image_path).convert("L")
+    engine = OcrEngine(tesseract_exe, log_callback=print)
+    engine.image_to_string(image, lang, config)  # warm-up / init
+    engine.log_comparison(image, lang, config)
+
+    results = {}
+    for backend in ("capi", "pytesseract"):
+        if backend == "capi" and not engine.capi:
+            continue
+        engine.backend = backend
+        engine.stats.pop(backend, None)
+        for _ in range(iterations):
+            text = engine.image_to_string(image, lang, config)
+        results[backend] = engine.average_ms(backend)
+        print(f"{backend:12s} {results[backend]:8.1f} ms/call  text={text.strip()!r}")
+    if len(results) == 2:
+        print(f"speedup: {results['pytesseract'] / max(results['capi'], 0.001):.1f}x")
+    engine.close()
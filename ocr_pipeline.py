@@ -0,0 +1,211 @@
+"""
+Pipelined OCR Module
+Runs preprocessing + OCR + keyword matching in a process pool so a slow Tesseract
+call never delays the next screen capture.
+
+The daemon's tick thread is the capture producer: it grabs a frame, stamps it with
+the capture time and submits it. Frames wait in a small bounded queue; when OCR
+falls behind, older frames are dropped in favour of the newest one. Results carry
+the capture timestamp so streak/cooldown logic uses when the frame was grabbed,
+not when OCR finished.
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import ocr_processing
+
+try:
+    from ocr_engine import OcrEngine
+    OCR_ENGINE_AVAILABLE = True
+except ImportError:
+    OCR_ENGINE_AVAILABLE = False
+    OcrEngine = None
+
+# Per-process OCR engine (created once in each worker by _init_worker)
+_worker_engine = None
+# Worker messages not yet returned to the daemon (sent back with the next result)
+_worker_messages: List[str] = []
+
+
+def _init_worker(engine_backend: str, tesseract_exe: str):
+    """Process pool initializer - load the persistent OCR engine once per worker."""
+    global _worker_engine
+    ocr_processing.pytesseract.pytesseract.tesseract_cmd = tesseract_exe
+    if OCR_ENGINE_AVAILABLE and OcrEngine and engine_backend != "pytesseract":
+        try:
+            _worker_engine = OcrEngine(tesseract_exe, backend=engine_backend)
+        except Exception as e:
+            _worker_engine = None
+            _worker_messages.append(f"OcrPipeline: Worker {os.getpid()} could not load OcrEngine ({e}), "
+                                    f"using pytesseract")
+
+
+def _ocr_worker(frame, capture_ts: float, job: Dict) -> Dict:
+    """
+    Preprocess, candidate-check, OCR and keyword-match one frame (runs in a worker process).
+    Log messages are returned in the result's "log" list; workers never write debug.log themselves.
+    """
+    started = time.time()
+    log = _worker_messages.append
+    glyph_height = job.get("glyph_height", ocr_processing.DEFAULT_GLYPH_HEIGHT)
+    ocr_img, info = ocr_processing.preprocess_for_ocr(frame, glyph_height, job.get("mask_hsv_ranges"), log)
+    if job.get("save_debug") and job.get("debug_path"):
+        try:
+            ocr_processing.save_ocr_debug_image(ocr_img, info, job["debug_path"])
+        except Exception as e:
+            log(f"OcrPipeline: Failed to save debug image: {e}")
+    candidate = ocr_processing.is_death_candidate(info, job.get("candidate"))
+    if candidate:
+        clean = ocr_processing.ocr_text(ocr_img, job["tesseract_config"], job["tesseract_lang"],
+                                        engine=_worker_engine, log_callback=log)
+        detected = ocr_processing.contains_keyword(clean, job["keywords"], fuzzy_matching=job["fuzzy_matching"],
+                                                   exclude_keywords=job.get("exclude_keywords"),
+                                                   max_edit_distance=job.get("max_edit_distance", 0.0))
+    else:
+        clean = ""
+        detected = False
+    messages = list(_worker_messages)
+    _worker_messages.clear()
+    return {
+        "capture_ts": capture_ts,
+        "detected": detected,
+        "candidate": candidate,
+        "text": clean,
+        "info": info,
+        "ocr_seconds": time.time() - started,
+        "pid": os.getpid(),
+        "log": messages,
+    }
+
+
+class OcrPipeline:
+    """
+    Bounded capture queue feeding a process pool of OCR workers.
+    Only the newest frames are kept; stale frames are dropped instead of queued.
+    """
+
+    def __init__(self, workers: int = 2, queue_size: int = 1, engine_backend: str = "auto",
+                 tesseract_exe: str = "tesseract", log_callback: Optional[Callable[[str], None]] = None):
+        """
+        Initialize the OCR pipeline.
+
+        Args:
+            workers: Number of OCR worker processes (also the max frames in flight)
+            queue_size: Max frames waiting for a free worker (older ones are dropped)
+            engine_backend: OcrEngine backend used inside each worker
+            tesseract_exe: Tesseract executable (the daemon's TESSERACT_EXE; workers don't look it up)
+            log_callback: Optional callback function for logging
+        """
+        self.workers = max(1, int(workers))
+        self.log_callback = log_callback or (lambda msg: None)
+
+        self.pending: deque = deque(maxlen=max(1, int(queue_size)))
+        self.results: List[Dict] = []
+        self.in_flight = 0
+        self.last_delivered_ts = 0.0
+
+        # Counters for the periodic tick log
+        self.submitted = 0
+        self.dropped = 0
+        self.completed = 0
+
+        self.condition = threading.Condition()
+        self.stop_dispatch = False
+
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                            initargs=(engine_backend, tesseract_exe))
+        self.dispatch_thread = threading.Thread(target=self._dispatch_loop, daemon=True)
+        self.dispatch_thread.start()
+        self.log_callback(f"OcrPipeline: Started with {self.workers} worker process(es)")
+
+    def submit(self, frame, capture_ts: float, job: Dict):
+        """
+        Queue a captured frame for OCR.
+
+        Args:
+            frame: BGRA ndarray from grab_region
+            capture_ts: time.time() when the frame was grabbed
+            job: Dict with tesseract_config, tesseract_lang, keywords, fuzzy_matching,
+                 exclude_keywords, max_edit_distance, save_debug, debug_path, glyph_height,
+                 mask_hsv_ranges, candidate
+        """
+        with self.condition:
+            if len(self.pending) == self.pending.maxlen:
+                self.dropped += 1  # deque(maxlen) evicts the oldest frame
+            self.pending.append((frame, capture_ts, job))
+            self.submitted += 1
+            self.condition.notify()
+
+    def _dispatch_loop(self):
+        """Hand the newest queued frame to the pool whenever a worker is free."""
+        while True:
+            with self.condition:
+                while not self.stop_dispatch and (not self.pending or self.in_flight >= self.workers):
+                    self.condition.wait()
+                if self.stop_dispatch:
+                    return
+                frame, capture_ts, job = self.pending.pop()
+                # Anything older than the frame we're about to OCR is stale
+                self.dropped += len(self.pending)
+                self.pending.clear()
+                self.in_flight += 1
+            try:
+                future = self.executor.submit(_ocr_worker, frame, capture_ts, job)
+                future.add_done_callback(self._on_done)
+            except Exception as e:
+                self.log_callback(f"OcrPipeline: Submit failed: {e}")
+                with self.condition:
+                    self.in_flight -= 1
+
+    def _on_done(self, future):
+        """Collect a finished OCR job (called from the executor's thread)."""
+        try:
+            result = future.result()
+        except Exception as e:
+            result = None
+            self.log_callback(f"OcrPipeline: Worker error: {e}")
+        if result is not None:
+            for message in result.pop("log", ()):
+                self.log_callback(message)
+        with self.condition:
+            self.in_flight -= 1
+            if result is not None:
+                self.results.append(result)
+                self.completed += 1
+            self.condition.notify()
+
+    def drain(self) -> List[Dict]:
+        """
+        Return finished results in capture order.
+        Results older than one already delivered (out-of-order completions) are dropped.
+        """
+        with self.condition:
+            results, self.results = self.results, []
+        results.sort(key=lambda r: r["capture_ts"])
+        fresh = [r for r in results if r["capture_ts"] > self.last_delivered_ts]
+        self.dropped += len(results) - len(fresh)
+        if fresh:
+            self.last_delivered_ts = fresh[-1]["capture_ts"]
+        return fresh
+
+    def stats_summary(self) -> str:
+        """Short summary for the periodic tick log."""
+        return f"{self.completed}/{self.submitted} done, {self.dropped} dropped"
+
+    def stop(self):
+        """Stop dispatching and shut down the worker processes."""
+        with self.condition:
+            self.stop_dispatch = True
+            self.pending.clear()
+            self.condition.notify_all()
+        try:
+            # Queued jobs are cancelled; waits at most for the OCR calls already running
+            self.executor.shutdown(wait=True, cancel_futures=True)
+        except TypeError:
+            # cancel_futures requires Python 3.9+
+            self.executor.shutdown(wait=True)
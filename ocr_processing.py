@@ -0,0 +1,366 @@
+"""
+OCR Processing Module
+Preprocessing, death-candidate check, OCR and keyword matching for one captured frame.
+
+Shared by the daemon (serial OCR) and the OCR pipeline's worker processes. Importing it
+has no side effects - no Tesseract lookup, process index, window tracker or log file -
+so workers stay cheap to start; messages go to the caller's log_callback instead.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image, PngImagePlugin
+import pytesseract
+
+from keyword_matcher import get_keyword_matcher
+from color_mask import apply_mask_lut, get_mask_lut, ranges_key
+
+
+def frame_to_image(frame: np.ndarray) -> Image.Image:
+    """PIL image of a BGRA capture or a grayscale OCR image (for debug saves and Tesseract)."""
+    if frame.ndim == 3:
+        code = cv2.COLOR_BGRA2RGB if frame.shape[2] == 4 else cv2.COLOR_BGR2RGB
+        frame = cv2.cvtColor(frame, code)
+    return Image.fromarray(frame)
+
+
+def save_ocr_debug_image(ocr_img: np.ndarray, info: Dict, path: str):
+    """
+    Save the OCR input (debug_capture.png). The image may be a text crop, so the width of
+    the whole region at its scale goes into the PNG metadata for template recording.
+    """
+    pnginfo = PngImagePlugin.PngInfo()
+    if info.get("scale") and info.get("region_width"):
+        # Read back by template_matcher.capture_width()
+        pnginfo.add_text("capture_width", str(int(round(info["region_width"] * info["scale"]))))
+    frame_to_image(ocr_img).save(path, pnginfo=pnginfo)
+
+
+# Default thresholds for the per-game "ocr_candidate" stage (see is_death_candidate)
+DEFAULT_CANDIDATE = {
+    "enabled": True,
+    "min_coverage": 0.003,  # Fraction of the region covered by red/white mask pixels
+    "max_coverage": 0.6,  # Bright/red scenery filling the region is not a banner
+    "min_components": 2,  # Connected mask blobs (roughly: glyphs)
+    "max_components": 60,  # Speckle/noise produces many tiny blobs
+    "min_extent": 0.2,  # Horizontal span of the blobs as a fraction of region width
+}
+MIN_COMPONENT_AREA = 4  # Mask blobs smaller than this (pixels) are treated as noise
+
+# Text cropping before the OCR upscale (see preprocess_for_ocr)
+DEFAULT_GLYPH_HEIGHT = 40  # Glyph height (pixels) the crop is scaled to - Tesseract reads 30-40px text best
+GLYPH_SCALE_LIMITS = (0.5, 8.0)  # Min/max scale factor applied to the crop
+FULL_REGION_UPSCALE = 3.0  # Used when the mask has no usable components (no crop possible)
+
+
+def mask_shape_stats(mask: np.ndarray, min_component_area: int = MIN_COMPONENT_AREA,
+                     labels: Optional[np.ndarray] = None) -> Dict:
+    """
+    Connected-component statistics of a binary text mask.
+    Returns the number of non-trivial components, their horizontal extent (0.0-1.0 of mask width),
+    their bounding box (text_box: left, top, width, height) and typical glyph height.
+    labels is an optional int32 buffer of the mask's shape for the label image.
+    """
+    count, _, stats, _ = cv2.connectedComponentsWithStats(mask, labels=labels, connectivity=8)
+    # Row 0 is the background
+    blobs = stats[1:][stats[1:, cv2.CC_STAT_AREA] >= min_component_area]
+    if len(blobs) == 0:
+        return {"components": 0, "extent": 0.0}
+    left = int(blobs[:, cv2.CC_STAT_LEFT].min())
+    right = int((blobs[:, cv2.CC_STAT_LEFT] + blobs[:, cv2.CC_STAT_WIDTH]).max())
+    top = int(blobs[:, cv2.CC_STAT_TOP].min())
+    bottom = int((blobs[:, cv2.CC_STAT_TOP] + blobs[:, cv2.CC_STAT_HEIGHT]).max())
+    # Glyph height: median of the taller blobs, so specks and punctuation don't drag it down
+    heights = blobs[:, cv2.CC_STAT_HEIGHT]
+    glyph_height = int(np.median(heights[heights >= heights.max() / 2]))
+    return {"components": int(len(blobs)), "extent": (right - left) / max(1, mask.shape[1]),
+            "text_box": (left, top, right - left, bottom - top), "glyph_height": glyph_height}
+
+
+def text_crop(info: Dict, shape: Tuple[int, int], glyph_height: int) -> Optional[Tuple[Tuple[int, int, int, int], float]]:
+    """
+    Crop box around the mask's components (half a glyph of margin) and the scale that
+    brings their glyphs to glyph_height pixels.
+    
+    Returns:
+        ((left, top, width, height), scale), or None if the mask has no components
+    """
+    box = info.get("text_box")
+    source_glyph = info.get("glyph_height", 0)
+    if not box or source_glyph <= 0:
+        return None
+    left, top, width, height = box
+    margin = max(4, source_glyph // 2)
+    x0, y0 = max(0, left - margin), max(0, top - margin)
+    x1, y1 = min(shape[1], left + width + margin), min(shape[0], top + height + margin)
+    low, high = GLYPH_SCALE_LIMITS
+    scale = min(high, max(low, glyph_height / source_glyph))
+    return (x0, y0, x1 - x0, y1 - y0), scale
+
+
+def is_death_candidate(info: Dict, candidate_config: Optional[Dict]) -> bool:
+    """
+    Decide whether a preprocessed frame plausibly contains a death banner, so OCR is worth running.
+    
+    Args:
+        info: Info dict from preprocess_for_ocr (coverage, components, extent)
+        candidate_config: Per-game "ocr_candidate" thresholds (None/disabled = always OCR)
+    """
+    if not candidate_config or not candidate_config.get("enabled", True):
+        return True
+    cfg = {**DEFAULT_CANDIDATE, **candidate_config}
+    coverage = info.get("coverage", 0.0)
+    components = info.get("components", 0)
+    extent = info.get("extent", 0.0)
+    return (cfg["min_coverage"] <= coverage <= cfg["max_coverage"] and
+            cfg["min_components"] <= components <= cfg["max_components"] and
+            extent >= cfg["min_extent"])
+
+
+def small_region_scale(width: int, height: int) -> float:
+    """
+    Upscale factor for small captures before preprocessing (1.0 = none).
+    Very small regions are doubled to reduce pixelation, then anything still under
+    300x150 is scaled up to it - applied as one resize.
+    """
+    scale = 1.0
+    if width < 200 or height < 100:
+        scale = 2.0
+    scaled_width, scaled_height = width * scale, height * scale
+    if scaled_height < 150 or scaled_width < 300:
+        scale *= max(300 / scaled_width, 150 / scaled_height)
+    return scale
+
+
+# Smaller morphology kernel for less aggressive cleaning (preserves text better)
+MORPH_KERNEL = np.ones((2, 2), np.uint8)
+SHARPEN_KERNEL = np.array([[-1, -1, -1],
+                           [-1,  9, -1],
+                           [-1, -1, -1]], dtype=np.float32)
+
+
+class Preprocessor:
+    """
+    preprocess_for_ocr() with its working images kept between frames.
+    Every OpenCV call writes into a preallocated buffer (dst=); a buffer is only
+    reallocated when the size it needs changes (new capture size, different crop size).
+    The returned image is one of these buffers: valid until the next process() call.
+    """
+    
+    def __init__(self, glyph_height: int = DEFAULT_GLYPH_HEIGHT, mask_hsv_ranges: Optional[List] = None):
+        """
+        Args:
+            glyph_height: Target glyph height in the output image
+            mask_hsv_ranges: HSV ranges counted as banner text (None = color_mask defaults)
+        """
+        self.glyph_height = glyph_height
+        # Color -> mask lookup table, shared by every Preprocessor with the same ranges
+        self.mask_lut = get_mask_lut(mask_hsv_ranges)
+        self.buffers: Dict[str, np.ndarray] = {}
+        self.allocations = 0
+    
+    def _buffer(self, name: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """Named working buffer of this shape (reused while the shape stays the same)."""
+        buf = self.buffers.get(name)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self.buffers[name] = buf
+            self.allocations += 1
+        return buf
+    
+    def _upscale(self, img_cv: np.ndarray, factor: float = FULL_REGION_UPSCALE) -> np.ndarray:
+        """Upscale image for better OCR quality and reduced pixelation."""
+        # Same output size OpenCV derives from fx/fy (rounded), so the buffer fits
+        size = (int(round(img_cv.shape[1] * factor)), int(round(img_cv.shape[0] * factor)))
+        # Use LANCZOS interpolation for better quality (slower but much better for text)
+        interpolation = cv2.INTER_LANCZOS4 if factor > 1.0 else cv2.INTER_AREA
+        return cv2.resize(img_cv, None, dst=self._buffer("out", (size[1], size[0])), fx=factor, fy=factor,
+                          interpolation=interpolation)
+    
+    def process(self, frame: np.ndarray) -> Tuple[np.ndarray, Dict]:
+        """
+        Preprocess image for OCR with multiple fallback strategies.
+        The red/white text mask is cropped to its components and only that area is upscaled,
+        by whatever factor brings the glyphs to glyph_height pixels - so the Tesseract input
+        stays about the same size whatever the monitor resolution.
+        
+        Args:
+            frame: BGRA capture from grab_region (BGR also accepted)
+        
+        Returns:
+            (grayscale uint8 image, dark text on light background; info dict). info["scale"] is
+            output pixels per capture pixel, info["crop"] the cropped box in capture pixels.
+        """
+        height, width = frame.shape[:2]
+        # The mask lookup reads each pixel as one uint32, so work on a contiguous BGRA frame
+        if frame.shape[2] == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2BGRA, dst=self._buffer("bgra", (height, width, 4)))
+        elif not frame.flags.c_contiguous:
+            contiguous = self._buffer("bgra", (height, width, 4))
+            np.copyto(contiguous, frame)
+            frame = contiguous
+        
+        # If image is very small, upscale it first before processing
+        scale_factor = small_region_scale(width, height)
+        if scale_factor != 1.0:
+            size = (int(width * scale_factor), int(height * scale_factor))
+            frame = cv2.resize(frame, size, dst=self._buffer("frame_scaled", (size[1], size[0], 4)),
+                               interpolation=cv2.INTER_LANCZOS4)
+        shape = frame.shape[:2]
+        
+        # Strategy 1: Red ("YOU DIED") / white (Sekiro) text mask, one table lookup per pixel
+        mask = apply_mask_lut(frame, self.mask_lut, out=self._buffer("mask", shape),
+                              index=self._buffer("mask_index", shape, np.uint32))
+        part = self._buffer("mask_part", shape)
+        
+        # Clean noise with better morphology operations
+        cv2.morphologyEx(mask, cv2.MORPH_OPEN, MORPH_KERNEL, dst=part, iterations=1)
+        cv2.morphologyEx(part, cv2.MORPH_CLOSE, MORPH_KERNEL, dst=mask, iterations=1)
+        # Gentle dilation to connect text characters
+        cv2.dilate(mask, MORPH_KERNEL, dst=part, iterations=1)
+        mask = part
+        
+        white = int(cv2.countNonZero(mask))
+        total = int(mask.shape[0] * mask.shape[1])
+        coverage = white / max(1, total)
+        
+        info = {"mode": "HSV_RED_WHITE", "coverage": coverage, "region_width": width}
+        info.update(mask_shape_stats(mask, labels=self._buffer("labels", shape, np.int32)))
+        
+        # Use red/white mask if coverage is reasonable (at least 0.3% of image - lowered threshold)
+        if coverage >= 0.003:
+            # Crop to the text first, so sharpening and upscaling only touch that area
+            crop = text_crop(info, mask.shape, self.glyph_height)
+            factor = FULL_REGION_UPSCALE
+            if crop:
+                (x, y, w, h), factor = crop
+                mask = mask[y:y + h, x:x + w]
+                info["crop"] = tuple(int(v / scale_factor) for v in (x, y, w, h))
+            info["scale"] = scale_factor * factor
+            # Invert mask: white text on black background -> black text on white
+            inv = cv2.bitwise_not(mask, dst=self._buffer("inv", mask.shape))
+            # Apply slight sharpening to improve text clarity
+            sharp = cv2.filter2D(inv, -1, SHARPEN_KERNEL, dst=self._buffer("sharp", mask.shape))
+            return self._upscale(sharp, factor), info
+        
+        # Strategy 2: Grayscale with adaptive threshold (works for any text color)
+        # This fallback ensures we NEVER get a black image - adaptive threshold always produces output
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY, dst=self._buffer("gray", shape))
+        # Use less blur to preserve text details
+        gray_blur = cv2.GaussianBlur(gray, (3, 3), 0, dst=self._buffer("gray_blur", shape))
+        # Apply unsharp mask for better text clarity
+        gaussian = cv2.GaussianBlur(gray_blur, (0, 0), 2.0, dst=self._buffer("gaussian", shape))
+        unsharp = cv2.addWeighted(gray_blur, 1.5, gaussian, -0.5, 0, dst=gray)
+        
+        thr_adapt = cv2.adaptiveThreshold(
+            unsharp, 255,
+            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+            cv2.THRESH_BINARY,
+            31, 5,
+            dst=gaussian
+        )
+        # Invert: make text dark on light background (Tesseract prefers dark text on light)
+        thr_adapt_inv = cv2.bitwise_not(thr_adapt, dst=gray_blur)
+        # Apply slight sharpening to improve text clarity
+        sharp = cv2.filter2D(thr_adapt_inv, -1, SHARPEN_KERNEL, dst=self._buffer("sharp_full", shape))
+        info["mode"] = "ADAPTIVE_THRESHOLD"
+        info["coverage"] = 0.0  # Set coverage for consistency
+        info["scale"] = scale_factor * FULL_REGION_UPSCALE
+        return self._upscale(sharp), info
+
+
+# Preprocessors built so far in this process (daemon or OCR worker), keyed by glyph height and mask ranges
+_preprocessor_cache: Dict[Tuple, Preprocessor] = {}
+# Malformed mask_hsv_ranges values already reported (logged once each)
+_invalid_mask_ranges = set()
+
+
+def get_preprocessor(glyph_height: int = DEFAULT_GLYPH_HEIGHT, mask_hsv_ranges: Optional[List] = None,
+                     log_callback: Optional[Callable[[str], None]] = None) -> Preprocessor:
+    """
+    Return the reusable Preprocessor for this glyph height and mask ranges, building it on first use.
+    Edited ranges (config reload) get a new Preprocessor and mask table; malformed ones fall back to the
+    defaults (reported once to log_callback).
+    """
+    try:
+        ranges = ranges_key(mask_hsv_ranges)
+    except (TypeError, ValueError) as e:
+        if repr(mask_hsv_ranges) not in _invalid_mask_ranges:
+            _invalid_mask_ranges.add(repr(mask_hsv_ranges))
+            if log_callback:
+                log_callback(f"Invalid mask_hsv_ranges {mask_hsv_ranges!r} ({e}), using defaults")
+        ranges = ranges_key(None)
+    key = (glyph_height, ranges)
+    preprocessor = _preprocessor_cache.get(key)
+    if preprocessor is None:
+        preprocessor = Preprocessor(glyph_height, [list(map(list, bounds)) for bounds in ranges])
+        _preprocessor_cache[key] = preprocessor
+    return preprocessor
+
+
+def preprocess_for_ocr(frame: np.ndarray, glyph_height: int = DEFAULT_GLYPH_HEIGHT,
+                       mask_hsv_ranges: Optional[List] = None,
+                       log_callback: Optional[Callable[[str], None]] = None) -> Tuple[np.ndarray, Dict]:
+    """
+    Preprocess a capture for OCR (see Preprocessor.process).
+    The returned image is a reused buffer, valid until the next call.
+    """
+    return get_preprocessor(glyph_height, mask_hsv_ranges, log_callback).process(frame)
+
+
+def ocr_text(img_for_ocr, tesseract_config: str, tesseract_lang: str = "eng", engine=None,
+             log_callback: Optional[Callable[[str], None]] = None) -> str:
+    """
+    Extract text from image using OCR. Supports multiple languages including Japanese.
+    Uses the persistent OcrEngine if provided, otherwise spawns tesseract via pytesseract
+    (the caller sets pytesseract.pytesseract.tesseract_cmd).
+    img_for_ocr is the preprocess_for_ocr output (or any PIL image).
+    """
+    try:
+        if isinstance(img_for_ocr, np.ndarray):
+            img_for_ocr = Image.fromarray(img_for_ocr)
+        if engine:
+            text = engine.image_to_string(img_for_ocr, tesseract_lang, tesseract_config)
+        else:
+            text = pytesseract.image_to_string(img_for_ocr, lang=tesseract_lang, config=tesseract_config)
+        # For English-only, keep alphanumeric (to capture OCR variations like Y0U, D13D) and uppercase
+        # For Japanese/multi-language, keep all characters including Japanese, Chinese, etc. but remove spaces
+        if tesseract_lang == "eng" or (tesseract_lang.startswith("eng") and "+" not in tesseract_lang):
+            # Keep alphanumeric to capture OCR misreadings (letters + numbers like Y0U, D13D)
+            clean = "".join(c for c in text.upper() if c.isalnum())
+        else:
+            # For Japanese/multi-language: keep all characters including Japanese, Chinese, etc.
+            # Remove spaces and newlines, but keep all other characters
+            clean = "".join(c for c in text if not c.isspace())
+        return clean
+    except Exception as e:
+        if log_callback:
+            log_callback(f"OCR error: {e}")
+        return ""
+
+
+def contains_keyword(clean_text: str, keywords: List[str], fuzzy_matching: bool = True,
+                     exclude_keywords: Optional[List[str]] = None, max_edit_distance: float = 0.0) -> bool:
+    """
+    Check if cleaned text contains any keyword.
+    
+    Args:
+        clean_text: The OCR-processed text to search in
+        keywords: List of keywords to search for
+        fuzzy_matching: If True, use fuzzy OCR matching (handles misreadings like O->0, I->1, etc.)
+                       If False, use direct matching only (faster, but requires exact keyword matches)
+        exclude_keywords: Text that vetoes a match (default: enemy felled / target destroyed)
+        max_edit_distance: In fuzzy mode, weighted edit distance still counted as a match (0 = off);
+                           confusable substitutions cost 0.25, other edits 1.0
+    
+    The keywords are compiled once into a KeywordMatcher (cached per keyword list), so repeated
+    calls with the same game's keywords cost a single regex pass over clean_text.
+    
+    Fuzzy matching supports OCR variations where letters can be misread as numbers:
+    - O <-> 0 (zero), I <-> 1 (one), E <-> 3 (three)
+    - A <-> 4 (four), S <-> 5 (five), G <-> 6 (six)
+    - T <-> 7 (seven), B <-> 8 (eight), Z <-> 2 (two)
+    """
+    return get_keyword_matcher(keywords, fuzzy_matching, exclude_keywords, max_edit_distance).matches(clean_text)
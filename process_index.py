@@ -0,0 +1,282 @@
+"""
+Process Index Module
+One shared, incrementally updated view of the process table for everything that asks
+"is the game running?".
+
+Each refresh only lists PIDs (psutil.pids(), a single cheap call) and diffs them
+against the previous set: names are looked up for newly appeared PIDs only, and
+exited PIDs are dropped. Lookups go through a dict from normalized process name to
+PIDs. When a PID of a watched game appears or the game's last PID exits, a
+game-started / game-exited event is queued for the daemon loop.
+"""
+
+import time
+import threading
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import psutil
+
+
+def normalize_process_name(name: str) -> str:
+    """Lowercase and strip .exe, the form process names are matched in."""
+    name = (name or "").lower()
+    if name.endswith(".exe"):
+        name = name[:-4]
+    return name
+
+
+class ProcessIndex:
+    """
+    Incremental name -> PIDs index of running processes, safe to share between threads
+    (the daemon loop and the memory scanner thread).
+    """
+
+    def __init__(self, max_age: float = 1.0, log_callback: Optional[Callable[[str], None]] = None):
+        """
+        Initialize the index (the first query triggers the first, full scan).
+
+        Args:
+            max_age: Seconds between PID-set diffs; queries in between use the current view
+            log_callback: Optional callback function for logging
+        """
+        self.max_age = float(max_age)
+        self.log_callback = log_callback or (lambda msg: None)
+        self.lock = threading.RLock()
+
+        self.name_by_pid: Dict[int, str] = {}
+        self.by_name: Dict[str, List[int]] = {}
+        self.scanned_at = 0.0
+        # Normalized names per configured process_names list
+        self._normalized: Dict[Tuple[str, ...], Tuple[Tuple[str, str], ...]] = {}
+        # psutil.Process objects handed out, reused while their PID is alive
+        self._processes: Dict[int, psutil.Process] = {}
+
+        # Watched process names -> game, and the resulting started/exited events
+        self.watched: Dict[str, str] = {}
+        self.events: List[Dict] = []
+
+        # Diff timestamps over the last minute, for scans_per_minute(); name lookups in total
+        self.scan_times: deque = deque()
+        self.total_scans = 0
+        self.name_lookups = 0
+
+    def watch(self, games: Dict):
+        """Raise started/exited events for the process names of these games."""
+        with self.lock:
+            self.watched = {}
+            for game_name, game_config in games.items():
+                for _, normalized in self._names(game_config.get("process_names", [])):
+                    self.watched.setdefault(normalized, game_name)
+
+    def _lookup_name(self, pid: int) -> Optional[str]:
+        try:
+            self.name_lookups += 1
+            return normalize_process_name(psutil.Process(pid).name())
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+
+    def _add(self, pid: int, name: str, initial: bool):
+        self.name_by_pid[pid] = name
+        self.by_name.setdefault(name, []).append(pid)
+        game = self.watched.get(name)
+        if game and not initial:
+            self.events.append({"type": "started", "game": game, "process": name, "pid": pid})
+
+    def _remove(self, pid: int):
+        name = self.name_by_pid.pop(pid)
+        self._processes.pop(pid, None)
+        pids = self.by_name.get(name)
+        if pids:
+            pids.remove(pid)
+            if not pids:
+                del self.by_name[name]
+                game = self.watched.get(name)
+                if game:
+                    self.events.append({"type": "exited", "game": game, "process": name, "pid": pid})
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Diff the PID set if the view is older than max_age.
+
+        Returns:
+            True if the process table was checked
+        """
+        with self.lock:
+            now = time.time()
+            if not force and self.scanned_at and now - self.scanned_at < self.max_age:
+                return False
+            try:
+                if not self.scanned_at:
+                    # First scan: names for everything in one pass (from scratch, in case an earlier
+                    # attempt failed part-way and left some PIDs behind)
+                    self.name_by_pid.clear()
+                    self.by_name.clear()
+                    for proc in psutil.process_iter(['name', 'pid']):
+                        try:
+                            self._add(proc.info['pid'], normalize_process_name(proc.info['name']), initial=True)
+                        except (psutil.NoSuchProcess, psutil.AccessDenied, TypeError):
+                            pass
+                else:
+                    current = set(psutil.pids())
+                    known = set(self.name_by_pid)
+                    for pid in known - current:
+                        self._remove(pid)
+                    for pid in current - known:
+                        # Unreadable names are kept as "" (like the first scan) so the PID is looked up only once
+                        name = self._lookup_name(pid)
+                        self._add(pid, name or "", initial=False)
+            except Exception as e:
+                self.log_callback(f"Error getting processes: {e}")
+                return False
+            self.scanned_at = now
+            self.total_scans += 1
+            self.scan_times.append(now)
+            return True
+
+    def poll_events(self) -> List[Dict]:
+        """Refresh if due and return the game started/exited events seen since the last call."""
+        with self.lock:
+            self.refresh()
+            events, self.events = self.events, []
+            return events
+
+    def _names(self, process_names: Iterable[str]) -> Tuple[Tuple[str, str], ...]:
+        """(configured name, normalized name) pairs, normalized once per list."""
+        key = tuple(process_names)
+        names = self._normalized.get(key)
+        if names is None:
+            names = tuple((name, normalize_process_name(name)) for name in key)
+            self._normalized[key] = names
+        return names
+
+    def names(self) -> List[str]:
+        """Normalized names of all running processes."""
+        with self.lock:
+            self.refresh()
+            return list(self.by_name)
+
+    def find(self, process_names: Iterable[str]) -> Optional[Tuple[str, int]]:
+        """
+        First running process matching any of the configured names.
+
+        Returns:
+            (configured name, PID), or None if none is running
+        """
+        with self.lock:
+            self.refresh()
+            for name, normalized in self._names(process_names):
+                pids = self.by_name.get(normalized)
+                if pids:
+                    return name, pids[0]
+        return None
+
+    def get_process(self, process_names: Iterable[str]) -> Optional[psutil.Process]:
+        """psutil.Process for the first running process matching the configured names."""
+        match = self.find(process_names)
+        if not match:
+            return None
+        pid = match[1]
+        with self.lock:
+            process = self._processes.get(pid)
+            if process is None:
+                try:
+                    process = psutil.Process(pid)
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    return None
+                self._processes[pid] = process
+            return process
+
+    def detect_game(self, games: Dict) -> Optional[Tuple[str, str]]:
+        """
+        First configured game with a running process.
+
+        Returns:
+            (game name, matched process name), or None
+        """
+        for game_name, game_config in games.items():
+            process_names = game_config.get("process_names", [])
+            if not process_names:
+                continue
+            match = self.find(process_names)
+            if match:
+                return game_name, match[0]
+        return None
+
+    def has_pid(self, pid: int) -> bool:
+        """Check if a PID is running (as of the last diff, refreshing a stale view first)."""
+        with self.lock:
+            self.refresh()
+            return pid in self.name_by_pid
+
+    def scans_per_minute(self) -> int:
+        """Process-table checks in the last 60 seconds."""
+        with self.lock:
+            cutoff = time.time() - 60.0
+            while self.scan_times and self.scan_times[0] < cutoff:
+                self.scan_times.popleft()
+            return len(self.scan_times)
+
+    def stats_summary(self) -> str:
+        """Short summary for the periodic tick log."""
+        return f"{self.scans_per_minute()}/min, {self.name_lookups} name lookups"
+
+
+class GameProcessHandle:
+    """
+    The active game's psutil.Process, kept between ticks and re-validated instead of
+    looked up again. A handle that fails validation (exited, or PID reused by another
+    process) is dropped and the index is asked for the game's current process.
+    """
+
+    def __init__(self, index: ProcessIndex):
+        """
+        Initialize the handle.
+
+        Args:
+            index: ProcessIndex used when the cached process is missing or stale
+        """
+        self.index = index
+        self.process_names: Tuple[str, ...] = ()
+        self.process: Optional[psutil.Process] = None
+        self.create_time: Optional[float] = None
+        self.lookups = 0
+
+    def _valid(self) -> bool:
+        # is_running() re-reads the PID's create time and compares it with the one
+        # psutil.Process recorded, so a reused PID counts as not running
+        try:
+            return self.process.is_running() and self.process.create_time() == self.create_time
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return False
+
+    def get(self, process_names: Iterable[str]) -> Optional[psutil.Process]:
+        """
+        Process for the game with these process names (the cached one while it is valid).
+
+        Returns:
+            psutil.Process, or None if the game isn't running
+        """
+        key = tuple(process_names)
+        if key != self.process_names:
+            self.process_names = key
+            self.invalidate()
+        if self.process is not None and self._valid():
+            return self.process
+        self.invalidate()
+        if not key:
+            return None
+        self.lookups += 1
+        process = self.index.get_process(key)
+        if process is not None:
+            try:
+                self.create_time = process.create_time()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                return None
+            self.process = process
+        return process
+
+    def invalidate(self):
+        """Drop the cached process (next get() asks the index)."""
+        self.process = None
+        self.create_time = None
@@ -6,7 +6,8 @@ Works with any installation location.
 
 import os
 import sys
-import json
+
+import death_journal
 
 # Get the directory where this script is located (works for both .exe and .py)
 def get_base_dir():
@@ -32,30 +33,15 @@ def reset_deaths():
     print()
     
     # Reset state JSON
-    if os.path.exists(STATE_JSON):
+    if os.path.exists(STATE_JSON) or os.path.exists(death_journal.journal_path(STATE_JSON)):
         try:
-            # Load existing state to preserve game list structure
-            with open(STATE_JSON, "r", encoding="utf-8") as f:
-                old_state = json.load(f)
-            
-            # Create new state with zeros but preserve game structure
-            new_state = {
-                "total_deaths": 0,
-                "game_deaths": {},
-                "tick": old_state.get("tick", 0),  # Keep tick count
-                "streak": 0,
-                "last_death_ts": 0.0,
-                "current_game": old_state.get("current_game", None),
-            }
-            
-            # Preserve game names from old state, set all to 0
-            if "game_deaths" in old_state:
-                for game_name in old_state["game_deaths"].keys():
-                    new_state["game_deaths"][game_name] = 0
-            
-            # Write new state
-            with open(STATE_JSON, "w", encoding="utf-8") as f:
-                json.dump(new_state, f, indent=2)
+            # Journal a reset of every game (keeps game names and tick), then fold it into death_state.json
+            death_journal.append_event(STATE_JSON, "reset", source="RESET")
+            try:
+                new_state = death_journal.compact(STATE_JSON)
+            except death_journal.JournalBusy:
+                # The daemon is compacting; the reset is journaled and applies either way
+                new_state = death_journal.load_state(STATE_JSON)
             print(f"✓ Reset state file: {len(new_state['game_deaths'])} games reset to 0")
         except Exception as e:
             print(f"✗ Error resetting state file: {e}")
@@ -11,6 +11,8 @@ import os
 import sys
 import json
 
+import death_journal
+
 # Get the directory where this script is located
 def get_base_dir():
     """Get the base directory - same folder as this script."""
@@ -37,30 +39,8 @@ def load_config():
 
 
 def load_state():
-    """Load state from JSON file."""
-    if not os.path.exists(STATE_JSON):
-        return {
-            "total_deaths": 0,
-            "game_deaths": {},
-            "tick": 0,
-            "streak": 0,
-            "last_death_ts": 0.0,
-            "current_game": None,
-        }
-    
-    try:
-        with open(STATE_JSON, "r", encoding="utf-8") as f:
-            state = json.load(f)
-    except:
-        state = {}
-    
-    state.setdefault("total_deaths", 0)
-    state.setdefault("game_deaths", {})
-    state.setdefault("tick", 0)
-    state.setdefault("streak", 0)
-    state.setdefault("last_death_ts", 0.0)
-    state.setdefault("current_game", None)
-    return state
+    """Load state: death_state.json plus journal events appended since."""
+    return death_journal.load_state(STATE_JSON)
 
 
 def save_config(config):
@@ -80,17 +60,10 @@ def save_config(config):
         return False
 
 
-def save_state(state):
-    """Save state to JSON file."""
+def record_switch(game_name):
+    """Journal a manual game switch (the daemon and GUI pick it up on their next state load)."""
     try:
-        with open(STATE_JSON, "w", encoding="utf-8") as f:
-            json.dump(state, f, indent=2)
-            f.flush()  # Force write to disk immediately
-            try:
-                import os
-                os.fsync(f.fileno())  # Ensure file is synced to disk
-            except:
-                pass  # os.fsync might not be available on all systems
+        death_journal.append_event(STATE_JSON, "switch", game_name, source="MANUAL", manual=True)
         return True
     except Exception as e:
         print(f"[ERROR] Failed to save state: {e}")
@@ -108,10 +81,9 @@ def write_text(deaths, game_name):
         if game_name:
             game_txt = os.path.join(BASE_DIR, f"death_counter_{game_name.replace(' ', '_')}.txt")
             try:
-                state = load_state()
-                game_deaths = state.get("game_deaths", {}).get(game_name, 0)
+                # deaths is already this game's count - no need to reload the state
                 with open(game_txt, "w", encoding="utf-8") as f:
-                    f.write(str(game_deaths))
+                    f.write(str(deaths))
             except Exception as e:
                 print(f"[WARNING] Could not write per-game file: {e}")
         return True
@@ -148,11 +120,6 @@ def switch_game(game_name):
     state = load_state()
     old_game = state.get("current_game", "Unknown")
     
-    # Update state
-    state["current_game"] = game_name
-    # Mark this as the manually selected game (fallback when no game is detected)
-    state["manual_game"] = game_name
-    
     # Update config
     config["current_game"] = game_name
     config["manual_game"] = game_name
@@ -160,8 +127,9 @@ def switch_game(game_name):
     # Get the game's death count
     game_deaths = state.get("game_deaths", {}).get(game_name, 0)
     
-    # Save files
-    if not save_state(state):
+    # Save files (the journaled switch also marks this as the manually selected game,
+    # the fallback when no game is detected)
+    if not record_switch(game_name):
         return False
     
     if not save_config(config):
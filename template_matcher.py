@@ -0,0 +1,237 @@
+"""
+Template Matching Module for Death Detection
+Matches the preprocessed OCR mask against reference images of each game's death banner
+using normalized cross-correlation over a small scale pyramid.
+
+A few milliseconds of OpenCV per frame instead of a Tesseract call, and no dependence
+on character whitelists or keyword lists.
+
+Templates are recorded per game from debug_capture.png (the preprocessed image the
+daemon saves every debug_every_ticks) and stored in templates/<game>/ next to
+games_config.json:
+
+    python template_matcher.py "Elden Ring"                 # record from debug_capture.png
+    python template_matcher.py "Elden Ring" my_capture.png  # record from another capture
+"""
+
+import os
+import re
+import sys
+import glob
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# PIL is only needed to read the capture width stored in debug_capture.png
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+TEMPLATES_DIR_NAME = "templates"
+# PNG text key the daemon writes into debug_capture.png: width of the whole region at the image's scale
+CAPTURE_WIDTH_KEY = "capture_width"
+# Frame widths kept in the scaled-template cache (text crops change the effective width per frame)
+SCALED_CACHE_SIZE = 8
+
+DEFAULT_TEMPLATE_CONFIG = {
+    "threshold": 0.75,  # Normalized cross-correlation score needed for a hit
+    "scales": [0.8, 0.9, 1.0, 1.1, 1.25],  # Template scale pyramid
+    "work_width": 320,  # Frames are downscaled to this width before matching
+}
+
+
+def game_template_dir(base_dir: str, game_name: str) -> str:
+    """Directory holding the reference templates for a game."""
+    safe_name = re.sub(r"[^A-Za-z0-9_-]+", "_", game_name).strip("_")
+    return os.path.join(base_dir, TEMPLATES_DIR_NAME, safe_name)
+
+
+def to_text_mask(img) -> np.ndarray:
+    """
+    Convert a preprocessed OCR image (dark text on light background, as saved to
+    debug_capture.png) into a binary mask with text = 255.
+    """
+    gray = np.asarray(img.convert("L")) if hasattr(img, "convert") else np.asarray(img)
+    if gray.ndim == 3:
+        gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+    _, mask = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY_INV)
+    return mask
+
+
+def capture_width(source_path: str, default: int) -> int:
+    """Width of the whole capture region, at the image's scale, from the debug PNG's metadata."""
+    if not PIL_AVAILABLE:
+        return default
+    try:
+        with Image.open(source_path) as img:
+            return int(img.text.get(CAPTURE_WIDTH_KEY, default))
+    except Exception:
+        return default
+
+
+def record_template(base_dir: str, game_name: str, source_path: str, margin: int = 8) -> Optional[str]:
+    """
+    Crop a preprocessed capture to its text and save it as a template for game_name.
+
+    Args:
+        base_dir: Directory containing games_config.json
+        game_name: Game the template belongs to
+        source_path: Preprocessed capture (e.g. debug_capture.png)
+        margin: Pixels of background kept around the text
+
+    Returns:
+        Path of the saved template, or None if the capture contains no text pixels
+    """
+    gray = cv2.imread(source_path, cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        raise FileNotFoundError(source_path)
+    mask = to_text_mask(gray)
+    points = cv2.findNonZero(mask)
+    if points is None:
+        return None
+    x, y, w, h = cv2.boundingRect(points)
+    x0, y0 = max(0, x - margin), max(0, y - margin)
+    x1, y1 = min(gray.shape[1], x + w + margin), min(gray.shape[0], y + h + margin)
+
+    template_dir = game_template_dir(base_dir, game_name)
+    os.makedirs(template_dir, exist_ok=True)
+    # Record the capture width so matching can undo differences in capture size
+    # (a cropped capture carries the width of the whole region at its scale)
+    width = capture_width(source_path, gray.shape[1])
+    out_path = os.path.join(template_dir, f"template_{time.strftime('%Y%m%d_%H%M%S')}_w{width}.png")
+    cv2.imwrite(out_path, gray[y0:y1, x0:x1])
+    return out_path
+
+
+class TemplateMatcher:
+    """
+    Detects a game's death banner by template matching on the preprocessed mask.
+    Same shape as LogMonitor/MemoryScanner: constructed per game, is_enabled() tells
+    the daemon whether there is anything to match against.
+    """
+
+    def __init__(self, game_config: Dict, game_name: str, base_dir: str,
+                 log_callback: Optional[Callable[[str], None]] = None):
+        """
+        Initialize template matcher for a game.
+
+        Args:
+            game_config: Game configuration dict with optional 'template_matching' section
+            game_name: Game name (selects templates/<game>/)
+            base_dir: Directory containing games_config.json
+            log_callback: Optional callback function for logging
+        """
+        self.game_name = game_name
+        self.log_callback = log_callback or (lambda msg: None)
+        self.config = {**DEFAULT_TEMPLATE_CONFIG, **game_config.get("template_matching", {})}
+        self.threshold = float(self.config["threshold"])
+        self.scales = [float(s) for s in self.config["scales"]]
+        self.work_width = int(self.config["work_width"])
+
+        # (template mask, width of the capture it was recorded from)
+        self.templates: List[Tuple[np.ndarray, int]] = []
+        # Scaled templates per incoming frame width: {frame_width: [template arrays]}
+        self._scaled_cache: Dict[int, List[np.ndarray]] = {}
+        self.last_score = 0.0
+
+        template_dir = game_template_dir(base_dir, game_name)
+        for path in sorted(glob.glob(os.path.join(template_dir, "*.png"))):
+            gray = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if gray is None:
+                continue
+            match = re.search(r"_w(\d+)\.png$", path)
+            source_width = int(match.group(1)) if match else 0
+            self.templates.append((to_text_mask(gray), source_width))
+
+        if self.templates:
+            self.log_callback(f"TemplateMatcher: Loaded {len(self.templates)} template(s) for {game_name}")
+        else:
+            self.log_callback(f"TemplateMatcher: No templates in {template_dir} "
+                              f"(record one with: python template_matcher.py \"{game_name}\")")
+
+    def is_enabled(self) -> bool:
+        """Check if there are templates to match against."""
+        return bool(self.templates)
+
+    def _scaled_templates(self, frame_width: int, factor: float) -> List[np.ndarray]:
+        """Templates resized for this frame width and every pyramid scale (cached)."""
+        cached = self._scaled_cache.get(frame_width)
+        if cached is not None:
+            return cached
+        if len(self._scaled_cache) >= SCALED_CACHE_SIZE:
+            self._scaled_cache.clear()
+        scaled = []
+        for template, source_width in self.templates:
+            # Bring the template to the same capture scale as the frame, then to working size
+            base = factor * (frame_width / source_width if source_width else 1.0)
+            for scale in self.scales:
+                size = (int(template.shape[1] * base * scale), int(template.shape[0] * base * scale))
+                if size[0] < 4 or size[1] < 4:
+                    continue
+                scaled.append(cv2.resize(template, size, interpolation=cv2.INTER_AREA))
+        self._scaled_cache[frame_width] = scaled
+        return scaled
+
+    def match(self, ocr_img, info: Optional[Dict] = None) -> bool:
+        """
+        Match a preprocessed OCR image against the templates.
+
+        Args:
+            ocr_img: Output of preprocess_for_ocr (grayscale array, dark text on light background)
+            info: preprocess_for_ocr's info dict; its region_width and scale give the width the
+                  whole region would have at ocr_img's scale (ocr_img itself may be a text crop)
+
+        Returns:
+            True if any template scores at or above the threshold
+        """
+        self.last_score = 0.0
+        if not self.templates:
+            return False
+        mask = to_text_mask(ocr_img)
+        frame_width = mask.shape[1]
+        if info and info.get("scale") and info.get("region_width"):
+            frame_width = int(round(info["region_width"] * info["scale"]))
+        factor = min(1.0, self.work_width / max(1, frame_width))
+        if factor < 1.0:
+            mask = cv2.resize(mask, (max(1, int(mask.shape[1] * factor)), max(1, int(mask.shape[0] * factor))),
+                              interpolation=cv2.INTER_AREA)
+        if not mask.any():
+            return False
+
+        templates = self._scaled_templates(frame_width, factor)
+        if not templates:
+            return False
+        # A tight text crop can be smaller than a template recorded with a wider margin: pad with background
+        pad_y = max(0, max(t.shape[0] for t in templates) - mask.shape[0])
+        pad_x = max(0, max(t.shape[1] for t in templates) - mask.shape[1])
+        if pad_y or pad_x:
+            mask = cv2.copyMakeBorder(mask, pad_y // 2 + 1, pad_y // 2 + 1, pad_x // 2 + 1, pad_x // 2 + 1,
+                                      cv2.BORDER_CONSTANT, value=0)
+
+        for template in templates:
+            if template.shape[0] > mask.shape[0] or template.shape[1] > mask.shape[1]:
+                continue
+            result = cv2.matchTemplate(mask, template, cv2.TM_CCOEFF_NORMED)
+            score = float(result.max())
+            self.last_score = max(self.last_score, score)
+            if score >= self.threshold:
+                return True
+        return False
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python template_matcher.py <game name> [preprocessed capture]")
+        raise SystemExit(1)
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    source = sys.argv[2] if len(sys.argv) > 2 else os.path.join(base_dir, "debug_capture.png")
+    saved = record_template(base_dir, sys.argv[1], source)
+    if saved:
+        print(f"Template saved: {saved}")
+    else:
+        print(f"No text found in {source} - capture a frame while the death banner is on screen.")
+        raise SystemExit(1)
@@ -0,0 +1,115 @@
+"""
+Tick Scheduler Module
+Paces the daemon loop with monotonic deadlines and one tick period per detection state.
+
+Sleeping a fixed tick_seconds after the work made the real period work time plus the
+sleep. The scheduler sleeps until the tick's deadline instead (previous deadline +
+period), so the period holds whenever the work fits in it. A tick that runs past its
+deadline is an overrun: it is counted, logged (at most once per OVERRUN_LOG_SECONDS)
+and the schedule restarts from now instead of firing back-to-back catch-up ticks.
+
+States:
+    idle   - no process of the current game is running
+    normal - the game is running
+    burst  - a detection streak is building outside the cooldown, so consecutive_hits confirms quickly
+"""
+
+import time
+from typing import Callable, Dict, Optional
+
+IDLE = "idle"
+NORMAL = "normal"
+BURST = "burst"
+
+# Seconds per tick in each state
+DEFAULT_TICK_PERIODS = {IDLE: 1.0, NORMAL: 0.30, BURST: 0.10}
+# Shortest accepted period (a typo like 0 would otherwise busy-loop)
+MIN_TICK_SECONDS = 0.02
+# Overruns are reported at most this often (the rest are summed into the next report)
+OVERRUN_LOG_SECONDS = 30.0
+
+
+class TickScheduler:
+    """Deadline-based tick pacing with per-state periods and overrun accounting."""
+
+    def __init__(self, periods: Optional[Dict[str, float]] = None,
+                 log_callback: Optional[Callable[[str], None]] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize the scheduler.
+
+        Args:
+            periods: Seconds per tick by state (missing states use DEFAULT_TICK_PERIODS)
+            log_callback: Optional callback function for logging
+            clock: Monotonic time source (injectable for tests and benchmarks)
+            sleep: Sleep function (injectable for tests and benchmarks)
+        """
+        self.periods = dict(DEFAULT_TICK_PERIODS)
+        for state, seconds in (periods or {}).items():
+            self.periods[state] = max(MIN_TICK_SECONDS, float(seconds))
+        self.log_callback = log_callback or (lambda msg: None)
+        self.clock = clock
+        self.sleep = sleep
+        self.state = NORMAL
+        # Start of the current tick on the schedule
+        self.tick_start = clock()
+
+        # Counters for the periodic tick log
+        self.ticks = {state: 0 for state in self.periods}
+        self.overruns = 0
+        self.max_overrun = 0.0
+        self._unreported_overruns = 0
+        self._last_overrun_log: Optional[float] = None
+
+    def set_state(self, state: str):
+        """Pick the period for the tick in progress (takes effect at the next wait())."""
+        if state not in self.periods:
+            raise ValueError(f"Unknown tick state: {state}")
+        self.state = state
+
+    def period(self) -> float:
+        """Seconds per tick in the current state."""
+        return self.periods[self.state]
+
+    def wait(self) -> float:
+        """
+        Sleep until the current tick's deadline.
+
+        Returns:
+            Seconds slept (0 on an overrun)
+        """
+        now = self.clock()
+        period = self.periods[self.state]
+        deadline = self.tick_start + period
+        self.ticks[self.state] = self.ticks.get(self.state, 0) + 1
+
+        if now > deadline:
+            self._overrun(now - deadline, period, now)
+            self.tick_start = now
+            return 0.0
+
+        remaining = deadline - now
+        self.sleep(remaining)
+        self.tick_start = deadline
+        return remaining
+
+    def _overrun(self, late: float, period: float, now: float):
+        """Count an overrun and log it, rate-limited."""
+        self.overruns += 1
+        self.max_overrun = max(self.max_overrun, late)
+        self._unreported_overruns += 1
+        if self._last_overrun_log is not None and now - self._last_overrun_log < OVERRUN_LOG_SECONDS:
+            return
+        more = self._unreported_overruns - 1
+        suffix = f" (+{more} more since last report)" if more else ""
+        self.log_callback(f"TickScheduler: Tick overran its {period:.2f}s {self.state} period "
+                          f"by {late * 1000:.0f} ms{suffix}")
+        self._unreported_overruns = 0
+        self._last_overrun_log = now
+
+    def stats_summary(self) -> str:
+        """Short summary for the periodic tick log."""
+        counts = "/".join(f"{state} {count}" for state, count in self.ticks.items())
+        return (f"{self.state} {self.period():.2f}s, ticks {counts}, "
+                f"{self.overruns} overruns (max {self.max_overrun * 1000:.0f} ms)")
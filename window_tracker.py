@@ -0,0 +1,214 @@
+"""
+Window Tracker Module
+Finds the game's main window once and then only re-reads its rectangle.
+
+EnumWindows walks every top-level window on the desktop; the tracker does that only
+when it has no window for the game's PID yet or the cached one stopped being valid
+(closed, or the handle now belongs to another process). Every other call is a single
+GetWindowRect.
+
+Window access goes through a provider so the tracking logic runs anywhere:
+Win32WindowProvider talks to user32, FakeWindowProvider is a deterministic in-memory
+desktop for tests and benchmarks on non-Windows machines.
+"""
+
+import sys
+import ctypes
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Windows API constants
+GW_OWNER = 4
+
+
+def make_rect(left: int, top: int, right: int, bottom: int) -> Dict:
+    """Window rectangle in the dict form grab_region() expects."""
+    return {
+        'left': left,
+        'top': top,
+        'right': right,
+        'bottom': bottom,
+        'width': right - left,
+        'height': bottom - top
+    }
+
+
+class WindowProvider(ABC):
+    """Interface for window lookups (one implementation per platform, plus a fake)."""
+
+    @abstractmethod
+    def find_windows(self, pid: int) -> List[int]:
+        """Visible, unowned top-level windows of a process (main window first)."""
+
+    @abstractmethod
+    def is_valid(self, hwnd: int, pid: int) -> bool:
+        """Check if hwnd still exists and still belongs to pid."""
+
+    @abstractmethod
+    def get_rect(self, hwnd: int) -> Optional[Dict]:
+        """Current rectangle of a window, or None if it can't be read."""
+
+
+class Win32WindowProvider(WindowProvider):
+    """user32-backed provider; the callback type and RECT structure are built once."""
+
+    def __init__(self):
+        from ctypes import wintypes
+
+        self.user32 = ctypes.windll.user32
+        self.rect = wintypes.RECT()
+        self.pid_buffer = ctypes.c_ulong()
+        self.enum_proc_type = ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.c_void_p, ctypes.c_void_p)
+
+    def _window_pid(self, hwnd: int) -> int:
+        self.user32.GetWindowThreadProcessId(hwnd, ctypes.byref(self.pid_buffer))
+        return self.pid_buffer.value
+
+    def find_windows(self, pid: int) -> List[int]:
+        windows = []
+
+        def enum_windows_callback(hwnd, lParam):
+            try:
+                if self.user32.IsWindowVisible(hwnd) and self._window_pid(hwnd) == pid:
+                    # Check if it's not a child window
+                    if self.user32.GetWindow(hwnd, GW_OWNER) == 0:
+                        windows.append(hwnd)
+            except Exception:
+                pass
+            return True
+
+        callback = self.enum_proc_type(enum_windows_callback)
+        self.user32.EnumWindows(callback, None)
+        return windows
+
+    def is_valid(self, hwnd: int, pid: int) -> bool:
+        # Handles are recycled: IsWindow alone would accept another process's new window
+        return bool(self.user32.IsWindow(hwnd)) and bool(self.user32.IsWindowVisible(hwnd)) \
+            and self._window_pid(hwnd) == pid
+
+    def get_rect(self, hwnd: int) -> Optional[Dict]:
+        if not self.user32.GetWindowRect(hwnd, ctypes.byref(self.rect)):
+            return None
+        rect = self.rect
+        return make_rect(rect.left, rect.top, rect.right, rect.bottom)
+
+
+class FakeWindowProvider(WindowProvider):
+    """
+    Deterministic in-memory desktop: open/move/resize/close windows by hand.
+    Counts calls, so tests and benchmarks can check how often each lookup happens.
+    """
+
+    def __init__(self):
+        self.windows: Dict[int, Tuple[int, Dict]] = {}  # hwnd -> (pid, rect), in z-order
+        self.next_hwnd = 0x10000
+        self.enum_calls = 0
+        self.windows_walked = 0
+        self.rect_calls = 0
+
+    def open(self, pid: int, left: int, top: int, width: int, height: int) -> int:
+        """Create a window for pid; returns its handle."""
+        hwnd = self.next_hwnd
+        self.next_hwnd += 4
+        self.windows[hwnd] = (pid, make_rect(left, top, left + width, top + height))
+        return hwnd
+
+    def move(self, hwnd: int, left: int, top: int):
+        pid, rect = self.windows[hwnd]
+        self.windows[hwnd] = (pid, make_rect(left, top, left + rect['width'], top + rect['height']))
+
+    def resize(self, hwnd: int, width: int, height: int):
+        pid, rect = self.windows[hwnd]
+        self.windows[hwnd] = (pid, make_rect(rect['left'], rect['top'], rect['left'] + width, rect['top'] + height))
+
+    def close(self, hwnd: int):
+        self.windows.pop(hwnd, None)
+
+    def find_windows(self, pid: int) -> List[int]:
+        self.enum_calls += 1
+        self.windows_walked += len(self.windows)
+        return [hwnd for hwnd, (owner, _) in self.windows.items() if owner == pid]
+
+    def is_valid(self, hwnd: int, pid: int) -> bool:
+        window = self.windows.get(hwnd)
+        return window is not None and window[0] == pid
+
+    def get_rect(self, hwnd: int) -> Optional[Dict]:
+        self.rect_calls += 1
+        window = self.windows.get(hwnd)
+        return dict(window[1]) if window else None
+
+
+def default_provider() -> Optional[WindowProvider]:
+    """Win32 provider on Windows, None elsewhere (window tracking is then off)."""
+    if sys.platform != "win32":
+        return None
+    try:
+        return Win32WindowProvider()
+    except Exception:
+        return None
+
+
+class WindowTracker:
+    """Caches the main window handle per PID; re-enumerates only when that handle goes stale."""
+
+    def __init__(self, provider: Optional[WindowProvider] = None,
+                 log_callback: Optional[Callable[[str], None]] = None):
+        """
+        Initialize the tracker.
+
+        Args:
+            provider: Window provider (None = no window tracking, get_rect() returns None)
+            log_callback: Optional callback function for logging
+        """
+        self.provider = provider
+        self.log_callback = log_callback or (lambda msg: None)
+        self.pid: Optional[int] = None
+        self.hwnd: Optional[int] = None
+
+        # Counters for the periodic tick log
+        self.enumerations = 0
+        self.rect_queries = 0
+
+    def get_rect(self, pid: int) -> Optional[Dict]:
+        """
+        Rectangle of the process's main window.
+
+        Args:
+            pid: Game process ID
+
+        Returns:
+            Dict with left/top/right/bottom/width/height, or None if the process has no window
+        """
+        if self.provider is None:
+            return None
+        try:
+            if pid != self.pid:
+                self.pid = pid
+                self.hwnd = None
+            if self.hwnd is not None and not self.provider.is_valid(self.hwnd, pid):
+                self.hwnd = None
+            if self.hwnd is None:
+                self.enumerations += 1
+                windows = self.provider.find_windows(pid)
+                if not windows:
+                    return None
+                # Use the first (main) window
+                self.hwnd = windows[0]
+            self.rect_queries += 1
+            rect = self.provider.get_rect(self.hwnd)
+            if rect is None:
+                self.hwnd = None
+            return rect
+        except Exception as e:
+            self.log_callback(f"WindowTracker: Lookup failed: {e}")
+            self.hwnd = None
+            return None
+
+    def invalidate(self):
+        """Forget the cached window (next get_rect() enumerates again)."""
+        self.hwnd = None
+
+    def stats_summary(self) -> str:
+        """Short summary for the periodic tick log."""
+        return f"{self.enumerations} enum/{self.rect_queries} rect"